@@ -1,191 +1,482 @@
 """Arbitrage opportunity detection and analysis."""
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta, timezone
 from collections import deque
+from typing import Iterable, List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 from loguru import logger
 
 from config import (
-    PriceData, ArbitrageOpportunity, EXCHANGE_CONFIGS,
-    MIN_PROFIT_THRESHOLD, MAX_SPREAD_AGE_SECONDS, DATA_BUFFER_SIZE
+    PriceData, ArbitrageOpportunity, OpportunityEpisode, EXCHANGE_CONFIGS,
+    MAX_SPREAD_AGE_SECONDS, DATA_BUFFER_SIZE, SPREAD_DECAY_ALPHA, DEPTH_NOTIONALS_USD, DEPTH_LEVELS,
+    CYCLE_DETECTION, CYCLE_HISTORY_SIZE, PAIR_QUOTE_ASSET
 )
+from clock import Clock, SYSTEM_CLOCK, SimulatedClock, ns_to_datetime, seconds_to_ns
+from cost_model import CostModel
+from cycle_engine import CycleEngine
+from depth_walk import Depth, max_profitable_quantity
+from opportunity_store import OpportunityStore
+from rolling_stats import RollingWindowStats, TopKCounter
+from episode_tracker import EpisodeTracker
+from latency import LatencyTracer, TRACER
+from price_ring import PriceRingBuffer
+from spread_tracker import OnlineSpreadTracker
+from spread_engine import SpreadMatrixEngine
 
 
 class ArbitrageDetector:
-    """Detects arbitrage opportunities across exchanges."""
-
-    def __init__(self):
-        self.price_buffer: Dict[str, deque] = {}  # {symbol: deque of (exchange, PriceData)}
-        self.opportunities: List[ArbitrageOpportunity] = []
+    """Detects arbitrage opportunities across exchanges.
+
+    Every reading of "now" goes through `clock`; pass a SimulatedClock to run
+    recorded data through the detector independent of the wall clock.
+    Detector entry, opportunity emit and consumer delivery latencies are
+    sampled into `tracer`.
+
+    Opportunities profitable at the touch are also sized against depth: the
+    L2 book in `books` (an order_book.OrderBookSet) where one is synced, else
+    the quote's top-of-book sizes, which understate the real depth. Each gets
+    its profit after fees at VWAP fill prices for every DEPTH_NOTIONALS_USD
+    and the largest buy notional that stays profitable.
+
+    With `cycle_detection` (CYCLE_DETECTION by default), every quote also
+    moves the rate graph of a CycleEngine, and multi-leg cycles (triangular
+    through cross pairs such as ETH-BTC, or across exchanges) that turn
+    profitable after fees are kept as ArbitrageOpportunity records with
+    their `legs`; without it no engine is built. Pairs not quoted in
+    PAIR_QUOTE_ASSET (cross pairs) only feed the cycle graph: pair detection,
+    depth sizing and everything downstream price in USD.
+    """
+    has_history = True  # get_historical_data serves the tick rings (snapshot / sharded views have none)
+
+    def __init__(
+        self,
+        clock: Clock = SYSTEM_CLOCK,
+        tracer: LatencyTracer = TRACER,
+        books=None,
+        cycle_detection: bool = CYCLE_DETECTION
+    ):
+        self.clock = clock
+        self.tracer = tracer
+        self.books = books
+        self.notionals = np.array(DEPTH_NOTIONALS_USD)
+        self._entry_probes = []  # {exchange id: 'detector' stage probe}
+        self._emit_probes = []  # {exchange id: 'emit' stage probe}
+        self._deliver_histogram = tracer.histogram('deliver')
+        self._delivered = 0  # Opportunities (store.total_appended) already handed to a consumer
+        self.price_buffer: Dict[str, PriceRingBuffer] = {}  # {symbol: columnar tick ring}
+        self.spread_trackers: Dict[str, OnlineSpreadTracker] = {}  # {symbol: online pairwise spread stats}
+        self.opportunities = OpportunityStore()  # Bounded columnar ring, oldest rows overwritten
         self.latest_prices: Dict[tuple, PriceData] = {}  # {(exchange, symbol): PriceData} - conveneient reference to latest prices for ongoing arbitrage calculations
 
+        # Fee / break-even tables and dense [symbol, exchange] quote arrays, both indexed by exchange id
+        self.cost_model = CostModel()
+        self.spread_engine = SpreadMatrixEngine(self.cost_model)
+        self.max_age_ns = seconds_to_ns(MAX_SPREAD_AGE_SECONDS)  # Quote freshness, on the monotonic clock
+
+        # Per-symbol price table: one fixed slot per exchange, indexed by an interned exchange id
+        self.exchange_ids: Dict[str, int] = {}  # {exchange name: slot index}
+        self.exchange_names: List[str] = []  # {slot index: exchange name}
+        self.symbol_slots: Dict[str, List[Optional[PriceData]]] = {}  # {symbol: [PriceData or None per exchange]}
+        for config in EXCHANGE_CONFIGS.values():
+            self._intern_exchange(config.name)
+
         # Count total opportunities found and opportunities by pair of exchanges
         self.total_opportunities_found = 0
-        self.opportunities_by_pair = {}
+        self.pair_counts = TopKCounter(k=5)
+        self.opportunities_by_pair = self.pair_counts.counts  # {pair key: all-time count}
+
+        # Last-hour profit aggregates, maintained on insert so get_statistics is O(1)
+        self.profit_stats = RollingWindowStats(window_seconds=3600)
+
+        # Per-pair lifecycle records (open -> reverted/stale) built from the per-tick stream
+        self.episodes = EpisodeTracker()
+
+        # Multi-leg cycles over (asset, exchange) nodes, reported when they turn profitable.
+        # Replays rebuild the cycle set inline so the same input always reports the same cycles.
+        self.cycle_engine = CycleEngine(
+            self.cost_model, background=not isinstance(clock, SimulatedClock)
+        ) if cycle_detection else None
+        self.cycle_opportunities: deque = deque(maxlen=CYCLE_HISTORY_SIZE)
+        self.total_cycles_found = 0
+        self._cross_pairs: Dict[str, bool] = {}  # {symbol: not quoted in PAIR_QUOTE_ASSET}
 
     def update_price(self, price_data: PriceData):
         """Update latest price and check for arbitrage."""
-        key = (price_data.exchange, price_data.symbol)
-        self.latest_prices[key] = price_data
-
-        # IF subscribed to a new symbol, initialize its thread-safe deque buffer
-        if price_data.symbol not in self.price_buffer:
-            self.price_buffer[price_data.symbol] = deque(maxlen=DATA_BUFFER_SIZE)
-
-        self.price_buffer[price_data.symbol].append({
-            'exchange': price_data.exchange,
-            'symbol': price_data.symbol,  
-            'price': price_data.price,
-            'timestamp': price_data.timestamp,
-            'bid': price_data.bid,
-            'ask': price_data.ask,
-            'volume': price_data.volume
-        })
+        if self._is_cross_pair(price_data.symbol):
+            self._apply_cross_tick(price_data)
+            self._check_cycles()
+            return
+        symbol_id, exchange_id = self._apply_tick(price_data)
 
         # Check for arbitrage opportunities for one crytpocurrency across multiple exchanges
-        self._check_arbitrage(price_data.symbol)
-
-    def _check_arbitrage(self, symbol: str):
-        """Check for arbitrage opportunities for a given symbol."""
-        # Get all recent prices for this symbol
-        relevant_prices = [
-            (exchange, data)
-            for (exchange, sym), data in self.latest_prices.items()
-            if sym == symbol
-        ]
-
-        if len(relevant_prices) < 2:
-            return  # Need at least 2 exchanges
-
-        # Filter out stale prices
-        now = datetime.now(timezone.utc)
-        fresh_prices = [
-            (exchange, data)
-            for exchange, data in relevant_prices
-            if (now - data.timestamp).total_seconds() < MAX_SPREAD_AGE_SECONDS
-        ]
-        if len(fresh_prices) < 2:
+        self._check_arbitrage(price_data.symbol, symbol_id, [exchange_id])
+        self._check_cycles()
+
+    def update_prices(self, batch: Iterable[PriceData]):
+        """Apply a coalesced batch of ticks, then check each touched symbol once.
+
+        Pairs are evaluated on the batch's final prices, so a pair whose two
+        exchanges both ticked in the batch is recorded once, not twice.
+        """
+        touched: Dict[str, Tuple[int, List[int]]] = {}  # {symbol: (symbol id, updated exchange ids)}
+        for price_data in batch:
+            if self._is_cross_pair(price_data.symbol):
+                self._apply_cross_tick(price_data)
+                continue
+            symbol_id, exchange_id = self._apply_tick(price_data)
+            entry = touched.get(price_data.symbol)
+            if entry is None:
+                touched[price_data.symbol] = (symbol_id, [exchange_id])
+            elif exchange_id not in entry[1]:
+                entry[1].append(exchange_id)
+
+        for symbol, (symbol_id, exchange_ids) in touched.items():
+            self._check_arbitrage(symbol, symbol_id, exchange_ids)
+        self._check_cycles()
+
+    def _is_cross_pair(self, symbol: str) -> bool:
+        cross = self._cross_pairs.get(symbol)
+        if cross is None:
+            cross = self._cross_pairs[symbol] = symbol.partition('-')[2] != PAIR_QUOTE_ASSET
+        return cross
+
+    def _apply_cross_tick(self, price_data: PriceData):
+        """Move a cross pair's edges in the cycle graph (cross pairs go nowhere else)."""
+        if self.cycle_engine is None:
             return
+        exchange_id = self._intern_exchange(price_data.exchange)
+        self.cycle_engine.update_quote(
+            exchange_id, price_data.exchange, price_data.symbol, price_data.bid, price_data.ask,
+            price_data.received_ns or self.clock.monotonic_ns()
+        )
+
+    def _apply_tick(self, price_data: PriceData) -> Tuple[int, int]:
+        """Store one tick in every per-symbol structure; return its (symbol id, exchange id)."""
+        key = (price_data.exchange, price_data.symbol)
+        self.latest_prices[key] = price_data
 
-        # Find all profitable pairs
-        for i, (exchange1, data1) in enumerate(fresh_prices):
-            for exchange2, data2 in fresh_prices[i + 1:]:
-                # Check both directions
-                self._analyze_pair(exchange1, data1, exchange2, data2)
-                self._analyze_pair(exchange2, data2, exchange1, data1)
+        exchange_id = self._intern_exchange(price_data.exchange)
+        slots = self.symbol_slots.get(price_data.symbol)
+        if slots is None:
+            slots = [None] * len(self.exchange_names)
+            self.symbol_slots[price_data.symbol] = slots
+        slots[exchange_id] = price_data
+
+        # Event time orders history; monotonic receive time decides freshness
+        timestamp_ns = price_data.timestamp_ns
+        received_ns = price_data.received_ns or self.clock.monotonic_ns()
+        self._entry_probes[exchange_id].sample(price_data.received_ns)
+        symbol_id = self.spread_engine.intern_symbol(price_data.symbol)
+        self.spread_engine.update(
+            symbol_id, exchange_id,
+            price_data.price, price_data.bid, price_data.ask,
+            received_ns
+        )
+        if self.cycle_engine is not None:
+            self.cycle_engine.update_quote(
+                exchange_id, price_data.exchange, price_data.symbol, price_data.bid, price_data.ask, received_ns
+            )
+
+        # IF subscribed to a new symbol, initialize its preallocated tick ring
+        ring = self.price_buffer.get(price_data.symbol)
+        if ring is None:
+            ring = PriceRingBuffer(price_data.symbol, DATA_BUFFER_SIZE, self.exchange_names)
+            self.price_buffer[price_data.symbol] = ring
+
+        ring.append(
+            timestamp_ns, exchange_id,
+            price_data.price, price_data.bid, price_data.ask, price_data.volume
+        )
+
+        tracker = self.spread_trackers.get(price_data.symbol)
+        if tracker is None:
+            tracker = OnlineSpreadTracker(decay_alpha=SPREAD_DECAY_ALPHA)
+            self.spread_trackers[price_data.symbol] = tracker
+        tracker.update(price_data.exchange, price_data.price, timestamp_ns)
+        return symbol_id, exchange_id
+
+    def _intern_exchange(self, exchange_name: str) -> int:
+        """Return the slot index for an exchange, widening every symbol's table if it is new."""
+        exchange_id = self.exchange_ids.get(exchange_name)
+        if exchange_id is None:
+            exchange_id = len(self.exchange_names)
+            self.exchange_ids[exchange_name] = exchange_id
+            self.exchange_names.append(exchange_name)
+            self.cost_model.add_exchange(exchange_name)
+            self.spread_engine.add_exchange(exchange_name)
+            self._entry_probes.append(self.tracer.probe('detector', exchange_name, now=self.clock.monotonic_ns))
+            self._emit_probes.append(self.tracer.probe('emit', exchange_name, now=self.clock.monotonic_ns))
+            for slots in self.symbol_slots.values():
+                slots.append(None)
+        return exchange_id
+
+    def _check_arbitrage(self, symbol: str, symbol_id: int, exchange_ids: List[int]):
+        """Check arbitrage for a symbol, only on pairs involving the exchanges that just updated.
+
+        Pairs between two unchanged exchanges were already evaluated when the later of
+        the two last ticked, so only the updated exchanges' rows and columns are tested.
+        """
+        now_ns = self.clock.wall_ns()
+        engine = self.spread_engine
+        buy, sell = engine.executable_prices(symbol_id)
+        fresh = engine.fresh_mask(symbol_id, self.clock.monotonic_ns(), self.max_age_ns)
+        self._analyze_pair(symbol, exchange_ids, buy, sell, fresh, engine.updated_at[symbol_id], now_ns)
 
     def _analyze_pair(
         self,
-        buy_exchange: str,
-        buy_data: PriceData,
-        sell_exchange: str,
-        sell_data: PriceData
+        symbol: str,
+        exchange_ids: List[int],
+        buy: np.ndarray,
+        sell: np.ndarray,
+        fresh: np.ndarray,
+        received: np.ndarray,
+        now_ns: int
     ):
-        """Analyze a specific buy/sell pair for arbitrage."""
-        # Use ask price for buying, bid price for selling (if available)
-        buy_price = buy_data.ask if buy_data.ask > 0 else buy_data.price
-        sell_price = sell_data.bid if sell_data.bid > 0 else sell_data.price
-
-        # Calculate spread
-        if buy_price <= 0 or sell_price <= 0:
+        """Test every pair with an updated exchange against the break-even table; build opportunities on hits."""
+        exchange_ids = [i for i in exchange_ids if fresh[i]]
+        if not exchange_ids:
+            self.episodes.expire(now_ns)
             return
 
-        spread_pct = ((sell_price - buy_price) / buy_price) * 100
-
-        # Get exchange fees
-        buy_fee = self._get_exchange_fee(buy_exchange)
-        sell_fee = self._get_exchange_fee(sell_exchange)
-
-        # Calculate profit after fees
-        total_fee_pct = buy_fee + sell_fee
-        profit_after_fees = spread_pct - total_fee_pct
-
-        # Check if profitable
-        if profit_after_fees >= MIN_PROFIT_THRESHOLD:
-            opportunity = ArbitrageOpportunity(
-                buy_exchange=buy_exchange,
-                sell_exchange=sell_exchange,
-                symbol=buy_data.symbol,
-                buy_price=buy_price,
-                sell_price=sell_price,
-                spread_pct=spread_pct,
-                profit_after_fees=profit_after_fees,
-                timestamp=datetime.now(timezone.utc)
+        tables = self.cost_model.tables
+        ratio = tables.break_even_ratio
+        usable_buy = fresh & (buy > 0)
+        usable_sell = fresh & (sell > 0)
+
+        # Pairs actually tested this check: an updated exchange against every fresh, quoted counterpart
+        tested = set()
+        for exchange_id in exchange_ids:
+            if buy[exchange_id] > 0:
+                tested.update((exchange_id, sell_id) for sell_id in np.flatnonzero(usable_sell) if sell_id != exchange_id)
+            if sell[exchange_id] > 0:
+                tested.update((buy_id, exchange_id) for buy_id in np.flatnonzero(usable_buy) if buy_id != exchange_id)
+
+        hits = []
+        for exchange_id in exchange_ids:
+            # Excluded from here on: the pair with itself, then (in a batch) pairs already tested
+            usable_buy[exchange_id] = usable_sell[exchange_id] = False
+
+            # Updated exchange as the buy side, then as the sell side
+            if buy[exchange_id] > 0:
+                for sell_id in np.flatnonzero(usable_sell & (sell >= buy[exchange_id] * ratio[exchange_id])):
+                    hits.append((exchange_id, sell_id, exchange_id))
+            if sell[exchange_id] > 0:
+                for buy_id in np.flatnonzero(usable_buy & (sell[exchange_id] >= buy * ratio[:, exchange_id])):
+                    hits.append((buy_id, exchange_id, exchange_id))
+
+        episode_hits = []
+        for buy_id, sell_id, trigger_id in hits:
+            buy_exchange = self.exchange_names[buy_id]
+            sell_exchange = self.exchange_names[sell_id]
+            buy_price = float(buy[buy_id])
+            sell_price = float(sell[sell_id])
+            spread_pct = ((sell_price - buy_price) / buy_price) * 100
+            total_fees = float(tables.total_fees[buy_id, sell_id])
+            profit_after_fees = spread_pct - total_fees
+            if profit_after_fees > 0:
+                max_size_usd, size_profit = self._size_opportunity(symbol, buy_id, sell_id, total_fees)
+            else:
+                max_size_usd, size_profit = np.nan, None  # Not sized (NaN), unlike a walk that finds no profitable size (0.0)
+
+            received_ns = int(received[trigger_id])  # Receive time of the tick that produced the hit
+            self.opportunities.append(
+                symbol, buy_exchange, sell_exchange,
+                buy_price, sell_price, spread_pct, profit_after_fees, now_ns,
+                received_ns=received_ns, max_size_usd=max_size_usd, size_profit=size_profit
             )
-
-            self.opportunities.append(opportunity)
+            self._emit_probes[trigger_id].sample(received_ns)
             self.total_opportunities_found += 1
 
+            self.profit_stats.add(now_ns, profit_after_fees)
+
             # Track by pair
-            pair_key = f"{buy_exchange}->{sell_exchange}:{buy_data.symbol}"
-            self.opportunities_by_pair[pair_key] = \
-                self.opportunities_by_pair.get(pair_key, 0) + 1
-
-            logger.success(
-                f"ARBITRAGE FOUND: Buy {buy_data.symbol} on {buy_exchange} @ ${buy_price:.2f}, "
-                f"Sell on {sell_exchange} @ ${sell_price:.2f} | "
-                f"Profit: {profit_after_fees:.2f}%"
+            self.pair_counts.increment(f"{buy_exchange}->{sell_exchange}:{symbol}")
+            episode_hits.append((buy_exchange, sell_exchange, profit_after_fees))
+
+        if hits:
+            self.profit_stats.expire(now_ns)
+
+        # Opening / closing episodes is what gets logged, not every tick of an ongoing one
+        names = self.exchange_names
+        self.episodes.observe(symbol, {(names[b], names[s]) for b, s in tested}, episode_hits, now_ns)
+
+    def _check_cycles(self):
+        """Record the cycles through quotes moved since the last check that just turned profitable."""
+        if self.cycle_engine is None:
+            return
+        engine = self.cycle_engine
+        opened = engine.detect(self.clock.monotonic_ns(), self.max_age_ns)
+        if not opened:
+            return
+        timestamp = ns_to_datetime(self.clock.wall_ns())
+        for cycle_id, profit_after_fees in opened:
+            legs = engine.legs(cycle_id)
+            trades = [leg for leg in legs if leg.side != "transfer"]
+            gross = float(np.prod([leg.price if leg.side == "sell" else 1 / leg.price for leg in trades]))
+            path = "->".join(engine.path(cycle_id))
+            self.cycle_opportunities.append(ArbitrageOpportunity(
+                buy_exchange=trades[0].exchange,
+                sell_exchange=trades[-1].exchange,
+                symbol=path,
+                buy_price=1.0,
+                sell_price=gross,
+                spread_pct=(gross - 1) * 100,
+                profit_after_fees=profit_after_fees,
+                timestamp=timestamp,
+                legs=legs
+            ))
+            self.total_cycles_found += 1
+            logger.info(
+                f"Cycle opened: {path} via {' / '.join(sorted({leg.exchange for leg in legs}))} "
+                f"({len(legs)} legs, {profit_after_fees:+.3f}% after fees)"
             )
 
-    def _get_exchange_fee(self, exchange_name: str) -> float:
-        """Get fee percentage for an exchange."""
-        for exchange, config in EXCHANGE_CONFIGS.items():
-            if config.name == exchange_name:
-                return config.fee_pct
-        return 0.5  # Default conservative estimate
+    @property
+    def has_cycles(self) -> bool:
+        """Whether multi-leg cycles are searched (get_recent_cycles stays empty otherwise)."""
+        return self.cycle_engine is not None
+
+    def get_recent_cycles(self, minutes: int = 5) -> List[ArbitrageOpportunity]:
+        """Get multi-leg cycle opportunities from the last N minutes, oldest first."""
+        cutoff = ns_to_datetime(self._cutoff_ns(minutes))
+        recent = []
+        for opp in reversed(self.cycle_opportunities):  # Newest first, so only the window is scanned
+            if opp.timestamp < cutoff:
+                break
+            recent.append(opp)
+        return recent[::-1]
+
+    def _depth(self, symbol: str, exchange_id: int, asks: bool) -> Optional[Depth]:
+        """Known depth on one side of a market: its synced L2 book, else the latest quote's top level."""
+        exchange = self.exchange_names[exchange_id]
+        if self.books is not None:
+            book = self.books.get(exchange, symbol)
+            if book is not None and book.synced:
+                ladder = book.asks if asks else book.bids
+                if len(ladder):
+                    return Depth(*ladder.levels(DEPTH_LEVELS))
+        price_data = self.symbol_slots[symbol][exchange_id]
+        if price_data is None:
+            return None
+        price, size = (price_data.ask, price_data.ask_size) if asks else (price_data.bid, price_data.bid_size)
+        if price > 0 and size > 0:
+            return Depth((price,), (size,))
+        return None
+
+    def _walk_pair(self, asks: Depth, bids: Depth, total_fees: float) -> Dict:
+        """Buy each notional up `asks`, sell the same quantity down `bids`; plus the largest profitable size."""
+        quantities = asks.quantity_for_notional(self.notionals)
+        buy_vwap, sell_vwap = self.notionals / quantities, bids.vwap(quantities)
+        max_quantity, max_size_usd = max_profitable_quantity(asks, bids, 1 + total_fees / 100)
+        return {
+            'quantity': quantities,
+            'buy_vwap': buy_vwap,
+            'sell_vwap': sell_vwap,
+            'profit_after_fees': (sell_vwap / buy_vwap - 1) * 100 - total_fees,
+            'max_quantity': max_quantity,
+            'max_size_usd': max_size_usd,
+        }
+
+    def _size_opportunity(
+        self,
+        symbol: str,
+        buy_id: int,
+        sell_id: int,
+        total_fees: float
+    ) -> Tuple[float, Optional[np.ndarray]]:
+        """(largest profitable buy notional, profit after fees at each notional's VWAPs); NaN / None without depth."""
+        asks = self._depth(symbol, buy_id, asks=True)
+        bids = self._depth(symbol, sell_id, asks=False)
+        if asks is None or bids is None:
+            return np.nan, None
+        walk = self._walk_pair(asks, bids, total_fees)
+        return walk['max_size_usd'], walk['profit_after_fees']
+
+    def get_executable_spread(self, symbol: str, buy_exchange: str, sell_exchange: str) -> Dict:
+        """VWAP fill prices and profit after fees for each DEPTH_NOTIONALS_USD on one buy/sell pair.
+
+        NaN entries are notionals beyond the known depth; empty when either
+        side has no depth at all.
+        """
+        buy_id = self.exchange_ids.get(buy_exchange)
+        sell_id = self.exchange_ids.get(sell_exchange)
+        if buy_id is None or sell_id is None or symbol not in self.symbol_slots:
+            return {}
+        asks = self._depth(symbol, buy_id, asks=True)
+        bids = self._depth(symbol, sell_id, asks=False)
+        if asks is None or bids is None:
+            return {}
+        walk = self._walk_pair(asks, bids, float(self.cost_model.tables.total_fees[buy_id, sell_id]))
+        result = {key: value.tolist() if isinstance(value, np.ndarray) else value for key, value in walk.items()}
+        result['notionals'] = self.notionals.tolist()
+        result['depth'] = (asks.total_size, bids.total_size)
+        return result
 
     def get_recent_opportunities(self, minutes: int = 5) -> List[ArbitrageOpportunity]:
         """Get opportunities from the last N minutes."""
-        cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=minutes)
-        return [
-            opp for opp in self.opportunities
-            if opp.timestamp >= cutoff_time
-        ]
+        self._trace_delivery()
+        return self.opportunities.since(self._cutoff_ns(minutes))
+
+    def _trace_delivery(self):
+        """Sample receive -> first-read latency of the opportunities no consumer has read yet."""
+        store = self.opportunities
+        new = min(store.total_appended - self._delivered, store.size)
+        self._delivered = store.total_appended
+        if new <= 0:
+            return
+        offsets = np.arange(0, new, self.tracer.sample_every)
+        received = store.received_ns[(store.head - new + offsets) % store.capacity]
+        received = received[received > 0]
+        self._deliver_histogram.record_many(self.clock.monotonic_ns() - received)
+
+    def _cutoff_ns(self, minutes: float) -> int:
+        """Epoch-ns timestamp N minutes ago."""
+        return self.clock.wall_ns() - int(minutes * 60e9)
 
     def get_best_opportunity(self) -> Optional[ArbitrageOpportunity]:
         """Get the most profitable recent opportunity."""
-        recent = self.get_recent_opportunities(minutes=1)
-        if not recent:
-            return None
-        return max(recent, key=lambda x: x.profit_after_fees)
+        self._trace_delivery()
+        return self.opportunities.best_since(self._cutoff_ns(minutes=1))
+
+    def get_recent_episodes(self, minutes: int = 60) -> List[OpportunityEpisode]:
+        """Get opportunity episodes that closed in the last N minutes."""
+        return self.episodes.recent_episodes(minutes, self.clock.wall_ns())
 
     def get_latest_prices(self, symbol: str) -> Dict[str, PriceData]:
         """Get latest prices for a specific symbol across all exchanges."""
-        prices = {}
-        for (exchange, sym), price_data in self.latest_prices.items():
-            if sym == symbol:
-                prices[exchange] = price_data
-        return prices
+        slots = self.symbol_slots.get(symbol)
+        if slots is None:
+            return {}
+        return {
+            price_data.exchange: price_data
+            for price_data in slots
+            if price_data is not None
+        }
 
     def get_statistics(self) -> Dict:
-        """Get detection statistics."""
-        recent_opps = self.get_recent_opportunities(minutes=60)
+        """Get detection statistics (last-hour profit figures, all-time top pairs, cycle counts: all-time / last 5 min)."""
+        stats = self.profit_stats
+        stats.expire(self.clock.wall_ns())
+
+        cycles = {'total_cycles': self.total_cycles_found, 'recent_cycles': len(self.get_recent_cycles())}
 
-        if not recent_opps:
+        if stats.count == 0:
             return {
                 'total_opportunities': self.total_opportunities_found,
                 'recent_count': 0,
                 'avg_profit': 0,
                 'max_profit': 0,
-                'top_pairs': []
+                'top_pairs': [],
+                **cycles
             }
 
-        profits = [opp.profit_after_fees for opp in recent_opps]
-
-        # Top 5 exchange pairs
-        top_pairs = sorted(
-            self.opportunities_by_pair.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
-
         return {
             'total_opportunities': self.total_opportunities_found,
-            'recent_count': len(recent_opps),
-            'avg_profit': sum(profits) / len(profits),
-            'max_profit': max(profits),
-            'min_profit': min(profits),
-            'top_pairs': [{'pair': pair, 'count': count} for pair, count in top_pairs]
+            'recent_count': stats.count,
+            'avg_profit': stats.mean,
+            'max_profit': stats.max,
+            'min_profit': stats.min,
+            'top_pairs': [{'pair': pair, 'count': count} for pair, count in self.pair_counts.top()],
+            **cycles
         }
 
     def get_historical_data(self, symbol: str) -> pd.DataFrame:
@@ -193,15 +484,17 @@ class ArbitrageDetector:
         if symbol not in self.price_buffer:
             return pd.DataFrame()
 
-        data = list(self.price_buffer[symbol])
-        if not data:
-            return pd.DataFrame()
-
-        df = pd.DataFrame(data)
-        return df
+        return self.price_buffer[symbol].to_dataframe()
 
     def calculate_spread_metrics(self, symbol: str) -> Dict:
-        """Calculate spread statistics for a symbol."""
+        """Get spread statistics for a symbol from the online tracker (whole session)."""
+        tracker = self.spread_trackers.get(symbol)
+        if tracker is None:
+            return {}
+        return tracker.metrics()
+
+    def calculate_spread_metrics_full(self, symbol: str) -> Dict:
+        """Recompute spread statistics from the price buffer (kept to validate the online path)."""
         df = self.get_historical_data(symbol)
 
         if df.empty or len(df) < 2:
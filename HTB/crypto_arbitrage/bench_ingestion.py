@@ -0,0 +1,168 @@
+"""Benchmark: end-to-end ingestion throughput and latency against the local mock exchanges.
+
+For each offered rate, mock_exchange.py runs in its own process and streams
+to the real Coinbase/Binance/Bitstamp clients in MultiExchangeAggregator,
+which feed the real detector. Reported per rate: ticks delivered to the
+detector per second (with --batch, after conflation drops superseded
+ticks), and send -> detector latency percentiles (frames are stamped with
+their send time; Binance timestamps only have ms resolution).
+
+With --shards, measures detection instead: synthetic ticks over 200 symbols
+are pushed through a ShardedDetector with each shard count, and reported
+is ticks/sec from the first tick until every shard's snapshot shows the
+last one (so timings include up to one SNAPSHOT_PUBLISH_INTERVAL). Shards
+only scale while there is a free core per worker.
+
+Usage: python bench_ingestion.py [--rates 1000 5000 10000] [--seconds 10] [--batch] [--multiprocess] [--top-of-book]
+       python bench_ingestion.py --shards 1 2 4 [--ticks 200000]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+HOST, PORT = "127.0.0.1", 8766
+# Point the clients at the mock before config is imported (spawned workers inherit it too)
+os.environ.update({f"{name}_WS_URL": f"ws://{HOST}:{PORT}/{name.lower()}" for name in ("COINBASE", "BINANCE", "BITSTAMP")})
+
+import config
+
+# Symbols for the shard benchmark, added before shm_ring builds its id tables (spawned shards re-run this import)
+BENCH_SYMBOLS = [f"B{i:03d}-USD" for i in range(200)]
+config.SYMBOL_MAPPINGS.update({symbol: symbol for symbol in BENCH_SYMBOLS})
+
+import mock_exchange
+from arbitrage_detector import ArbitrageDetector
+from config import PriceData
+from data_ingestion import MultiExchangeAggregator
+from sharded_detector import ShardedDetector
+from shm_ring import TICK_EXCHANGES
+
+logger.remove()  # Module level, so spawned shard workers stay quiet too
+logger.add(sys.stderr, level="WARNING")
+
+
+async def measure(rate: float, seconds: float, batch: bool, multiprocess: bool, top_of_book: bool = False) -> dict:
+    """Run the pipeline against a mock offering `rate` frames/sec per exchange."""
+    context = multiprocessing.get_context("spawn")
+    server = context.Process(
+        target=mock_exchange.run_server, args=(HOST, PORT), kwargs={'rate': rate}, daemon=True
+    )
+    server.start()
+    await asyncio.sleep(1.0)  # Let the server bind
+
+    detector = ArbitrageDetector()
+    latencies = []
+
+    def on_tick(price_data):
+        latencies.append(time.time_ns() - price_data.timestamp_ns)
+        detector.update_price(price_data)
+
+    def on_batch(ticks):
+        now = time.time_ns()
+        latencies.extend(now - price_data.timestamp_ns for price_data in ticks)
+        detector.update_prices(ticks)
+
+    if batch:
+        aggregator = MultiExchangeAggregator(batch_callback=on_batch, multiprocess=multiprocess, top_of_book=top_of_book)
+    else:
+        aggregator = MultiExchangeAggregator(on_tick, multiprocess=multiprocess, top_of_book=top_of_book)
+
+    task = asyncio.create_task(aggregator.start())
+    await asyncio.sleep(2.0)  # Warm-up: connect, subscribe
+    latencies.clear()
+    started = time.perf_counter()
+    await asyncio.sleep(seconds)
+    elapsed = time.perf_counter() - started
+    sample = np.array(latencies, dtype=np.int64) / 1e6
+
+    task.cancel()
+    await aggregator.stop()
+    server.terminate()
+    server.join()
+
+    return {
+        'offered': rate * len(aggregator.clients),
+        'delivered': len(sample) / elapsed,
+        'p50_ms': float(np.percentile(sample, 50)) if len(sample) else float('nan'),
+        'p99_ms': float(np.percentile(sample, 99)) if len(sample) else float('nan'),
+        'max_ms': float(sample.max()) if len(sample) else float('nan'),
+    }
+
+
+def measure_shards(shards: int, ticks: int) -> dict:
+    """Push `ticks` synthetic quotes over BENCH_SYMBOLS through `shards` detector workers."""
+    rng = np.random.default_rng(0)
+    mids = 100 + rng.normal(0, 0.5, ticks)
+    keys = [
+        (TICK_EXCHANGES[(k // len(BENCH_SYMBOLS)) % len(TICK_EXCHANGES)], BENCH_SYMBOLS[k % len(BENCH_SYMBOLS)])
+        for k in range(ticks)
+    ]
+    last = {key: k for k, key in enumerate(keys)}  # Tick volume carries its index; a shard is done at the last one
+
+    with tempfile.TemporaryDirectory() as directory:
+        detector = ShardedDetector(shards, ring_capacity=ticks, snapshot_path=str(Path(directory) / "snapshot"))
+        detector.start()
+        try:
+            started = time.perf_counter()
+            for k, (exchange, symbol) in enumerate(keys):
+                mid = float(mids[k])
+                detector.update_price(PriceData(
+                    exchange, symbol, mid, float(k), time.time_ns(), mid - 0.05, mid + 0.05, time.monotonic_ns(), 1.0, 1.0
+                ))
+            routed = time.perf_counter() - started
+
+            pending = set(last)
+            while pending:
+                for symbol in {symbol for _, symbol in pending}:
+                    prices = detector.get_latest_prices(symbol)
+                    pending -= {
+                        (exchange, symbol) for exchange, price_data in prices.items()
+                        if price_data.volume == last.get((exchange, symbol))
+                    }
+                time.sleep(0.01)
+            elapsed = time.perf_counter() - started
+        finally:
+            detector.stop()
+
+    return {'shards': shards, 'ticks': ticks, 'routed': ticks / routed, 'detected': ticks / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rates", type=float, nargs="+", default=[1000, 5000, 10000], help="Frames/sec offered per exchange")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Measurement window per rate")
+    parser.add_argument("--batch", action="store_true", help="Deliver through the conflating queue (main.py's path)")
+    parser.add_argument("--multiprocess", action="store_true", help="One ingestion worker process per exchange")
+    parser.add_argument("--top-of-book", action="store_true", help="Quote channels (Binance bookTicker, Bitstamp order_book)")
+    parser.add_argument("--shards", type=int, nargs="+", help="Measure sharded detection with these shard counts instead")
+    parser.add_argument("--ticks", type=int, default=200_000, help="Synthetic ticks per shard-count run")
+    args = parser.parse_args()
+
+    if args.shards:
+        print(f"{'shards':>8}{'routed/s':>14}{'detected/s':>14}{'speedup':>10}")
+        baseline = None
+        for shards in args.shards:
+            result = measure_shards(shards, args.ticks)
+            baseline = baseline or result['detected']
+            print(f"{shards:>8}{result['routed']:>14,.0f}{result['detected']:>14,.0f}{result['detected'] / baseline:>10.2f}")
+        return
+
+    print(f"{'offered/s':>12}{'delivered/s':>14}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for rate in args.rates:
+        result = asyncio.run(measure(rate, args.seconds, args.batch, args.multiprocess, args.top_of_book))
+        print(f"{result['offered']:>12,.0f}{result['delivered']:>14,.0f}"
+              f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['max_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark: per-exchange frame parse throughput (messages/sec) for each JSON backend.
+
+Frames are rebuilt in each exchange's wire format from the ticks recorded in
+captured_data/prices_*.csv (full schema, including fields the parsers skip),
+or read verbatim from --frames-dir/<exchange>.jsonl (one raw frame per line).
+
+"baseline" is the old path: json.loads into a dict for every frame, then the
+dict field extraction. The other rows go through message_parsers with the
+pre-filter and the named backend. --top-of-book benchmarks the quote channels
+(Binance bookTicker, Bitstamp order_book) instead of ticker / trades.
+
+Usage: python bench_parsers.py [--csv captured_data/prices_X.csv] [--frames-dir DIR] [--repeat 5] [--top-of-book]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import EXCHANGE_CONFIGS, SYMBOL_MAPPINGS
+from message_parsers import (
+    BACKENDS, CoinbaseParser, BinanceParser, BinanceBookTickerParser, BitstampParser, BitstampOrderBookParser
+)
+from mock_exchange import ENCODERS, QUOTE_ENCODERS
+from replay import load_ticks
+
+PARSERS = {"coinbase": CoinbaseParser, "binance": BinanceParser, "bitstamp": BitstampParser}
+QUOTE_PARSERS = {**PARSERS, "binance": BinanceBookTickerParser, "bitstamp": BitstampOrderBookParser}
+
+
+# Control frames each stream also carries; the pre-filter should drop these without decoding
+NOISE = {
+    "coinbase": '{"type":"heartbeat","last_trade_id":90000000,"product_id":"BTC-USD","sequence":1,'
+                '"time":"2025-11-01T22:05:16.874573Z"}',
+    "binance": '{"result":null,"id":1}',
+    "bitstamp": '{"event":"bts:heartbeat","channel":"","data":{"status":"success"}}',
+}
+
+
+def frames_from_csv(csv_path: Path, encoders: Dict = ENCODERS) -> Dict[str, List[str]]:
+    """Re-encode recorded ticks as wire frames, with one control frame per ten ticks."""
+    df = load_ticks([csv_path])
+    frames = {}
+    for exchange, encode in encoders.items():
+        config = EXCHANGE_CONFIGS[exchange]
+        exchange_symbols = {SYMBOL_MAPPINGS[symbol]: symbol for symbol in config.symbols}  # BTC-USD -> BTCUSDT
+        rows = df[df['exchange'] == config.name]
+        frames[exchange.value] = []
+        for sequence, row in enumerate(rows.itertuples(index=False)):
+            frames[exchange.value].append(encode(
+                exchange_symbols[row.symbol], row.price, row.volume, row.bid, row.ask, row.timestamp_ns, sequence
+            ))
+            if sequence % 10 == 9:
+                frames[exchange.value].append(NOISE[exchange.value])
+    return frames
+
+
+def frames_from_dir(directory: Path) -> Dict[str, List[str]]:
+    """Load raw frames recorded one per line in <exchange>.jsonl."""
+    return {
+        exchange: (directory / f"{exchange}.jsonl").read_text().splitlines()
+        for exchange in PARSERS
+        if (directory / f"{exchange}.jsonl").exists()
+    }
+
+
+def throughput(parse, frames: List[str], repeat: int) -> float:
+    """Best-of-N messages/sec for one parse function."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame in frames:
+            try:
+                parse(frame)
+            except ValueError:
+                pass
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best
+
+
+def baseline(parser):
+    """The pre-message_parsers path: full json.loads, then dict extraction."""
+    def parse(frame):
+        return parser.from_dict(json.loads(frame))
+    return parse
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", type=Path, default=None, help="Recorded prices CSV (default: newest in captured_data/)")
+    parser.add_argument("--frames-dir", type=Path, default=None, help="Directory of <exchange>.jsonl raw frames")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top-of-book", action="store_true", help="Quote channels (bookTicker / order_book)")
+    args = parser.parse_args()
+    parsers = QUOTE_PARSERS if args.top_of_book else PARSERS
+
+    if args.frames_dir:
+        frames = frames_from_dir(args.frames_dir)
+    else:
+        csv_path = args.csv or max((Path(__file__).parent / "captured_data").glob("prices_*.csv"))
+        frames = frames_from_csv(csv_path, {**ENCODERS, **QUOTE_ENCODERS} if args.top_of_book else ENCODERS)
+
+    print(f"{'exchange':<10}{'frames':>8}{'parser':>10}{'msgs/sec':>14}{'speedup':>10}")
+    for exchange, exchange_frames in frames.items():
+        if not exchange_frames:
+            continue
+        reference = throughput(baseline(parsers[exchange](backend="json")), exchange_frames, args.repeat)
+        print(f"{exchange:<10}{len(exchange_frames):>8}{'baseline':>10}{reference:>14,.0f}{1.0:>9.2f}x")
+        for backend in BACKENDS:
+            rate = throughput(parsers[exchange](backend=backend).parse, exchange_frames, args.repeat)
+            print(f"{'':<10}{'':>8}{backend:>10}{rate:>14,.0f}{rate / reference:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Microbenchmark: construction cost and memory of the per-tick record types.
+
+Compares the __slots__ PriceData / ArbitrageOpportunity in config.py with
+the previous __dict__ dataclasses (PriceData with its timestamp-normalizing
+__post_init__), at 1M instances each.
+
+Usage: python bench_records.py [--count 1000000]
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import PriceData, ArbitrageOpportunity
+
+
+@dataclass
+class LegacyPriceData:
+    """PriceData as it was before: dataclass with per-tick __post_init__."""
+    exchange: str
+    symbol: str
+    price: float
+    volume: float
+    timestamp: datetime
+    bid: float = 0.0
+    ask: float = 0.0
+
+    def __post_init__(self):
+        if isinstance(self.timestamp, (int, float)):
+            self.timestamp = datetime.fromtimestamp(self.timestamp / 1000, tz=timezone.utc)
+        elif isinstance(self.timestamp, datetime) and self.timestamp.tzinfo is None:
+            self.timestamp = self.timestamp.replace(tzinfo=timezone.utc)
+
+
+@dataclass
+class LegacyArbitrageOpportunity:
+    """ArbitrageOpportunity as it was before: plain dataclass."""
+    buy_exchange: str
+    sell_exchange: str
+    symbol: str
+    buy_price: float
+    sell_price: float
+    spread_pct: float
+    profit_after_fees: float
+    timestamp: datetime
+    confidence_score: float = 0.0
+
+
+def build_legacy_prices(count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        LegacyPriceData(exchange="Coinbase", symbol="BTC-USD", price=50000.0 + i, volume=1.0,
+                        timestamp=now, bid=49999.0, ask=50001.0)
+        for i in range(count)
+    ]
+
+
+def build_prices(count: int):
+    now_ns = time.time_ns()
+    return [
+        PriceData(exchange="Coinbase", symbol="BTC-USD", price=50000.0 + i, volume=1.0,
+                  timestamp_ns=now_ns, bid=49999.0, ask=50001.0, received_ns=now_ns)
+        for i in range(count)
+    ]
+
+
+def build_legacy_opportunities(count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        LegacyArbitrageOpportunity(buy_exchange="Coinbase", sell_exchange="Binance", symbol="BTC-USD",
+                                   buy_price=50000.0, sell_price=50100.0 + i, spread_pct=0.2,
+                                   profit_after_fees=0.1, timestamp=now)
+        for i in range(count)
+    ]
+
+
+def build_opportunities(count: int):
+    now = datetime.now(timezone.utc)
+    return [
+        ArbitrageOpportunity(buy_exchange="Coinbase", sell_exchange="Binance", symbol="BTC-USD",
+                             buy_price=50000.0, sell_price=50100.0 + i, spread_pct=0.2,
+                             profit_after_fees=0.1, timestamp=now)
+        for i in range(count)
+    ]
+
+
+def measure(builder, count: int):
+    """Return (ns per construction, bytes per retained instance)."""
+    gc.collect()
+    gc.disable()  # Keep cyclic-GC passes over the growing list out of the timing
+    start = time.perf_counter_ns()
+    objects = builder(count)
+    elapsed = time.perf_counter_ns() - start
+    gc.enable()
+    del objects
+
+    gc.collect()
+    tracemalloc.start()
+    objects = builder(count)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Subtract the list itself and the per-instance float field so only the record counts
+    retained -= sys.getsizeof(objects) + count * sys.getsizeof(1.0)
+    del objects
+    return elapsed / count, retained / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("PriceData", build_legacy_prices, build_prices),
+        ("ArbitrageOpportunity", build_legacy_opportunities, build_opportunities),
+    ]
+    print(f"{args.count:,} instances per case")
+    print(f"{'record':<22}{'variant':<10}{'ns/object':>12}{'bytes/object':>15}")
+    for name, legacy, current in cases:
+        for variant, builder in (("dataclass", legacy), ("slots", current)):
+            ns, size = measure(builder, args.count)
+            print(f"{name:<22}{variant:<10}{ns:>12.0f}{size:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
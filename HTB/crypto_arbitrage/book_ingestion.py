@@ -0,0 +1,170 @@
+"""Order book feeds: exchange clients that maintain L2 books from depth diff channels.
+
+Each client is its venue's data_ingestion client subscribed to the diff
+channel instead of the ticker:
+
+    Coinbase    level2 / level2_batch   snapshot in-stream after every subscribe, then l2update changes
+    Binance     <symbol>@depth@100ms    update-id ranges (U..u); snapshot from REST /api/v3/depth
+    Bitstamp    diff_order_book_<pair>  ordered by microtimestamp; snapshot from REST /api/v2/order_book
+
+Diffs go into the shared OrderBookSet (see order_book.py). A book that has
+no snapshot yet, or that saw a sequence gap, buffers its diffs and requests
+a REST snapshot in the background (at most once per BOOK_RESYNC_MIN_SECONDS);
+every reconnect invalidates the exchange's books. Whenever a synced book's
+top level changes, the client emits a top-of-book PriceData, so the rest of
+the pipeline (detector, rings, health) sees books as a quote feed.
+"""
+import asyncio
+import time
+from typing import Callable, Dict, List, Set, Tuple
+
+import requests
+from loguru import logger
+
+from clock import monotonic_ns, seconds_to_ns
+from config import (
+    PriceData, Exchange, BOOK_RESYNC_MIN_SECONDS, BOOK_SNAPSHOT_TIMEOUT, BOOK_SNAPSHOT_DEPTH, COINBASE_BOOK_CHANNEL
+)
+from data_ingestion import BinanceClient, BitstampClient, CoinbaseClient
+from message_parsers import (
+    BookUpdate, CoinbaseLevel2Parser, BinanceDepthParser, BitstampDiffParser, bitstamp_ns, parse_levels
+)
+from order_book import OrderBook, OrderBookSet
+
+Snapshot = Tuple[List[Tuple[float, float]], List[Tuple[float, float]], int, int]  # bids, asks, sequence, timestamp_ns
+
+
+class OrderBookFeed:
+    """Mixin for a venue client: parse depth diffs into `books` instead of forwarding ticks."""
+
+    book_parser = None  # FrameParser class producing BookUpdates
+
+    def __init__(self, callback: Callable[[PriceData], None], books: OrderBookSet):
+        super().__init__(callback)
+        self.parser = self.book_parser()
+        self.books = books
+        self._resyncing: Set[str] = set()  # Symbols with a snapshot request in flight
+        self._resync_after: Dict[str, int] = {}  # {symbol: monotonic ns before which not to request again}
+        self._resync_tasks: Set[asyncio.Task] = set()
+
+    async def connect(self):
+        """Connect, then mark this exchange's books unsynced (diffs missed while down)."""
+        await super().connect()
+        for symbol in self.config.symbols:
+            self.books.book(self.config.name, self.normalize_symbol(symbol)).invalidate()
+
+    async def handle_message(self, update: BookUpdate, received_ns: int):
+        """Apply one snapshot or diff, and publish the top of the book if it moved."""
+        symbol, bids, asks, timestamp_ns, first_sequence, last_sequence, is_snapshot = update
+        if symbol not in self.config.symbols:
+            return
+        book = self.books.book(self.config.name, self.normalize_symbol(symbol))
+        top = book.top()
+        if is_snapshot:
+            book.apply_snapshot(bids, asks, last_sequence, timestamp_ns)
+        else:
+            book.apply_update(bids, asks, timestamp_ns, first_sequence, last_sequence)
+        if not book.synced:
+            self.request_snapshot(book, symbol)
+        elif book.top() != top:
+            self.publish_top(book, received_ns)
+
+    def publish_top(self, book: OrderBook, received_ns: int):
+        bid, ask, bid_size, ask_size = book.top()
+        if bid <= 0 or ask <= 0:
+            return
+        self.callback(PriceData(
+            self.config.name, book.symbol, (bid + ask) / 2, 0.0, book.timestamp_ns or time.time_ns(),
+            bid, ask, received_ns, bid_size, ask_size
+        ))
+
+    def request_snapshot(self, book: OrderBook, symbol: str):
+        """Fetch a REST snapshot for an unsynced book in the background (throttled per symbol)."""
+        if not self.config.rest_url or symbol in self._resyncing:
+            return
+        now_ns = monotonic_ns()
+        if now_ns < self._resync_after.get(symbol, 0):
+            return
+        self._resyncing.add(symbol)
+        self._resync_after[symbol] = now_ns + seconds_to_ns(BOOK_RESYNC_MIN_SECONDS)
+        task = asyncio.create_task(self.resync(book, symbol))
+        self._resync_tasks.add(task)
+        task.add_done_callback(self._resync_tasks.discard)
+
+    async def resync(self, book: OrderBook, symbol: str):
+        try:
+            bids, asks, sequence, timestamp_ns = await asyncio.to_thread(self.fetch_snapshot, symbol)
+        except Exception as e:
+            logger.warning(f"Failed to fetch {self.config.name} {symbol} book snapshot: {e}")
+            return
+        finally:
+            self._resyncing.discard(symbol)
+        if not self.running:
+            return
+        book.apply_snapshot(bids, asks, sequence, timestamp_ns)
+        if book.synced:
+            logger.info(f"{self.config.name} {book.symbol} book synced: {len(book.bids)} bids, {len(book.asks)} asks")
+            self.publish_top(book, monotonic_ns())
+        else:  # Buffered diffs no longer continue from the snapshot
+            self.request_snapshot(book, symbol)
+
+    def fetch_snapshot(self, symbol: str) -> Snapshot:
+        """Blocking REST snapshot for one exchange symbol (runs in a worker thread)."""
+        raise NotImplementedError
+
+    async def disconnect(self):
+        for task in list(self._resync_tasks):
+            task.cancel()
+        await super().disconnect()
+
+
+class CoinbaseBookClient(OrderBookFeed, CoinbaseClient):
+    """Coinbase level2 books; every (re)subscribe delivers a fresh snapshot, so no REST resync."""
+
+    book_parser = CoinbaseLevel2Parser
+
+    def __init__(self, callback: Callable[[PriceData], None], books: OrderBookSet):
+        super().__init__(callback, books)
+        self.channel = COINBASE_BOOK_CHANNEL
+
+
+class BinanceBookClient(OrderBookFeed, BinanceClient):
+    """Binance books from @depth@100ms diffs, synced to /api/v3/depth snapshots by update id."""
+
+    book_parser = BinanceDepthParser
+
+    def __init__(self, callback: Callable[[PriceData], None], books: OrderBookSet):
+        super().__init__(callback, books)
+        self.stream = "depth@100ms"
+
+    def fetch_snapshot(self, symbol: str) -> Snapshot:
+        response = requests.get(
+            f"{self.config.rest_url}/api/v3/depth",
+            params={"symbol": symbol.upper(), "limit": BOOK_SNAPSHOT_DEPTH},
+            timeout=BOOK_SNAPSHOT_TIMEOUT
+        )
+        response.raise_for_status()
+        data = response.json()
+        return parse_levels(data["bids"]), parse_levels(data["asks"]), int(data["lastUpdateId"]), 0
+
+
+class BitstampBookClient(OrderBookFeed, BitstampClient):
+    """Bitstamp books from diff_order_book_* channels, synced to /api/v2/order_book snapshots by time."""
+
+    book_parser = BitstampDiffParser
+
+    def fetch_snapshot(self, symbol: str) -> Snapshot:
+        response = requests.get(
+            f"{self.config.rest_url}/api/v2/order_book/{symbol}/", timeout=BOOK_SNAPSHOT_TIMEOUT
+        )
+        response.raise_for_status()
+        data = response.json()
+        timestamp_ns = bitstamp_ns(data.get("timestamp"), data.get("microtimestamp"))
+        return parse_levels(data["bids"]), parse_levels(data["asks"]), 0, timestamp_ns
+
+
+BOOK_CLIENT_CLASSES = {
+    Exchange.COINBASE: CoinbaseBookClient,
+    Exchange.BINANCE: BinanceBookClient,
+    Exchange.BITSTAMP: BitstampBookClient,
+}
@@ -7,6 +7,7 @@ from loguru import logger
 
 from .base_bot import BaseBot, Trade
 from .trade_logger import TradeLogger
+from clock import iso8601_to_ns, ns_to_datetime
 from config import ArbitrageOpportunity
 
 
@@ -66,7 +67,7 @@ class BacktestEngine:
                     sell_price=row['sell_price'],
                     spread_pct=row['spread_pct'],
                     profit_after_fees=row['profit_after_fees'],
-                    timestamp=pd.to_datetime(row['timestamp'])
+                    timestamp=ns_to_datetime(iso8601_to_ns(row['timestamp']))
                 )
                 opportunities.append(opp)
 
@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from typing import Optional, Dict, List
 from datetime import datetime
 from dataclasses import dataclass
+import numpy as np
 from loguru import logger
 
 from config import ArbitrageOpportunity
@@ -113,9 +114,14 @@ class BaseBot(ABC):
         """
         Execute a trade with realistic simulation.
 
+        When the detector sized the opportunity against order book depth
+        (a finite, positive max_size_usd), the position is capped at its
+        largest profitable size; slippage comes from the VWAP profits
+        instead of the flat slippage_pct wherever those are known.
+
         Args:
             opportunity: Arbitrage opportunity
-            slippage_pct: Price slippage percentage
+            slippage_pct: Price slippage percentage (per side, without depth)
             execution_time_ms: Simulated execution time
 
         Returns:
@@ -132,6 +138,11 @@ class BaseBot(ABC):
             logger.warning(f"{self.name}: Insufficient capital for trade")
             return None
 
+        max_size_usd = opportunity.max_size_usd
+        if max_size_usd is not None and np.isfinite(max_size_usd) and max_size_usd > 0:
+            position_size_usd = min(position_size_usd, max_size_usd)
+        slippage_pct = self.depth_slippage_pct(opportunity, position_size_usd, slippage_pct)
+
         # Simulate slippage
         slippage_factor = slippage_pct / 100.0
         actual_buy_price = opportunity.buy_price * (1 + slippage_factor)
@@ -198,6 +209,39 @@ class BaseBot(ABC):
 
         return trade
 
+    @staticmethod
+    def depth_slippage_pct(
+        opportunity: ArbitrageOpportunity,
+        position_size_usd: float,
+        default_pct: float
+    ) -> float:
+        """
+        Per-side slippage implied by the opportunity's VWAP profits at a position size.
+
+        Profit after fees is interpolated between the touch (size 0) and the
+        sized notionals; the drop from the touch is split evenly across the
+        two legs.
+
+        Args:
+            opportunity: Arbitrage opportunity
+            position_size_usd: Amount in USD to trade
+            default_pct: Slippage to use when the depth does not cover the position
+
+        Returns:
+            Slippage percentage per side
+        """
+        if not opportunity.size_profits:
+            return default_pct
+        notionals = sorted(opportunity.size_profits)
+        if position_size_usd > notionals[-1]:
+            return default_pct
+        profit = np.interp(
+            position_size_usd,
+            [0.0] + notionals,
+            [opportunity.profit_after_fees] + [opportunity.size_profits[n] for n in notionals]
+        )
+        return max(float(opportunity.profit_after_fees - profit), 0.0) / 2
+
     def get_performance_metrics(self) -> Dict:
         """Calculate and return performance metrics."""
         if not self.trades:
@@ -244,7 +288,6 @@ class BaseBot(ABC):
         # Calculate Sharpe ratio (simplified)
         returns = [trade.actual_profit_pct for trade in self.trades]
         if len(returns) > 1:
-            import numpy as np
             mean_return = np.mean(returns)
             std_return = np.std(returns)
             sharpe_ratio = (mean_return / std_return) if std_return > 0 else 0.0
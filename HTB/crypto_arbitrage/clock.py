@@ -0,0 +1,107 @@
+"""Integer-nanosecond time helpers.
+
+Ticks carry two int64 timestamps: the exchange event time in epoch ns and a
+time.monotonic_ns() receive time. Freshness is judged on the monotonic clock
+(immune to exchange clock skew and wall-clock steps); datetime objects are only
+built at the edges (CSV export, dashboards) via ns_to_datetime.
+
+Components that need "now" take a Clock, so offline replays can run the
+production code on simulated time advanced from the recorded data.
+"""
+import time
+from datetime import datetime, timezone
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+wall_ns = time.time_ns
+monotonic_ns = time.monotonic_ns
+
+
+class Clock:
+    """Source of 'now': epoch ns for timestamps, monotonic ns for freshness."""
+
+    def wall_ns(self) -> int:
+        return time.time_ns()
+
+    def monotonic_ns(self) -> int:
+        return time.monotonic_ns()
+
+
+class SimulatedClock(Clock):
+    """Clock that only moves when told to (replays, reproducible runs).
+
+    Both readings are the simulated epoch ns: the monotonic reading is only
+    ever compared against other readings of the same clock, so any origin works.
+    """
+
+    def __init__(self, start_ns: int = 0):
+        self.now_ns = start_ns
+
+    def wall_ns(self) -> int:
+        return self.now_ns
+
+    def monotonic_ns(self) -> int:
+        return self.now_ns
+
+    def advance_to(self, timestamp_ns: int):
+        """Move time forward to timestamp_ns (never backwards)."""
+        if timestamp_ns > self.now_ns:
+            self.now_ns = timestamp_ns
+
+
+SYSTEM_CLOCK = Clock()
+
+
+def seconds_to_ns(seconds: float) -> int:
+    """Convert a duration in seconds to integer ns."""
+    return int(seconds * NS_PER_SECOND)
+
+
+def ns_to_datetime(timestamp_ns: int) -> datetime:
+    """Epoch ns to an aware UTC datetime (edge use only)."""
+    return datetime.fromtimestamp(timestamp_ns / NS_PER_SECOND, tz=timezone.utc)
+
+
+def ns_to_datetime_index(timestamps_ns):
+    """Array of epoch ns to an aware UTC pandas DatetimeIndex (ns_to_datetime for whole columns)."""
+    import pandas as pd
+    return pd.to_datetime(timestamps_ns, unit='ns', utc=True)
+
+
+def datetime_to_ns(value: datetime) -> int:
+    """Aware (or naive UTC) datetime to epoch ns."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86_400 + delta.seconds) * NS_PER_SECOND + delta.microseconds * 1000
+
+
+def _days_from_civil(year: int, month: int, day: int) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian date (Howard Hinnant's algorithm)."""
+    year -= month <= 2
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def iso8601_to_ns(text: str) -> int:
+    """Parse 'YYYY-MM-DDTHH:MM:SS[.fraction]Z' to epoch ns without building a datetime.
+
+    Anything else (e.g. explicit offsets) falls back to datetime.fromisoformat.
+    """
+    if len(text) >= 20 and text[-1] == 'Z' and text[10] == 'T':
+        days = _days_from_civil(int(text[0:4]), int(text[5:7]), int(text[8:10]))
+        seconds = int(text[11:13]) * 3600 + int(text[14:16]) * 60 + int(text[17:19])
+        fraction = text[20:-1] if text[19] == '.' else ''
+        nanos = int(fraction[:9].ljust(9, '0')) if fraction else 0
+        return days * NS_PER_DAY + seconds * NS_PER_SECOND + nanos
+    return datetime_to_ns(datetime.fromisoformat(text.replace("Z", "+00:00")))
+
+
+def iso8601_column_to_ns(values):
+    """iso8601_to_ns for a whole column of strings, as an int64 array (naive values are UTC)."""
+    import pandas as pd
+    return pd.DatetimeIndex(pd.to_datetime(values, format='ISO8601', utc=True)).as_unit('ns').asi8
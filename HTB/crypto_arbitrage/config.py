@@ -1,8 +1,12 @@
 """Configuration and data models for crypto arbitrage system."""
+import os
 from dataclasses import dataclass, field
-from typing import Dict, List
-from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional
+from datetime import datetime
 from enum import Enum
+from operator import attrgetter
+
+from clock import ns_to_datetime
 
 
 class Exchange(Enum):
@@ -12,82 +16,207 @@ class Exchange(Enum):
     BITSTAMP = "bitstamp"
 
 
-@dataclass
-class PriceData:
-    """Normalized price data from any exchange."""
+class _SlottedRecord:
+    """Base for per-tick records: fixed __slots__ and no per-instance __dict__.
+
+    Subclasses list their fields in __slots__ in constructor order. The field
+    tuple and an attrgetter over it are cached on the class once, and repr,
+    equality and to_dict all go through them.
+    """
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = cls.__slots__
+        cls._values = attrgetter(*cls.__slots__)
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization (datetimes as ISO-8601)."""
+        return {
+            name: value.isoformat() if isinstance(value, datetime) else value
+            for name, value in zip(self._fields, self._values(self))
+        }
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values(self) == other._values(other)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self._values(self)))
+        return f"{self.__class__.__name__}({fields})"
+
+
+class PriceData(_SlottedRecord):
+    """Normalized price data from any exchange.
+
+    One event type for trades, tickers and top-of-book quotes (for quotes,
+    price is the bid/ask mid and volume is 0).
+
+    Built on every tick, so the constructor only stores fields: callers pass
+    integer ns timestamps (see clock.py) instead of having them normalized here.
+    """
+    __slots__ = ('exchange', 'symbol', 'price', 'volume', 'timestamp_ns', 'bid', 'ask', 'received_ns', 'bid_size', 'ask_size')
+
+    def __init__(
+        self,
+        exchange: str,
+        symbol: str,  # Normalized: BTC-USD
+        price: float,
+        volume: float,
+        timestamp_ns: int,  # Exchange event time, epoch ns
+        bid: float = 0.0,
+        ask: float = 0.0,
+        received_ns: int = 0,  # time.monotonic_ns() when the frame arrived (0 = not stamped)
+        bid_size: float = 0.0,  # Quantity at the best bid (0 = not sent by the venue)
+        ask_size: float = 0.0
+    ):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.price = price
+        self.volume = volume
+        self.timestamp_ns = timestamp_ns
+        self.bid = bid
+        self.ask = ask
+        self.received_ns = received_ns
+        self.bid_size = bid_size
+        self.ask_size = ask_size
+
+    @property
+    def timestamp(self) -> datetime:
+        """Exchange time as an aware UTC datetime (for dashboards and export)."""
+        return ns_to_datetime(self.timestamp_ns)
+
+
+class CycleLeg(NamedTuple):
+    """One conversion in a multi-leg (cycle) opportunity."""
     exchange: str
-    symbol: str  # Normalized: BTC-USD
-    price: float
-    volume: float
-    timestamp: datetime
-    bid: float = 0.0
-    ask: float = 0.0
-
-    def __post_init__(self):
-        """Ensure timestamp is datetime object with timezone."""
-        if isinstance(self.timestamp, (int, float)):
-            self.timestamp = datetime.fromtimestamp(self.timestamp / 1000, tz=timezone.utc)
-        elif isinstance(self.timestamp, datetime) and self.timestamp.tzinfo is None:
-            # Make naive datetime timezone-aware
-            self.timestamp = self.timestamp.replace(tzinfo=timezone.utc)
+    symbol: str  # Pair traded, or the asset moved by a transfer
+    side: str  # "buy", "sell" or "transfer"
+    price: float  # Quote used (0.0 for transfers)
+    rate: float  # Units received per unit given, after fees
+    to_exchange: str  # Same as exchange except for transfers
 
 
-@dataclass
-class ArbitrageOpportunity:
+class ArbitrageOpportunity(_SlottedRecord):
     """Detected arbitrage opportunity."""
+    __slots__ = ('buy_exchange', 'sell_exchange', 'symbol', 'buy_price', 'sell_price',
+                 'spread_pct', 'profit_after_fees', 'timestamp', 'confidence_score',
+                 'max_size_usd', 'size_profits', 'legs')
+
+    def __init__(
+        self,
+        buy_exchange: str,
+        sell_exchange: str,
+        symbol: str,
+        buy_price: float,
+        sell_price: float,
+        spread_pct: float,
+        profit_after_fees: float,
+        timestamp: datetime,
+        confidence_score: float = 0.0,  # ML prediction confidence
+        max_size_usd: Optional[float] = None,  # Largest buy notional still profitable after fees (None = not sized: no depth known, or unprofitable at the touch)
+        size_profits: Optional[Dict[float, float]] = None,  # {notional USD: profit after fees % at VWAP fill prices}
+        legs: Optional[List[CycleLeg]] = None  # Conversions of a multi-leg cycle (None for a two-exchange pair)
+    ):
+        self.buy_exchange = buy_exchange
+        self.sell_exchange = sell_exchange
+        self.symbol = symbol
+        self.buy_price = buy_price
+        self.sell_price = sell_price
+        self.spread_pct = spread_pct
+        self.profit_after_fees = profit_after_fees
+        self.timestamp = timestamp
+        self.confidence_score = confidence_score
+        self.max_size_usd = max_size_usd
+        self.size_profits = size_profits
+        self.legs = legs
+
+
+@dataclass
+class OpportunityEpisode:
+    """Lifecycle of one buy/sell/symbol dislocation, from open to reversion or staleness."""
+    symbol: str
     buy_exchange: str
     sell_exchange: str
-    symbol: str
-    buy_price: float
-    sell_price: float
-    spread_pct: float
-    profit_after_fees: float
-    timestamp: datetime
-    confidence_score: float = 0.0  # ML prediction confidence
+    start_ns: int
+    end_ns: int
+    peak_profit: float
+    avg_profit: float
+    tick_count: int = 1
+    close_reason: str = ""  # "reverted" or "stale"; empty while open
+
+    @property
+    def duration_seconds(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
 
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization."""
         return {
+            'symbol': self.symbol,
             'buy_exchange': self.buy_exchange,
             'sell_exchange': self.sell_exchange,
-            'symbol': self.symbol,
-            'buy_price': self.buy_price,
-            'sell_price': self.sell_price,
-            'spread_pct': self.spread_pct,
-            'profit_after_fees': self.profit_after_fees,
-            'timestamp': self.timestamp.isoformat(),
-            'confidence_score': self.confidence_score
+            'start': ns_to_datetime(self.start_ns).isoformat(),
+            'end': ns_to_datetime(self.end_ns).isoformat(),
+            'duration_seconds': self.duration_seconds,
+            'peak_profit': self.peak_profit,
+            'avg_profit': self.avg_profit,
+            'tick_count': self.tick_count,
+            'close_reason': self.close_reason
         }
 
 
+@dataclass
+class FeeTier:
+    """Volume-based fee tier (applies once 30-day volume reaches min_volume_usd)."""
+    min_volume_usd: float
+    maker_fee_pct: float
+    taker_fee_pct: float
+
+
 @dataclass
 class ExchangeConfig:
     """Configuration for each exchange."""
     name: str
     websocket_url: str
-    fee_pct: float
+    fee_pct: float  # Base taker fee
     symbols: List[str] = field(default_factory=list)
+    maker_fee_pct: Optional[float] = None  # Defaults to fee_pct when not set
+    fee_tiers: List[FeeTier] = field(default_factory=list)
+    rest_url: str = ""  # REST base for order book snapshots (empty = venue resyncs in-stream)
+
+
+def _websocket_url(exchange: Exchange, default: str) -> str:
+    """Endpoint for an exchange; <EXCHANGE>_WS_URL in the environment overrides it (e.g. mock_exchange.py)."""
+    return os.environ.get(f"{exchange.name}_WS_URL", default)
+
+
+def _rest_url(exchange: Exchange, default: str) -> str:
+    """REST base for an exchange; <EXCHANGE>_REST_URL in the environment overrides it."""
+    return os.environ.get(f"{exchange.name}_REST_URL", default)
 
 
 # Exchange configurations
 EXCHANGE_CONFIGS = {
     Exchange.COINBASE: ExchangeConfig(
         name="Coinbase",
-        websocket_url="wss://ws-feed.exchange.coinbase.com",
+        websocket_url=_websocket_url(Exchange.COINBASE, "wss://ws-feed.exchange.coinbase.com"),
         fee_pct=0.6,  # 0.6% taker fee
-        symbols=["BTC-USD", "ETH-USD", "SOL-USD"]
+        symbols=["BTC-USD", "ETH-USD", "SOL-USD", "ETH-BTC"]
     ),
     Exchange.BINANCE: ExchangeConfig(
         name="Binance",
-        websocket_url="wss://stream.binance.us:9443/ws",
+        websocket_url=_websocket_url(Exchange.BINANCE, "wss://stream.binance.us:9443/ws"),
         fee_pct=0.1,  # 0.1% taker fee
-        symbols=["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+        symbols=["BTCUSDT", "ETHUSDT", "SOLUSDT", "ETHBTC"],
+        rest_url=_rest_url(Exchange.BINANCE, "https://api.binance.us")
     ),
     Exchange.BITSTAMP: ExchangeConfig(
         name="Bitstamp",
-        websocket_url="wss://ws.bitstamp.net",
+        websocket_url=_websocket_url(Exchange.BITSTAMP, "wss://ws.bitstamp.net"),
         fee_pct=0.5,  # 0.5% taker fee
-        symbols=["btcusd", "ethusd", "solusd"]
+        symbols=["btcusd", "ethusd", "solusd", "ethbtc"],
+        rest_url=_rest_url(Exchange.BITSTAMP, "https://www.bitstamp.net")
     )
 }
 
@@ -98,18 +227,73 @@ SYMBOL_MAPPINGS = {
     "BTCUSDT": "BTC-USD",
     "ETHUSDT": "ETH-USD",
     "SOLUSDT": "SOL-USD",
+    "ETHBTC": "ETH-BTC",
     # Bitstamp → Standard
     "btcusd": "BTC-USD",
     "ethusd": "ETH-USD",
     "solusd": "SOL-USD",
+    "ethbtc": "ETH-BTC",
     # Coinbase already uses standard format
     "BTC-USD": "BTC-USD",
     "ETH-USD": "ETH-USD",
-    "SOL-USD": "SOL-USD"
+    "SOL-USD": "SOL-USD",
+    "ETH-BTC": "ETH-BTC"
 }
 
 
 # Trading configuration
 MIN_PROFIT_THRESHOLD = -2.0  # Capture ALL spreads including unprofitable (for ML training)
 MAX_SPREAD_AGE_SECONDS = 5  # Ignore old price data
+DEFAULT_FEE_PCT = 0.5  # Conservative fee estimate for exchanges without a config
+FEE_OVERRIDES_PATH = "fee_overrides.json"  # Optional per-exchange fee overrides, hot-reloaded
 DATA_BUFFER_SIZE = 10000  # Keep last N price points for ML (2 hours = ~1080 updates per symbol)
+OPPORTUNITY_STORE_SIZE = 1_000_000  # Keep last N opportunities (96 B/row, ~96 MB of columns fixed for the whole run; +8 B/row per extra DEPTH_NOTIONALS_USD entry)
+SPREAD_DECAY_ALPHA = None  # Set (e.g. 0.01) to also track exponentially decayed spread mean/std per tick
+EPISODE_PROFIT_THRESHOLD = 0.0  # Profit after fees (%) at which a pair opens an opportunity episode
+EPISODE_MAX_IDLE_SECONDS = MAX_SPREAD_AGE_SECONDS  # Close an episode when its pair stops updating
+EPISODE_HISTORY_SIZE = 100000  # Keep last N closed episodes
+INGEST_QUEUE_CAPACITY = 1024  # Max pending (exchange, symbol) keys between clients and the detector
+INGEST_MULTIPROCESS = False  # Run each exchange client in its own process, feeding a shared-memory tick ring
+TICK_RING_CAPACITY = 65536  # Records per exchange shared-memory ring (~4.7 MB each)
+TICK_RING_POLL_SECONDS = 0.001  # Detector-side poll interval when every ring is empty
+SNAPSHOT_PATH = "arbitrage_snapshot.mmap"  # Memory-mapped detector snapshot for out-of-process readers
+SNAPSHOT_PUBLISH_INTERVAL = 0.25  # Seconds between snapshot publishes
+SNAPSHOT_MAX_SYMBOLS = 256  # Snapshot id tables: at least this many symbols (and every one in SYMBOL_MAPPINGS)...
+SNAPSHOT_MAX_EXCHANGES = 16  # ...and exchanges (and every configured one)
+SNAPSHOT_OPPORTUNITY_CAPACITY = 16384  # Recent opportunities kept in the snapshot ring (~1.4 MB)
+SNAPSHOT_EPISODE_CAPACITY = 4096  # Recent closed episodes kept in the snapshot ring
+SNAPSHOT_CYCLE_CAPACITY = 1024  # Recent multi-leg cycle opportunities kept in the snapshot ring (~0.3 MB)
+JOURNAL_DIR = None  # Directory for the raw frame journal (e.g. "captured_data/journal"); None disables it
+JOURNAL_COMPRESS = True  # zstd-compress journal files (needs the zstandard package)
+JOURNAL_ZSTD_LEVEL = 3
+JOURNAL_FLUSH_SECONDS = 0.5  # Background writer batch interval
+JOURNAL_ROTATE_SECONDS = 3600  # Start a new journal file every hour
+REPLAY_YIELD_EVERY = 64  # Max-speed replay: ticks fed between event-loop yields (lets batch delivery run)
+TRACE_SAMPLE_EVERY = 16  # Latency tracing: each stage probe records one event in N
+HEALTH_FLUSH_SECONDS = 0.1  # Exchange clients publish their health counters at most this often
+HEALTH_WINDOW_SECONDS = 60  # Exchange -> receive lag percentiles cover the last one to two windows
+STALE_FEED_SECONDS = MAX_SPREAD_AGE_SECONDS  # A feed silent this long counts as stale
+FEED_CONNECTIONS = 1  # Concurrent connections per exchange; > 1 runs hot-standby legs, first copy of each tick wins
+FEED_DEDUP_WINDOW = 4096  # Recent tick keys remembered per exchange to drop the standby copies
+RECONNECT_BASE_SECONDS = 1.0  # Hot-standby legs reconnect forever with full-jitter backoff from this base...
+RECONNECT_MAX_SECONDS = 30.0  # ...capped at this
+TOP_OF_BOOK = False  # Quote channels: Binance @bookTicker and Bitstamp order_book_* instead of @ticker / live_trades_*
+ORDER_BOOKS = False  # Maintain L2 books from the depth diff channels (Coinbase level2, Binance @depth, Bitstamp diff_order_book_*)
+BOOK_MAX_LEVELS = 5000  # Price levels kept per book side; the worst are dropped beyond this
+BOOK_PENDING_UPDATES = 4096  # Diffs buffered per book while waiting for a snapshot
+BOOK_RESYNC_MIN_SECONDS = 1.0  # Min time between REST snapshot requests for one book
+BOOK_SNAPSHOT_TIMEOUT = 10  # Seconds
+BOOK_SNAPSHOT_DEPTH = 1000  # Levels requested per side in a Binance REST snapshot
+COINBASE_BOOK_CHANNEL = "level2_batch"  # "level2" needs an authenticated subscription
+DEPTH_NOTIONALS_USD = (1_000.0, 10_000.0, 100_000.0)  # Trade sizes the detector prices at VWAP on both sides' depth
+DEPTH_LEVELS = 200  # Book levels per side walked when an L2 book is available
+CYCLE_DETECTION = True  # Also search multi-leg cycles (triangular, cross-venue) over every quoted pair
+CYCLE_MAX_LEGS = 5  # Longest cycle indexed, counting transfers as legs (5 covers a triangle split across two exchanges)
+CYCLE_MIN_PROFIT_PCT = 0.0  # Gross return after fees (%) above which a cycle is reported
+CYCLE_START_ASSET = "USD"  # Cycles through this asset are reported starting and ending in it
+CYCLE_REBUILD_MIN_SECONDS = 1.0  # Min time between cycle re-enumerations when new pairs or exchanges appear
+TRANSFER_FEE_PCT = 0.0  # Cost of moving an asset between exchanges (withdrawal fees are not modelled)
+CYCLE_HISTORY_SIZE = 10000  # Keep last N cycle opportunities
+PAIR_QUOTE_ASSET = "USD"  # Pair detection, depth sizing, dashboards and bots price in this; other pairs (ETH-BTC) only feed cycles
+DETECTOR_SHARDS = 1  # > 1 runs detection in this many worker processes, symbols hashed across them (sharded_detector.py)
+DETECTOR_SHARD_START_TIMEOUT = 30  # Seconds to wait for every detector shard's first snapshot
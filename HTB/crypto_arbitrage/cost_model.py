@@ -0,0 +1,147 @@
+"""Trading cost model: per-pair fees and break-even price ratios."""
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+import numpy as np
+from loguru import logger
+
+from config import (
+    ExchangeConfig, FeeTier, EXCHANGE_CONFIGS,
+    MIN_PROFIT_THRESHOLD, DEFAULT_FEE_PCT, FEE_OVERRIDES_PATH
+)
+
+
+class CostTables(NamedTuple):
+    """Fee tables for one cost model generation."""
+    fee_pct: np.ndarray  # [E] fee % per leg
+    total_fees: np.ndarray  # [buy, sell] total fee %
+    break_even_ratio: np.ndarray  # [buy, sell] minimum sell/buy price ratio
+
+
+class CostModel:
+    """Precomputed fee and break-even tables indexed by exchange id.
+
+    For every (buy, sell) exchange pair it holds the total fee % and the sell/buy
+    price ratio at which profit after fees reaches the minimum threshold, so the
+    detector can test a pair with a single comparison: sell >= buy * ratio.
+
+    Exchange ids are assigned in add_exchange order, which the detector keeps in
+    step with its own interned ids. Tables are rebuilt into a new CostTables and
+    swapped in with one assignment, so reload() is safe while ingestion keeps
+    running; readers should grab `tables` once per evaluation.
+    """
+
+    def __init__(
+        self,
+        exchange_configs: Optional[Dict] = None,
+        min_profit_threshold: float = MIN_PROFIT_THRESHOLD,
+        overrides_path: Optional[str] = FEE_OVERRIDES_PATH
+    ):
+        self.exchange_configs = exchange_configs if exchange_configs is not None else EXCHANGE_CONFIGS
+        self.min_profit_threshold = min_profit_threshold
+        self.overrides_path = Path(overrides_path) if overrides_path else None
+        self.role = 'taker'  # Arbitrage legs cross the spread on both sides
+
+        self.exchange_names: List[str] = []
+        self.volume_30d: Dict[str, float] = {}  # {exchange name: 30-day USD volume} for tier selection
+        self.overrides: Dict[str, Dict] = {}  # {exchange name: {'maker_fee_pct', 'taker_fee_pct'}}
+        self._overrides_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+        self.tables = CostTables(np.zeros(0), np.zeros((0, 0)), np.zeros((0, 0)))
+
+        self.reload_if_changed()
+
+    def add_exchange(self, exchange_name: str) -> int:
+        """Add an exchange and return its id."""
+        with self._lock:
+            self.exchange_names.append(exchange_name)
+            self._rebuild()
+        return len(self.exchange_names) - 1
+
+    def fee_for(self, exchange_name: str, role: Optional[str] = None) -> float:
+        """Get the current fee % for one leg on an exchange."""
+        role = role or self.role
+        config = self._config_by_name(exchange_name)
+        override = self.overrides.get(exchange_name, {})
+
+        if config is None:
+            return override.get(f'{role}_fee_pct', DEFAULT_FEE_PCT)
+
+        taker_fee = config.fee_pct
+        maker_fee = config.maker_fee_pct if config.maker_fee_pct is not None else config.fee_pct
+
+        tier = self._active_tier(config.fee_tiers, self.volume_30d.get(exchange_name, 0.0))
+        if tier is not None:
+            taker_fee, maker_fee = tier.taker_fee_pct, tier.maker_fee_pct
+
+        taker_fee = override.get('taker_fee_pct', taker_fee)
+        maker_fee = override.get('maker_fee_pct', maker_fee)
+        return maker_fee if role == 'maker' else taker_fee
+
+    def set_volume(self, exchange_name: str, volume_usd: float):
+        """Set an exchange's 30-day volume and re-select its fee tier."""
+        with self._lock:
+            self.volume_30d[exchange_name] = volume_usd
+            self._rebuild()
+
+    def set_min_profit_threshold(self, threshold: float):
+        """Change the profit threshold baked into the break-even ratios."""
+        with self._lock:
+            self.min_profit_threshold = threshold
+            self._rebuild()
+
+    def reload(self, exchange_configs: Optional[Dict] = None):
+        """Rebuild all tables, optionally from new exchange configs."""
+        with self._lock:
+            if exchange_configs is not None:
+                self.exchange_configs = exchange_configs
+            self._rebuild()
+        logger.info(f"Cost model reloaded for {len(self.exchange_names)} exchanges")
+
+    def reload_if_changed(self) -> bool:
+        """Reload fee overrides if the overrides file changed on disk."""
+        if self.overrides_path is None or not self.overrides_path.exists():
+            return False
+
+        mtime = self.overrides_path.stat().st_mtime
+        if mtime == self._overrides_mtime:
+            return False
+
+        try:
+            with open(self.overrides_path) as f:
+                overrides = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load fee overrides from {self.overrides_path}: {e}")
+            return False
+
+        self._overrides_mtime = mtime
+        self.overrides = overrides
+        self.reload()
+        return True
+
+    def _rebuild(self):
+        """Recompute the per-exchange and per-pair tables and swap them in."""
+        fee_pct = np.array([self.fee_for(name) for name in self.exchange_names], dtype=float)
+        total_fees = fee_pct[:, None] + fee_pct[None, :]
+        # profit = (sell / buy - 1) * 100 - fees >= threshold  <=>  sell / buy >= ratio
+        break_even_ratio = 1 + (total_fees + self.min_profit_threshold) / 100
+
+        self.tables = CostTables(fee_pct, total_fees, break_even_ratio)
+
+    def _config_by_name(self, exchange_name: str) -> Optional[ExchangeConfig]:
+        """Find an exchange config by its display name."""
+        for config in self.exchange_configs.values():
+            if config.name == exchange_name:
+                return config
+        return None
+
+    @staticmethod
+    def _active_tier(tiers: List[FeeTier], volume_usd: float) -> Optional[FeeTier]:
+        """Pick the highest tier whose volume threshold has been reached."""
+        active = None
+        for tier in sorted(tiers, key=lambda t: t.min_volume_usd):
+            if volume_usd >= tier.min_volume_usd:
+                active = tier
+        return active
@@ -0,0 +1,347 @@
+"""Multi-leg (triangular and cross-venue) arbitrage as negative cycles in a rate graph.
+
+Nodes are (asset, exchange). Every quoted pair BASE-QUOTE on an exchange
+gives two trade edges: BASE -> QUOTE at the bid and QUOTE -> BASE at 1 / ask,
+both net of the exchange's taker fee. Transfer edges move an asset between
+exchanges (at TRANSFER_FEE_PCT). An edge's weight is -log(rate), so a cycle
+whose weights sum below -log(1 + min profit) turns one unit of its starting
+asset into more than that after fees.
+
+Rather than rerunning Bellman-Ford over the whole graph on every tick, the
+simple cycles of up to `max_legs` edges are enumerated on topology changes
+(a pair or exchange seen for the first time; at most once per
+CYCLE_REBUILD_MIN_SECONDS, so a warming-up feed does not re-enumerate per
+new pair) and indexed by edge. A rebuild only searches the cycles through
+edges added since the last one and appends them, so existing cycle ids stay
+put. It runs on a background thread and the result is swapped in by the next
+detect(), so the event loop never waits on the enumeration. A quote update
+then only re-sums the cycles through the two edges it moved: one gather and
+one row sum over a [cycles, legs] index matrix.
+
+Open (profitable) cycles are also re-checked for age on every detect(), so a
+cycle whose legs stopped quoting is closed even if nothing through it moves.
+
+Cycles that trade a single pair (same symbol on two exchanges, joined by
+transfers) are left out; ArbitrageDetector's pair check already covers them.
+"""
+import math
+import threading
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+
+from clock import seconds_to_ns
+from config import (
+    CycleLeg, CYCLE_MAX_LEGS, CYCLE_MIN_PROFIT_PCT, CYCLE_REBUILD_MIN_SECONDS, CYCLE_START_ASSET, TRANSFER_FEE_PCT
+)
+from cost_model import CostModel
+
+TRANSFER = "transfer"
+NEVER_STALE_NS = np.iinfo(np.int64).max // 2  # updated_at of edges that do not age (transfers, padding)
+MISSING_NS = np.iinfo(np.int64).min // 2  # updated_at of trade edges that have never been quoted
+
+
+class _Topology(NamedTuple):
+    """What a rebuild reads, copied so the graph can keep growing while it runs."""
+    node_count: int
+    edge_src: List[int]
+    edge_dst: List[int]
+    edge_info: List[Tuple[str, str, str, str]]
+    out_edges: List[List[int]]
+    node_asset: List[str]
+    first_new: int  # Edges from here on are in no indexed cycle yet
+    cycles: np.ndarray  # Indexed so far (replaced on swap, never written in place)
+
+
+class _Rebuild(NamedTuple):
+    """A finished rebuild, waiting for detect() to swap it in."""
+    cycles: np.ndarray
+    cycle_ptr: np.ndarray
+    cycle_ids: np.ndarray
+
+
+class CycleEngine:
+    """Rate graph over (asset, exchange) nodes with per-edge indexed cycle checks.
+
+    update_quote() moves a pair's two trade edges; detect() then re-sums the
+    cycles through every edge moved since the last call and returns the ones
+    that just became profitable (each is reported once per profitable run).
+    With `background` off, rebuilds run inline in detect() (tests, benchmarks).
+    """
+
+    def __init__(
+        self,
+        cost_model: CostModel,
+        max_legs: int = CYCLE_MAX_LEGS,
+        min_profit_pct: float = CYCLE_MIN_PROFIT_PCT,
+        transfer_fee_pct: float = TRANSFER_FEE_PCT,
+        start_asset: str = CYCLE_START_ASSET,
+        background: bool = True
+    ):
+        self.cost_model = cost_model
+        self.max_legs = max_legs
+        self.max_weight = -math.log1p(min_profit_pct / 100)  # Cycles summing below this are profitable
+        self.transfer_weight = -math.log1p(-transfer_fee_pct / 100)
+        self.start_asset = start_asset
+        self.background = background
+        self.rebuild_interval_ns = seconds_to_ns(CYCLE_REBUILD_MIN_SECONDS)
+        self._rebuild_after = 0  # Monotonic ns before which the cycle set is not re-enumerated
+
+        self.node_ids: Dict[Tuple[str, str], int] = {}  # {(asset, exchange): node id}
+        self.nodes: List[Tuple[str, str]] = []
+        self.out_edges: List[List[int]] = []  # {node id: [edge id]}
+
+        # Edge 0 pads cycles shorter than max_legs: weight 0, never stale
+        self.edge_src: List[int] = [-1]
+        self.edge_dst: List[int] = [-1]
+        self.edge_info: List[Tuple[str, str, str, str]] = [("", "", "", "")]  # (exchange, symbol, side, to exchange)
+        self.trade_edges: Dict[Tuple[str, str], Tuple[int, int]] = {}  # {(exchange, symbol): (sell edge, buy edge)}
+        self.weight = np.zeros(1)
+        self.price = np.zeros(1)  # Quote behind each trade edge
+        self.updated_at = np.full(1, NEVER_STALE_NS, dtype=np.int64)  # Monotonic receive ns
+
+        self.cycles = np.zeros((0, max_legs), dtype=np.int64)  # [cycle, leg] edge ids
+        self.cycle_ptr = np.zeros(2, dtype=np.int64)  # CSR over edges: cycles through edge e are
+        self.cycle_ids = np.zeros(0, dtype=np.int64)  # cycle_ids[cycle_ptr[e]:cycle_ptr[e + 1]]
+        self.active = np.zeros(0, dtype=bool)  # Cycles currently profitable
+        self._open: Set[int] = set()  # Ids of the active cycles (re-checked for age on every detect)
+        self._dirty_topology = False
+        self._changed: Set[int] = set()  # Edges moved since the last detect()
+        self._unchecked = np.zeros(0, dtype=np.int64)  # Cycles swapped in since the last detect()
+        self._rebuild_thread: Optional[threading.Thread] = None
+        self._rebuilt: Optional[_Rebuild] = None  # Set by the rebuild thread, taken by detect()
+
+    def _node(self, asset: str, exchange: str) -> int:
+        key = (asset, exchange)
+        node = self.node_ids.get(key)
+        if node is None:
+            node = self.node_ids[key] = len(self.nodes)
+            self.nodes.append(key)
+            self.out_edges.append([])
+            for other, (other_asset, other_exchange) in enumerate(self.nodes[:-1]):
+                if other_asset == asset:
+                    self._add_edge(other, node, (other_exchange, asset, TRANSFER, exchange), self.transfer_weight)
+                    self._add_edge(node, other, (exchange, asset, TRANSFER, other_exchange), self.transfer_weight)
+        return node
+
+    def _add_edge(self, src: int, dst: int, info: Tuple[str, str, str, str], weight: float = np.inf) -> int:
+        edge = len(self.edge_src)
+        self.edge_src.append(src)
+        self.edge_dst.append(dst)
+        self.edge_info.append(info)
+        self.out_edges[src].append(edge)
+        stale = NEVER_STALE_NS if info[2] == TRANSFER else MISSING_NS
+        self.weight = np.append(self.weight, weight)
+        self.price = np.append(self.price, 0.0)
+        self.updated_at = np.append(self.updated_at, stale)
+        self._dirty_topology = True
+        return edge
+
+    def update_quote(self, exchange_id: int, exchange: str, symbol: str, bid: float, ask: float, received_ns: int):
+        """Move a pair's trade edges to a new best bid / ask (quotes missing either side are ignored)."""
+        if bid <= 0 or ask <= 0:
+            return
+        edges = self.trade_edges.get((exchange, symbol))
+        if edges is None:
+            base, _, quote = symbol.partition('-')
+            if not quote:
+                return
+            base_node, quote_node = self._node(base, exchange), self._node(quote, exchange)
+            edges = self.trade_edges[(exchange, symbol)] = (
+                self._add_edge(base_node, quote_node, (exchange, symbol, "sell", exchange)),
+                self._add_edge(quote_node, base_node, (exchange, symbol, "buy", exchange)),
+            )
+        sell, buy = edges
+        fee_weight = -math.log1p(-self.cost_model.tables.fee_pct[exchange_id] / 100)
+        self.weight[sell] = fee_weight - math.log(bid)
+        self.weight[buy] = fee_weight + math.log(ask)
+        self.price[sell], self.price[buy] = bid, ask
+        self.updated_at[sell] = self.updated_at[buy] = received_ns
+        self._changed.add(sell)
+        self._changed.add(buy)
+
+    def detect(self, now_ns: int, max_age_ns: int) -> List[Tuple[int, float]]:
+        """(cycle id, profit after fees %) for cycles through moved edges that just turned profitable.
+
+        Cycles with an edge quoted longer than max_age_ns ago (monotonic) count as unprofitable;
+        open cycles whose legs age past it are closed here even if none of their edges moved.
+        """
+        self._swap_rebuilt()
+        if self._dirty_topology and now_ns >= self._rebuild_after and self._rebuild_thread is None:
+            self._rebuild_after = now_ns + self.rebuild_interval_ns
+            self._start_rebuild()
+        if self._open:
+            self._expire(now_ns, max_age_ns)
+        if not self._changed and not len(self._unchecked):
+            return []
+        changed = [edge for edge in self._changed if edge < len(self.cycle_ptr) - 1]  # Newer edges are in no cycle yet
+        self._changed.clear()
+        ptr = self.cycle_ptr
+        ids = np.concatenate([self.cycle_ids[ptr[edge]:ptr[edge + 1]] for edge in changed] + [self._unchecked])
+        if len(changed) > 2 or len(self._unchecked):
+            ids = np.unique(ids)  # One quote's sell and buy edges never share a (simple) cycle; several quotes may
+        self._unchecked = self._unchecked[:0]
+        if not len(ids):
+            return []
+
+        legs = self.cycles[ids]
+        total = self.weight[legs].sum(axis=1)
+        fresh = (now_ns - self.updated_at[legs].min(axis=1)) < max_age_ns
+        profitable = (total < self.max_weight) & fresh
+        was_active = self.active[ids]
+        opened = ids[profitable & ~was_active]
+        self.active[ids] = profitable
+        self._open.difference_update(ids[was_active & ~profitable].tolist())
+        if not len(opened):
+            return []
+        self._open.update(opened.tolist())
+        profit = np.expm1(-self.weight[self.cycles[opened]].sum(axis=1)) * 100
+        return list(zip(opened.tolist(), profit.tolist()))
+
+    def _expire(self, now_ns: int, max_age_ns: int):
+        """Close open cycles with a leg quoted longer than max_age_ns ago."""
+        ids = np.fromiter(self._open, dtype=np.int64, count=len(self._open))
+        stale = ids[(now_ns - self.updated_at[self.cycles[ids]].min(axis=1)) >= max_age_ns]
+        if len(stale):
+            self.active[stale] = False
+            self._open.difference_update(stale.tolist())
+
+    def legs(self, cycle_id: int) -> List[CycleLeg]:
+        """The cycle's conversions, in order."""
+        legs = []
+        for edge in self.cycles[cycle_id]:
+            if edge == 0:
+                break
+            exchange, symbol, side, to_exchange = self.edge_info[edge]
+            legs.append(CycleLeg(exchange, symbol, side, float(self.price[edge]), math.exp(-self.weight[edge]), to_exchange))
+        return legs
+
+    def path(self, cycle_id: int) -> List[str]:
+        """Assets visited, starting and ending with the same one (e.g. ["USD", "BTC", "ETH", "USD"])."""
+        edges = [edge for edge in self.cycles[cycle_id] if edge]
+        return [self.nodes[self.edge_src[edges[0]]][0]] + [
+            self.nodes[self.edge_dst[edge]][0] for edge in edges if self.edge_info[edge][2] != TRANSFER
+        ]
+
+    def _start_rebuild(self):
+        """Index the cycles through edges added since the last rebuild, on a thread unless `background` is off."""
+        self._dirty_topology = False
+        edge_count = len(self.edge_src)
+        topology = _Topology(
+            node_count=len(self.nodes),
+            edge_src=self.edge_src[:edge_count],
+            edge_dst=self.edge_dst[:edge_count],
+            edge_info=self.edge_info[:edge_count],
+            out_edges=[[edge for edge in out if edge < edge_count] for out in self.out_edges],
+            node_asset=[asset for asset, _ in self.nodes],
+            first_new=len(self.cycle_ptr) - 1,
+            cycles=self.cycles
+        )
+        if not self.background:
+            self._rebuilt = self._rebuild(topology)
+            self._swap_rebuilt()
+            return
+        self._rebuild_thread = threading.Thread(target=self._run_rebuild, args=(topology,), name="cycle-rebuild", daemon=True)
+        self._rebuild_thread.start()
+
+    def _run_rebuild(self, topology: _Topology):
+        try:
+            self._rebuilt = self._rebuild(topology)
+        except Exception as e:
+            logger.exception(f"Cycle rebuild failed: {e}")
+            self._dirty_topology = True  # Retried after the next CYCLE_REBUILD_MIN_SECONDS
+
+    def wait_for_rebuild(self, timeout: Optional[float] = None):
+        """Block until a running background rebuild finishes (it is swapped in by the next detect())."""
+        thread = self._rebuild_thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _swap_rebuilt(self):
+        """Adopt a finished rebuild: appended cycles start inactive and are checked by this detect()."""
+        thread = self._rebuild_thread
+        if thread is not None and thread.is_alive():
+            return
+        self._rebuild_thread = None
+        rebuilt, self._rebuilt = self._rebuilt, None
+        if rebuilt is None:
+            return
+        first_new = len(self.cycles)
+        self.cycles, self.cycle_ptr, self.cycle_ids = rebuilt.cycles, rebuilt.cycle_ptr, rebuilt.cycle_ids
+        self.active = np.concatenate([self.active, np.zeros(len(self.cycles) - first_new, dtype=bool)])
+        self._unchecked = np.arange(first_new, len(self.cycles), dtype=np.int64)
+
+    def _rebuild(self, topology: _Topology) -> _Rebuild:
+        """The indexed cycles plus every simple cycle of 3..max_legs edges through an edge added since.
+
+        Reads only `topology` and the engine's settings, so it is safe off the event loop.
+        """
+        src, dst, out_edges = topology.edge_src, topology.edge_dst, topology.out_edges
+        transfer = [info[2] == TRANSFER for info in topology.edge_info]
+        symbol = [info[1] for info in topology.edge_info]
+        edge_count = len(src)
+        found: List[List[int]] = []
+
+        in_edges: List[List[int]] = [[] for _ in range(topology.node_count)]
+        for edge in range(1, edge_count):
+            in_edges[dst[edge]].append(edge)
+
+        def extend(start: int, node: int, path: List[int], visited: Set[int], distance: Dict[int, int], usable):
+            for edge in out_edges[node]:
+                if not usable(edge) or (transfer[edge] and transfer[path[-1]]):
+                    continue  # Two transfers in a row are one transfer
+                nxt = dst[edge]
+                if nxt == start:
+                    if len(path) >= 2 and not (transfer[edge] and transfer[path[0]]):
+                        if len({symbol[e] for e in path + [edge] if not transfer[e]}) > 1:
+                            found.append(path + [edge])
+                elif nxt not in visited and len(path) + 1 + distance.get(nxt, self.max_legs) <= self.max_legs:
+                    visited.add(nxt)
+                    extend(start, nxt, path + [edge], visited, distance, usable)
+                    visited.discard(nxt)
+
+        # Each new cycle is found once, from its lowest new edge: later searches skip the new edges before theirs
+        for new in range(max(topology.first_new, 1), edge_count):
+            def usable(edge: int, new: int = new) -> bool:
+                return edge < topology.first_new or edge > new
+
+            start, nxt = src[new], dst[new]
+            distance = self._distances_to(start, in_edges, src, usable)
+            if nxt in distance and 1 + distance[nxt] <= self.max_legs:
+                extend(start, nxt, [new], {start, nxt}, distance, usable)
+
+        # Start each cycle where it leaves start_asset, if it passes through it
+        for i, cycle in enumerate(found):
+            for offset, edge in enumerate(cycle):
+                if topology.node_asset[src[edge]] == self.start_asset and not transfer[edge]:
+                    found[i] = cycle[offset:] + cycle[:offset]
+                    break
+
+        cycles = np.zeros((len(topology.cycles) + len(found), self.max_legs), dtype=np.int64)
+        cycles[:len(topology.cycles)] = topology.cycles
+        for i, cycle in enumerate(found, start=len(topology.cycles)):
+            cycles[i, :len(cycle)] = cycle
+
+        cycle_of = np.repeat(np.arange(len(cycles)), self.max_legs)
+        edges = cycles.ravel()
+        order = np.argsort(edges, kind='stable')
+        cycle_ptr = np.searchsorted(edges[order], np.arange(edge_count + 1))
+        return _Rebuild(cycles, cycle_ptr, cycle_of[order])
+
+    def _distances_to(self, start: int, in_edges: List[List[int]], src: List[int], usable) -> Dict[int, int]:
+        """Fewest usable edges from each node back to `start` (within max_legs - 1)."""
+        distance = {}
+        frontier = [start]
+        for hops in range(1, self.max_legs):
+            reached = []
+            for node in frontier:
+                for edge in in_edges[node]:
+                    if not usable(edge):
+                        continue
+                    node_from = src[edge]
+                    if node_from != start and node_from not in distance:
+                        distance[node_from] = hops
+                        reached.append(node_from)
+            frontier = reached
+        return distance
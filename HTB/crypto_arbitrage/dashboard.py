@@ -472,6 +472,7 @@ from dash import dcc, html, Input, Output
 import dash_bootstrap_components as dbc
 import plotly.graph_objs as go
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from collections import deque
 from loguru import logger
@@ -642,6 +643,18 @@ class ArbitrageDashboard:
                 ], width=4),
             ], className="mb-4"),
 
+            # Multi-leg cycles (triangular / cross-venue)
+            dbc.Row([
+                dbc.Col([
+                    dbc.Card([
+                        dbc.CardHeader("🔺 Multi-Leg Cycles"),
+                        dbc.CardBody([
+                            html.Div(id="cycles-table")
+                        ])
+                    ], color="light")
+                ])
+            ], className="mb-4"),
+
             # ML Predictions (if available)
             dbc.Row([
                 dbc.Col([
@@ -871,36 +884,30 @@ class ArbitrageDashboard:
             Input("interval-component", "n_intervals")
         )
         def update_spread_heatmap(n):
-            """Create heatmap of spreads between exchanges (FIXED VERSION)."""
+            """Create heatmap of executable spreads between exchanges (FIXED VERSION)."""
             try:
-                exchanges = ['Coinbase', 'Binance', 'Bitstamp']
-                z, text = [], []
-                latest = self.detector.latest_prices
-
-                for ex1 in exchanges:
-                    row, row_text = [], []
-                    for ex2 in exchanges:
-                        if ex1 == ex2:
-                            row.append(0)
-                            row_text.append("-")
-                            continue
-                        
-                        # Calculate spread for BTC-USD
-                        p1 = p2 = None
-                        for (ex, sym), price_data in latest.items():
-                            if sym == 'BTC-USD':
-                                if ex == ex1: 
-                                    p1 = price_data.price
-                                if ex == ex2: 
-                                    p2 = price_data.price
-                        
-                        # Spread: (sell_price - buy_price) / buy_price * 100
-                        spread = ((p2 - p1) / p1 * 100) if (p1 and p2 and p1 > 0) else 0
-                        row.append(spread)
-                        row_text.append(f"{spread:+.2f}%")
-                    
-                    z.append(row)
-                    text.append(row_text)
+                engine = getattr(self.detector, 'spread_engine', None)  # None for sharded / snapshot views
+                if engine is None:
+                    # Same executable spread from the latest quotes: buy at row's ask, sell at column's bid
+                    prices = self.detector.get_latest_prices('BTC-USD')
+                    exchanges = list(prices)
+                    asks = np.array([p.ask for p in prices.values()])[:, None]
+                    bids = np.array([p.bid for p in prices.values()])[None, :]
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        matrix = {'spread': np.where((asks > 0) & (bids > 0), (bids - asks) / asks * 100, np.nan)}
+                else:
+                    exchanges = list(engine.exchange_names)
+                    matrix = engine.symbol_matrix('BTC-USD')
+
+                # Spread: (sell_bid - buy_ask) / buy_ask * 100, read straight from the engine
+                if matrix is None:
+                    z = np.zeros((len(exchanges), len(exchanges)))
+                else:
+                    z = np.nan_to_num(matrix['spread'])
+                text = [
+                    ["-" if i == j else f"{z[i][j]:+.2f}%" for j in range(len(exchanges))]
+                    for i in range(len(exchanges))
+                ]
 
                 fig = go.Figure(data=go.Heatmap(
                     z=z, 
@@ -934,6 +941,71 @@ class ArbitrageDashboard:
                 fig.update_layout(template="plotly_dark", height=300)
                 return fig
 
+        @self.app.callback(
+            Output("cycles-table", "children"),
+            Input("interval-component", "n_intervals")
+        )
+        def update_cycles_table(n):
+            try:
+                if not self.detector.has_cycles:
+                    return html.P(
+                        "🧩 Cycle search is off (CYCLE_DETECTION, or sharded detection)",
+                        className="text-muted"
+                    )
+
+                stats = self.detector.get_statistics()
+                summary = html.P(
+                    f"{stats['total_cycles']:,} cycles found, {stats['recent_cycles']:,} in the last 5 min",
+                    className="text-muted"
+                )
+                recent_cycles = sorted(
+                    self.detector.get_recent_cycles(minutes=5),
+                    key=lambda x: x.profit_after_fees,
+                    reverse=True
+                )[:10]  # Top 10
+
+                if not recent_cycles:
+                    return [summary, html.P("⏳ No profitable cycles in the last 5 minutes...", className="text-muted")]
+
+                table_header = [
+                    html.Thead(html.Tr([
+                        html.Th("Time"),
+                        html.Th("Path"),
+                        html.Th("Legs"),
+                        html.Th("Gross"),
+                        html.Th("Profit"),
+                    ]))
+                ]
+
+                rows = []
+                for opp in recent_cycles:
+                    rows.append(html.Tr([
+                        html.Td(opp.timestamp.strftime("%H:%M:%S")),
+                        html.Td(opp.symbol),
+                        html.Td(" → ".join(
+                            f"{leg.side} {leg.symbol} @ {leg.exchange}" if leg.side != "transfer"
+                            else f"move {leg.symbol} {leg.exchange}→{leg.to_exchange}"
+                            for leg in opp.legs
+                        )),
+                        html.Td(f"{opp.spread_pct:.2f}%"),
+                        html.Td(
+                            f"{opp.profit_after_fees:.2f}%",
+                            className="text-success fw-bold"
+                        ),
+                    ]))
+
+                return [summary, dbc.Table(
+                    table_header + [html.Tbody(rows)],
+                    bordered=True,
+                    hover=True,
+                    responsive=True,
+                    striped=True,
+                    className="mb-0"
+                )]
+            except Exception as e:
+                logger.error(f"Error updating cycles table: {e}")
+                return html.P(f"❌ Error: {str(e)}", className="text-danger")
+
         @self.app.callback(
             Output("ml-predictions", "children"),
             Input("interval-component", "n_intervals")
@@ -942,6 +1014,12 @@ class ArbitrageDashboard:
             try:
                 if not self.spread_predictor:
                     return html.P("❌ Spread predictor not initialized", className="text-danger")
+
+                if not self.detector.has_history:
+                    return html.P(
+                        "🧩 Spread predictions are off: sharded detection keeps tick history in its workers",
+                        className="text-muted"
+                    )
                 
                 if not self.spread_predictor.is_trained:
                     return html.P(
@@ -1,20 +1,46 @@
 """WebSocket clients for multiple crypto exchanges."""
 import json
 import asyncio
+import multiprocessing
+import random
+import signal
 import websockets
-from datetime import datetime, timezone
-from typing import Callable, Optional
+from collections import deque
+from functools import partial
+from typing import Callable, List, Optional, Tuple
 from loguru import logger
-from config import PriceData, Exchange, EXCHANGE_CONFIGS, SYMBOL_MAPPINGS
+from config import (
+    PriceData, Exchange, EXCHANGE_CONFIGS, SYMBOL_MAPPINGS, INGEST_QUEUE_CAPACITY,
+    TICK_RING_CAPACITY, TICK_RING_POLL_SECONDS, JOURNAL_COMPRESS,
+    FEED_CONNECTIONS, FEED_DEDUP_WINDOW, RECONNECT_BASE_SECONDS, RECONNECT_MAX_SECONDS, TOP_OF_BOOK, ORDER_BOOKS
+)
+from clock import monotonic_ns
+from ingestion_queue import ConflatingQueue
+from frame_journal import FrameJournal
+from health import FeedHealth, HealthRegistry
+from latency import TRACER
+from shm_ring import SharedTickRing, TICK_EXCHANGES, TICK_SYMBOLS, encode_ids
+from message_parsers import (
+    FrameParser, FrameDecodeError, Tick, CoinbaseParser, BinanceParser, BinanceBookTickerParser,
+    BitstampParser, BitstampOrderBookParser
+)
 
 
 class BaseExchangeClient:
     """Base class for exchange WebSocket clients."""
 
-    def __init__(self, exchange: Exchange, callback: Callable[[PriceData], None]):
+    def __init__(self, exchange: Exchange, callback: Callable[[PriceData], None], parser: FrameParser):
         self.exchange = exchange
         self.config = EXCHANGE_CONFIGS[exchange]
         self.callback = callback
+        self.parser = parser  # Raw frame -> Tick (or None for message types we ignore)
+        self.exchange_id = TICK_EXCHANGES.index(self.config.name)
+        self.journal: Optional[FrameJournal] = None  # Set to record every raw frame received
+        self.parse_probe = TRACER.probe('parse', self.config.name)
+        self.health = FeedHealth()  # Replaced by a HealthRegistry row to publish it
+        self.dedup: Optional[TickDeduplicator] = None  # Shared by hot-standby legs (see RedundantFeed)
+        self.max_retries: Optional[int] = 5  # Consecutive failed connections before giving up; None = never
+        self.jittered_backoff = False  # Full-jitter backoff from RECONNECT_BASE_SECONDS instead of 2 ** n
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.running = False
 
@@ -43,87 +69,109 @@ class BaseExchangeClient:
         """Subscribe to relevant channels (implement in subclass)."""
         raise NotImplementedError
 
-    async def handle_message(self, message: dict):
-        """Parse message and create PriceData (implement in subclass)."""
-        raise NotImplementedError
+    async def handle_message(self, tick: Tick, received_ns: int):
+        """Create PriceData from a parsed tick.
+
+        received_ns is the monotonic receive time of the frame, stamped in run().
+        """
+        symbol, price, volume, timestamp_ns, bid, ask, bid_size, ask_size, _ = tick
+        self.callback(PriceData(
+            exchange=self.config.name,
+            symbol=self.normalize_symbol(symbol),
+            price=price,
+            volume=volume,
+            timestamp_ns=timestamp_ns,
+            bid=bid,
+            ask=ask,
+            received_ns=received_ns,
+            bid_size=bid_size,
+            ask_size=ask_size
+        ))
+
+    def backoff_delay(self, retry_count: int) -> float:
+        """Seconds to wait before reconnect attempt `retry_count`."""
+        if not self.jittered_backoff:
+            return 2 ** retry_count  # Exponential backoff
+        return random.uniform(0, min(RECONNECT_MAX_SECONDS, RECONNECT_BASE_SECONDS * 2 ** retry_count))
 
     async def run(self):
         """Main message loop with auto-reconnect."""
         retry_count = 0
-        max_retries = 5
+        self.health.start(monotonic_ns())
 
-        while retry_count < max_retries:
+        while self.max_retries is None or retry_count < self.max_retries:
             try:
                 await self.connect()
-                await self.subscribe()
-
-                async for message in self.websocket:
-                    try:
-                        data = json.loads(message)
-                        await self.handle_message(data)
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Invalid JSON from {self.config.name}: {e}")
-                    except Exception as e:
-                        logger.error(f"Error handling message from {self.config.name}: {e}")
+                self.health.on_connected(monotonic_ns())
+                try:
+                    await self.subscribe()
+                    if self.max_retries is None:
+                        retry_count = 0
+
+                    async for message in self.websocket:
+                        received_ns = monotonic_ns()
+                        self.health.on_message(received_ns)
+                        if self.journal is not None:
+                            self.journal.append(self.exchange_id, received_ns, message)
+                        try:
+                            tick = self.parser.parse(message)
+                            if tick is not None and (self.dedup is None or self.dedup.first(tick)):
+                                self.parse_probe.sample(received_ns)
+                                self.health.on_tick(tick[3])
+                                await self.handle_message(tick, received_ns)
+                        except FrameDecodeError as e:
+                            self.health.on_parse_error()
+                            logger.warning(f"Failed to parse {self.config.name} message: {e}")
+                        except Exception as e:
+                            logger.error(f"Error handling message from {self.config.name}: {e}")
+                finally:
+                    self.health.on_disconnected(monotonic_ns())
 
             except websockets.exceptions.ConnectionClosed:
                 logger.warning(f"Connection to {self.config.name} closed, reconnecting...")
                 retry_count += 1
-                await asyncio.sleep(2 ** retry_count)  # Exponential backoff
+                await asyncio.sleep(self.backoff_delay(retry_count))
             except Exception as e:
                 logger.error(f"Error in {self.config.name} client: {e}")
                 retry_count += 1
-                await asyncio.sleep(2 ** retry_count)
+                await asyncio.sleep(self.backoff_delay(retry_count))
 
         logger.error(f"Max retries reached for {self.config.name}")
 
 
 class CoinbaseClient(BaseExchangeClient):
-    """Coinbase WebSocket client."""
+    """Coinbase WebSocket client.
+
+    The ticker channel already carries the best bid/ask and their sizes, so
+    there is no separate top-of-book mode (create_client does not pass one).
+    """
 
     def __init__(self, callback: Callable[[PriceData], None]):
-        super().__init__(Exchange.COINBASE, callback)
+        super().__init__(Exchange.COINBASE, callback, CoinbaseParser())
+        self.channel = "ticker"
 
     async def subscribe(self):
-        """Subscribe to ticker channel."""
+        """Subscribe to `channel` for every product (book_ingestion.CoinbaseBookClient swaps in level2)."""
         subscribe_message = {
             "type": "subscribe",
             "product_ids": self.config.symbols,
-            "channels": ["ticker"]
+            "channels": [self.channel]
         }
         await self.websocket.send(json.dumps(subscribe_message))
         logger.info(f"Subscribed to Coinbase symbols: {self.config.symbols}")
 
-    async def handle_message(self, message: dict):
-        """Parse Coinbase ticker message."""
-        if message.get("type") != "ticker":
-            return
-
-        try:
-            price_data = PriceData(
-                exchange=self.config.name,
-                symbol=self.normalize_symbol(message["product_id"]),
-                price=float(message["price"]),
-                volume=float(message.get("volume_24h", 0)),
-                timestamp=datetime.fromisoformat(message["time"].replace("Z", "+00:00")),
-                bid=float(message.get("best_bid", 0)),
-                ask=float(message.get("best_ask", 0))
-            )
-            self.callback(price_data)
-        except (KeyError, ValueError) as e:
-            logger.warning(f"Failed to parse Coinbase message: {e}")
-
 
 class BinanceClient(BaseExchangeClient):
-    """Binance WebSocket client."""
+    """Binance WebSocket client (@ticker, or @bookTicker in top-of-book mode)."""
 
-    def __init__(self, callback: Callable[[PriceData], None]):
-        super().__init__(Exchange.BINANCE, callback)
+    def __init__(self, callback: Callable[[PriceData], None], top_of_book: bool = TOP_OF_BOOK):
+        super().__init__(Exchange.BINANCE, callback, BinanceBookTickerParser() if top_of_book else BinanceParser())
+        self.stream = "bookTicker" if top_of_book else "ticker"
 
     async def connect(self):
         """Connect to Binance with stream-specific URL."""
         # Binance uses stream names in URL
-        streams = [f"{s.lower()}@ticker" for s in self.config.symbols]
+        streams = [f"{s.lower()}@{self.stream}" for s in self.config.symbols]
         stream_url = f"{self.config.websocket_url}/{'/'.join(streams)}"
 
         try:
@@ -138,91 +186,358 @@ class BinanceClient(BaseExchangeClient):
         """No explicit subscribe needed for Binance (done via URL)."""
         pass
 
-    async def handle_message(self, message: dict):
-        """Parse Binance ticker message."""
-        if "e" not in message or message["e"] != "24hrTicker":
-            return
-
-        try:
-            price_data = PriceData(
-                exchange=self.config.name,
-                symbol=self.normalize_symbol(message["s"]),
-                price=float(message["c"]),  # Current price
-                volume=float(message["v"]),  # Volume
-                timestamp=datetime.fromtimestamp(message["E"] / 1000),
-                bid=float(message.get("b", 0)),
-                ask=float(message.get("a", 0))
-            )
-            self.callback(price_data)
-        except (KeyError, ValueError) as e:
-            logger.warning(f"Failed to parse Binance message: {e}")
-
 
 class BitstampClient(BaseExchangeClient):
-    """Bitstamp WebSocket client."""
+    """Bitstamp WebSocket client (live_trades_*, or order_book_* in top-of-book mode)."""
 
-    def __init__(self, callback: Callable[[PriceData], None]):
-        super().__init__(Exchange.BITSTAMP, callback)
+    def __init__(self, callback: Callable[[PriceData], None], top_of_book: bool = TOP_OF_BOOK):
+        super().__init__(Exchange.BITSTAMP, callback, BitstampOrderBookParser() if top_of_book else BitstampParser())
 
     async def subscribe(self):
-        """Subscribe to live trades for each symbol."""
+        """Subscribe to the parser's channel for each symbol."""
         for symbol in self.config.symbols:
             subscribe_message = {
                 "event": "bts:subscribe",
                 "data": {
-                    "channel": f"live_trades_{symbol}"
+                    "channel": f"{self.parser.channel_prefix}{symbol}"
                 }
             }
             await self.websocket.send(json.dumps(subscribe_message))
         logger.info(f"Subscribed to Bitstamp symbols: {self.config.symbols}")
 
-    async def handle_message(self, message: dict):
-        """Parse Bitstamp trade message."""
+    async def handle_message(self, tick: Tick, received_ns: int):
+        """Forward ticks for subscribed pairs (symbol comes from the channel name, e.g. "btcusd")."""
+        if tick[0] in self.config.symbols:
+            await super().handle_message(tick, received_ns)
+
+
+CLIENT_CLASSES = {
+    Exchange.COINBASE: CoinbaseClient,
+    Exchange.BINANCE: BinanceClient,
+    Exchange.BITSTAMP: BitstampClient,
+}
+TOP_OF_BOOK_EXCHANGES = {Exchange.BINANCE, Exchange.BITSTAMP}  # Clients taking `top_of_book` (separate quote channels)
+
+
+class TickDeduplicator:
+    """First-arrival filter for the ticks of redundant connections to one exchange.
+
+    Ticks with an exchange sequence number are forwarded only if it is newer
+    than the last one forwarded for their symbol. Otherwise a tick is
+    forwarded unless one with the same (symbol, exchange timestamp, price,
+    volume) was forwarded among the last `window`, or it is older than the
+    newest tick already forwarded for its symbol (a lagging connection
+    delivering what a faster one already did).
+    """
+
+    __slots__ = ('window', 'seen', 'order', 'latest_ns', 'latest_sequence', 'forwarded', 'duplicates')
+
+    def __init__(self, window: int = FEED_DEDUP_WINDOW):
+        self.window = window
+        self.seen = set()
+        self.order = deque()  # Keys in forwarding order, for eviction
+        self.latest_ns = {}  # {symbol: newest forwarded exchange timestamp}
+        self.latest_sequence = {}  # {symbol: newest forwarded exchange sequence number}
+        self.forwarded = 0
+        self.duplicates = 0
+
+    def first(self, tick: Tick) -> bool:
+        """True if this is the first copy of the tick (and remember it)."""
+        symbol, sequence = tick[0], tick[8]
+        if sequence:
+            if sequence <= self.latest_sequence.get(symbol, 0):
+                self.duplicates += 1
+                return False
+            self.latest_sequence[symbol] = sequence
+            self.forwarded += 1
+            return True
+
+        price, volume, timestamp_ns = tick[1], tick[2], tick[3]
+        key = (symbol, timestamp_ns, price, volume)
+        if key in self.seen or timestamp_ns < self.latest_ns.get(symbol, 0):
+            self.duplicates += 1
+            return False
+        self.latest_ns[symbol] = timestamp_ns
+        self.seen.add(key)
+        self.order.append(key)
+        if len(self.order) > self.window:
+            self.seen.discard(self.order.popleft())
+        self.forwarded += 1
+        return True
+
+
+class RedundantFeed:
+    """Hot-standby connections to one exchange, forwarding each tick once.
+
+    Runs `connections` clients of the same class concurrently. They share one
+    TickDeduplicator, so whichever connection delivers a tick first wins and
+    losing one socket leaves no gap while the others are up. Every leg
+    reconnects forever with jittered backoff. Looks like a single client to
+    the aggregator and workers (run, disconnect, health, journal).
+    """
+
+    def __init__(
+        self,
+        client_class: Callable[..., BaseExchangeClient],
+        callback: Callable[[PriceData], None],
+        connections: int
+    ):
+        self.legs = [client_class(callback) for _ in range(connections)]
+        primary = self.legs[0]
+        self.exchange = primary.exchange
+        self.config = primary.config
+        self.exchange_id = primary.exchange_id
+        self.dedup = TickDeduplicator()
+        for leg in self.legs:
+            leg.dedup = self.dedup
+            leg.max_retries = None
+            leg.jittered_backoff = True
+        self.health = primary.health
+
+    @property
+    def health(self) -> FeedHealth:
+        return self.legs[0].health
+
+    @health.setter
+    def health(self, health: FeedHealth):
+        health.connections = len(self.legs)
+        for leg in self.legs:
+            leg.health = health
+
+    @property
+    def journal(self) -> Optional[FrameJournal]:
+        return self.legs[0].journal
+
+    @journal.setter
+    def journal(self, journal: Optional[FrameJournal]):
+        for leg in self.legs:  # Every leg's raw frames, standby copies included
+            leg.journal = journal
+
+    async def run(self):
+        await asyncio.gather(*(leg.run() for leg in self.legs))
+
+    async def disconnect(self):
+        for leg in self.legs:
+            await leg.disconnect()
+
+
+def create_client(
+    exchange: Exchange,
+    callback: Callable[[PriceData], None],
+    connections: int = 1,
+    top_of_book: bool = TOP_OF_BOOK,
+    books=None
+):
+    """An exchange client, or a RedundantFeed of hot-standby clients when connections > 1.
+
+    With `books` (an order_book.OrderBookSet), the client maintains L2 books
+    from the venue's depth diff channel and emits their top of book.
+    """
+    if books is not None:
+        from book_ingestion import BOOK_CLIENT_CLASSES
+        if connections > 1:
+            raise ValueError("Order book feeds do not support hot-standby connections")
+        return BOOK_CLIENT_CLASSES[exchange](callback, books)
+    client_class = CLIENT_CLASSES[exchange]
+    if exchange in TOP_OF_BOOK_EXCHANGES:
+        client_class = partial(client_class, top_of_book=top_of_book)
+    if connections > 1:
+        return RedundantFeed(client_class, callback, connections)
+    return client_class(callback)
+
+
+def run_exchange_worker(
+    exchange: Exchange,
+    ring_name: str,
+    ring_capacity: int,
+    journal_dir: Optional[str] = None,
+    health_name: Optional[str] = None,
+    connections: int = 1,
+    top_of_book: bool = TOP_OF_BOOK,
+    order_books: bool = ORDER_BOOKS
+):
+    """Worker process entry point: run one exchange client, writing its ticks into a shared ring."""
+    ring = SharedTickRing(ring_capacity, name=ring_name)
+    health = HealthRegistry(name=health_name) if health_name is not None else None
+
+    def publish(price_data: PriceData):
+        exchange_id, symbol_id = encode_ids(price_data.exchange, price_data.symbol)
+        if symbol_id < 0:
+            logger.warning(f"Dropping tick for unmapped symbol {price_data.symbol} from {price_data.exchange}")
+            return
+        ring.write(
+            exchange_id, symbol_id, price_data.price, price_data.volume,
+            price_data.timestamp_ns, price_data.bid, price_data.ask, price_data.received_ns,
+            price_data.bid_size, price_data.ask_size
+        )
+
+    books = None
+    if order_books:
+        from order_book import OrderBookSet
+        books = OrderBookSet()  # This exchange's books, private to the worker; their top of book goes through the ring
+    client = create_client(exchange, publish, connections, top_of_book, books)
+    if health is not None:
+        client.health = health.feed(client.exchange_id)
+    if journal_dir is not None:
+        # One journal per worker process; iter_journal() merges them back by receive time
+        client.journal = FrameJournal(journal_dir, prefix=f"frames_{client.config.name.lower()}", compress=JOURNAL_COMPRESS)
+
+    async def run_until_terminated():
+        # terminate() sends SIGTERM: cancel the client and close its socket, then flush below
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
         try:
-            # Bitstamp sends: {"event": "trade", "channel": "live_trades_btcusd", "data": {...}}
-            if message.get("event") == "trade":
-                channel = message.get("channel", "")
-                # Extract symbol from channel name (e.g., "live_trades_btcusd" -> "btcusd")
-                symbol = channel.replace("live_trades_", "")
-
-                if symbol in self.config.symbols:
-                    data = message.get("data", {})
-                    price_data = PriceData(
-                        exchange=self.config.name,
-                        symbol=self.normalize_symbol(symbol),
-                        price=float(data.get("price", 0)),
-                        volume=float(data.get("amount", 0)),
-                        timestamp=datetime.fromtimestamp(int(data.get("timestamp", 0)), tz=timezone.utc),
-                        bid=0.0,  # Bitstamp doesn't provide bid/ask in trade stream
-                        ask=0.0
-                    )
-                    self.callback(price_data)
-        except (KeyError, ValueError, TypeError) as e:
-            logger.warning(f"Failed to parse Bitstamp message: {e}")
+            await client.run()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await client.disconnect()
 
+    try:
+        asyncio.run(run_until_terminated())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if client.journal is not None:
+            client.journal.close()
+        if health is not None:
+            client.health.row = None
+            health.close()
+        ring.close()
 
-class MultiExchangeAggregator:
-    """Aggregates data from multiple exchanges."""
 
-    def __init__(self, callback: Callable[[PriceData], None]):
+class MultiExchangeAggregator:
+    """Aggregates data from multiple exchanges.
+
+    With `callback`, every tick is delivered synchronously from the client's
+    read loop. With `batch_callback`, ticks go through a ConflatingQueue and
+    a separate task delivers one latest-value-per-(exchange, symbol) batch per
+    event-loop turn, so a slow consumer drops superseded ticks instead of
+    stalling the websocket reads.
+
+    With `multiprocess=True`, each client runs (websocket reads and parsing
+    included) in its own worker process and writes ticks into a
+    SharedTickRing; this process only polls the rings, so detection is not
+    competing with the feeds for the GIL.
+
+    With `journal_dir`, every raw frame is also recorded to a FrameJournal
+    in that directory (one per worker process in multi-process mode).
+
+    Every client publishes its connection and feed health into `health`
+    (a HealthRegistry, shared memory in multi-process mode).
+
+    With `connections` > 1, each exchange is a RedundantFeed of that many
+    hot-standby connections (first copy of each tick wins). With
+    `top_of_book`, clients subscribe to best bid/ask quote channels where
+    the venue has a faster one than its ticker / trade feed.
+
+    With `order_books`, clients maintain L2 books from the depth diff
+    channels instead (in `books`, single-process mode only; workers keep
+    their own) and emit each book's top of book as it changes.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[PriceData], None]] = None,
+        batch_callback: Optional[Callable[[List[PriceData]], None]] = None,
+        queue_capacity: int = INGEST_QUEUE_CAPACITY,
+        multiprocess: bool = False,
+        ring_capacity: int = TICK_RING_CAPACITY,
+        journal_dir: Optional[str] = None,
+        connections: int = FEED_CONNECTIONS,
+        top_of_book: bool = TOP_OF_BOOK,
+        order_books: bool = ORDER_BOOKS
+    ):
         self.callback = callback
+        self.batch_callback = batch_callback
+        self.queue = ConflatingQueue(queue_capacity) if batch_callback else None
+        self.multiprocess = multiprocess
+        self.ring_capacity = ring_capacity
+        self.workers: List[Tuple[multiprocessing.Process, SharedTickRing]] = []
+        self.connections = connections
+        self.top_of_book = top_of_book
+        self.order_books = order_books
+        self.books = None
+        if order_books and connections > 1:
+            raise ValueError("Order book feeds do not support hot-standby connections")
+        if order_books and not multiprocess:
+            from order_book import OrderBookSet
+            self.books = OrderBookSet()
         self.clients = [
-            CoinbaseClient(self.on_price_update),
-            BinanceClient(self.on_price_update),
-            BitstampClient(self.on_price_update)
+            create_client(exchange, self.on_price_update, connections, top_of_book, self.books)
+            for exchange in CLIENT_CLASSES
         ]
+        self.health = HealthRegistry(shared=multiprocess)
+        if not multiprocess:
+            for client in self.clients:
+                client.health = self.health.feed(client.exchange_id)
+        self.journal_dir = journal_dir
+        self.journal: Optional[FrameJournal] = None
+        if journal_dir is not None and not multiprocess:
+            self.journal = FrameJournal(journal_dir, compress=JOURNAL_COMPRESS)
+            for client in self.clients:
+                client.journal = self.journal
         self.latest_prices = {}  # {(exchange, symbol): PriceData}
 
     def on_price_update(self, price_data: PriceData):
         """Handle price updates from any exchange."""
         key = (price_data.exchange, price_data.symbol)
         self.latest_prices[key] = price_data
-        self.callback(price_data)
+        if self.queue is not None:
+            self.queue.put(price_data)
+        else:
+            self.callback(price_data)
+
+    async def deliver_batches(self):
+        """Hand the batch callback one conflated snapshot per event-loop turn."""
+        while True:
+            batch = await self.queue.get_batch()
+            try:
+                self.batch_callback(batch)
+            except Exception as e:
+                logger.error(f"Error processing batch of {len(batch)} ticks: {e}")
+            # Let the clients read whatever arrived meanwhile before taking the next snapshot
+            await asyncio.sleep(0)
+
+    def start_workers(self):
+        """Spawn one worker process (and shared ring) per exchange client."""
+        context = multiprocessing.get_context("spawn")
+        for client in self.clients:
+            ring = SharedTickRing(self.ring_capacity)
+            process = context.Process(
+                target=run_exchange_worker,
+                args=(client.exchange, ring.name, self.ring_capacity, self.journal_dir, self.health.name,
+                      self.connections, self.top_of_book, self.order_books),
+                name=f"ingest-{client.config.name}",
+                daemon=True
+            )
+            process.start()
+            self.workers.append((process, ring))
+            logger.info(f"Started {client.config.name} ingestion worker (pid {process.pid})")
+
+    async def consume_tick_rings(self):
+        """Read new records from every worker's ring and feed them through on_price_update."""
+        while True:
+            received = 0
+            for _, ring in self.workers:
+                records = ring.read()
+                received += len(records)
+                for timestamp_ns, received_ns, price, volume, bid, ask, bid_size, ask_size, symbol_id, exchange_id in records.tolist():
+                    self.on_price_update(PriceData(
+                        TICK_EXCHANGES[exchange_id], TICK_SYMBOLS[symbol_id],
+                        price, volume, timestamp_ns, bid, ask, received_ns, bid_size, ask_size
+                    ))
+            await asyncio.sleep(0 if received else TICK_RING_POLL_SECONDS)
 
     async def start(self):
         """Start all exchange clients concurrently."""
         logger.info("Starting multi-exchange aggregator...")
-        tasks = [client.run() for client in self.clients]
+        if self.multiprocess:
+            self.start_workers()
+            tasks = [self.consume_tick_rings()]
+        else:
+            tasks = [client.run() for client in self.clients]
+        if self.queue is not None:
+            tasks.append(self.deliver_batches())
         await asyncio.gather(*tasks, return_exceptions=True)
 
     async def stop(self):
@@ -230,6 +545,29 @@ class MultiExchangeAggregator:
         logger.info("Stopping multi-exchange aggregator...")
         for client in self.clients:
             await client.disconnect()
+        for process, ring in self.workers:
+            process.terminate()
+            process.join(timeout=5)
+            ring.close()
+            ring.unlink()
+        self.workers = []
+        if self.multiprocess:
+            self.health.close()
+            self.health.unlink()
+        if self.journal is not None:
+            self.journal.close()
+            logger.info(f"📼 Frame journal closed: {self.journal.frames_written:,} frames written")
+
+    def get_queue_stats(self) -> dict:
+        """Ingestion queue depth and drop counts (empty when not batching)."""
+        return self.queue.stats() if self.queue is not None else {}
+
+    def get_worker_stats(self) -> dict:
+        """Per-exchange worker liveness and shared-ring read/drop counts (empty when single-process)."""
+        return {
+            client.config.name: {'alive': process.is_alive(), 'read': ring.read_count, 'dropped': ring.dropped}
+            for client, (process, ring) in zip(self.clients, self.workers)
+        }
 
     def get_latest_prices(self, symbol: str) -> dict:
         """Get latest prices for a symbol across all exchanges."""
@@ -0,0 +1,94 @@
+"""Vectorized depth walks: fill prices and profitable size from book levels.
+
+A Depth holds one side's levels ordered best first, as returned by
+order_book.PriceLadder.levels() (or a single top-of-book level), with their
+cumulative sizes and notionals computed once. Every walk is then a
+searchsorted per batch of targets and a few array operations, whatever the
+number of targets. Targets beyond the known depth come back as NaN.
+
+Cost and revenue are piecewise linear in the quantity traded, with a
+breakpoint at every level boundary on either side. That makes the largest
+profitable quantity exact: evaluate revenue - ratio * cost at the merged
+breakpoints, then solve within the segment where it turns negative.
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+class Depth:
+    """One side's levels (best first) with cumulative size and notional."""
+
+    __slots__ = ('prices', 'sizes', 'cum_size', 'cum_notional')
+
+    def __init__(self, prices: np.ndarray, sizes: np.ndarray):
+        self.prices = np.asarray(prices, dtype=float)
+        self.sizes = np.asarray(sizes, dtype=float)
+        self.cum_size = np.cumsum(self.sizes)
+        self.cum_notional = np.cumsum(self.prices * self.sizes)
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @property
+    def total_size(self) -> float:
+        return float(self.cum_size[-1]) if len(self.cum_size) else 0.0
+
+    def quantity_for_notional(self, notionals: np.ndarray) -> np.ndarray:
+        """Base quantity bought by spending each quote-currency notional down the levels."""
+        notionals = np.asarray(notionals, dtype=float)
+        if not len(self.prices):
+            return np.full(notionals.shape, np.nan)
+        index = np.searchsorted(self.cum_notional, notionals, side='left')
+        covered = index < len(self.prices)
+        index = np.minimum(index, len(self.prices) - 1)
+        # Whole levels before the one the target ends in, plus part of that one
+        overshoot = (self.cum_notional[index] - notionals) / self.prices[index]
+        return np.where(covered, self.cum_size[index] - overshoot, np.nan)
+
+    def cost(self, quantities: np.ndarray) -> np.ndarray:
+        """Quote-currency cost (or proceeds) of trading each base quantity down the levels."""
+        quantities = np.asarray(quantities, dtype=float)
+        if not len(self.prices):
+            return np.full(quantities.shape, np.nan)
+        index = np.searchsorted(self.cum_size, quantities, side='left')
+        covered = index < len(self.prices)
+        index = np.minimum(index, len(self.prices) - 1)
+        cost = self.cum_notional[index] - self.prices[index] * (self.cum_size[index] - quantities)
+        return np.where(covered, cost, np.nan)
+
+    def vwap(self, quantities: np.ndarray) -> np.ndarray:
+        """Volume-weighted average fill price of each (positive) base quantity."""
+        return self.cost(quantities) / quantities
+
+
+def max_profitable_quantity(asks: Depth, bids: Depth, ratio: float) -> Tuple[float, float]:
+    """Largest quantity whose sale proceeds (down `bids`) are at least `ratio` times its cost (up `asks`).
+
+    With ratio = 1 + fees / 100 this is the largest size still profitable
+    after fees, capped at the shallower side's known depth ((0.0, 0.0) when
+    even the touch is not profitable). Returns (quantity, its purchase cost).
+    """
+    if not len(asks) or not len(bids) or bids.prices[0] < ratio * asks.prices[0]:
+        return 0.0, 0.0
+    depth = min(asks.cum_size[-1], bids.cum_size[-1])
+    breakpoints = np.sort(np.concatenate((asks.cum_size, bids.cum_size)))
+    breakpoints = np.append(breakpoints[breakpoints < depth], depth)
+
+    ask_index = np.searchsorted(asks.cum_size, breakpoints, side='left')
+    bid_index = np.searchsorted(bids.cum_size, breakpoints, side='left')
+    ask_prices, bid_prices = asks.prices[ask_index], bids.prices[bid_index]
+    cost = asks.cum_notional[ask_index] - ask_prices * (asks.cum_size[ask_index] - breakpoints)
+    revenue = bids.cum_notional[bid_index] - bid_prices * (bids.cum_size[bid_index] - breakpoints)
+    surplus = revenue - ratio * cost
+
+    # Marginal surplus only falls (asks rise, bids fall) and starts from 0, so the profitable sizes are [0, Q]
+    losing = surplus < 0
+    segment = int(losing.argmax())
+    if not losing[segment]:
+        return float(depth), float(cost[-1])
+    start, start_cost, start_surplus = (
+        (breakpoints[segment - 1], cost[segment - 1], surplus[segment - 1]) if segment else (0.0, 0.0, 0.0)
+    )
+    extra = start_surplus / (ratio * ask_prices[segment] - bid_prices[segment])
+    return float(start + extra), float(start_cost + ask_prices[segment] * extra)
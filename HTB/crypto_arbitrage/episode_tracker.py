@@ -0,0 +1,113 @@
+"""Merge per-tick opportunities into opportunity episodes (lifecycle records)."""
+from collections import deque
+from typing import Collection, Dict, List, Optional, Tuple
+from loguru import logger
+
+from config import (
+    OpportunityEpisode, EPISODE_PROFIT_THRESHOLD,
+    EPISODE_MAX_IDLE_SECONDS, EPISODE_HISTORY_SIZE
+)
+
+
+class EpisodeTracker:
+    """Tracks how long each buy/sell/symbol dislocation lasts.
+
+    An episode opens when a pair's profit after fees reaches the threshold, is
+    updated in place (peak, running average, tick count) while it stays above,
+    and closes when a check of the pair shows it below the threshold
+    ("reverted") or when the pair stops updating ("stale"). A pair whose
+    counterpart quote is stale is not checked, so it can only go stale.
+    Closed episodes go to a bounded history, one compact record per
+    dislocation instead of one per tick.
+
+    The threshold must not be below MIN_PROFIT_THRESHOLD, since the detector
+    only reports pairs that clear that.
+    """
+
+    def __init__(
+        self,
+        threshold: float = EPISODE_PROFIT_THRESHOLD,
+        max_idle_seconds: float = EPISODE_MAX_IDLE_SECONDS,
+        history_size: int = EPISODE_HISTORY_SIZE
+    ):
+        self.threshold = threshold
+        self.max_idle_ns = int(max_idle_seconds * 1e9)
+        self.open_episodes: Dict[str, Dict[Tuple[str, str], OpportunityEpisode]] = {}  # {symbol: {(buy, sell): episode}}
+        self.closed: deque = deque(maxlen=history_size)
+        self.total_opened = 0
+        self.total_closed = 0
+        self._last_sweep_ns = 0
+
+    def observe(
+        self,
+        symbol: str,
+        tested: Collection[Tuple[str, str]],
+        hits: List[Tuple[str, str, float]],
+        now_ns: int
+    ):
+        """Apply one check's results to the pairs it tested.
+
+        Args:
+            symbol: Symbol that ticked
+            tested: (buy exchange, sell exchange) pairs evaluated this check, both sides fresh and quoted
+            hits: (buy exchange, sell exchange, profit after fees) for tested pairs reported this tick
+            now_ns: Tick time in epoch ns
+        """
+        episodes = self.open_episodes.setdefault(symbol, {})
+        above = {(buy, sell): profit for buy, sell, profit in hits if profit >= self.threshold}
+
+        # Open episodes tested this check that did not stay above the threshold have reverted
+        for key in [k for k in episodes if k in tested and k not in above]:
+            self._close(episodes.pop(key), now_ns, "reverted")
+
+        for (buy, sell), profit in above.items():
+            episode = episodes.get((buy, sell))
+            if episode is None:
+                episodes[(buy, sell)] = OpportunityEpisode(
+                    symbol=symbol,
+                    buy_exchange=buy,
+                    sell_exchange=sell,
+                    start_ns=now_ns,
+                    end_ns=now_ns,
+                    peak_profit=profit,
+                    avg_profit=profit
+                )
+                self.total_opened += 1
+                logger.success(
+                    f"ARBITRAGE OPENED: Buy {symbol} on {buy}, Sell on {sell} | Profit: {profit:.2f}%"
+                )
+            else:
+                episode.tick_count += 1
+                episode.end_ns = now_ns
+                episode.peak_profit = max(episode.peak_profit, profit)
+                episode.avg_profit += (profit - episode.avg_profit) / episode.tick_count
+
+        if now_ns - self._last_sweep_ns >= 1e9:
+            self.expire(now_ns)
+
+    def expire(self, now_ns: int):
+        """Close every open episode whose pair has not updated within max idle time."""
+        self._last_sweep_ns = now_ns
+        cutoff = now_ns - self.max_idle_ns
+        for episodes in self.open_episodes.values():
+            for key in [k for k, e in episodes.items() if e.end_ns < cutoff]:
+                self._close(episodes.pop(key), None, "stale")
+
+    def _close(self, episode: OpportunityEpisode, end_ns: Optional[int], reason: str):
+        """Finalize an episode and move it to the closed history (end_ns=None keeps its last update)."""
+        if end_ns is not None:
+            episode.end_ns = end_ns
+        episode.close_reason = reason
+        self.closed.append(episode)
+        self.total_closed += 1
+        logger.info(
+            f"ARBITRAGE CLOSED ({reason}): {episode.symbol} {episode.buy_exchange}->{episode.sell_exchange} "
+            f"lasted {episode.duration_seconds:.2f}s over {episode.tick_count} ticks | "
+            f"Peak: {episode.peak_profit:.2f}%"
+        )
+
+    def recent_episodes(self, minutes: float, now_ns: int) -> List[OpportunityEpisode]:
+        """Closed episodes that ended in the last N minutes, oldest first."""
+        cutoff = now_ns - int(minutes * 60e9)
+        # Snapshot first: the ingestion loop may append while a dashboard thread reads
+        return [e for e in list(self.closed) if e.end_ns >= cutoff]
@@ -0,0 +1,243 @@
+"""Append-only journal of raw exchange WebSocket frames.
+
+Every frame a client receives is recorded before parsing, so a capture keeps
+all of it (not just what survives in the detector's buffers) and can be
+re-parsed later with different parsers. A journal file is
+
+    MAGIC, then records of RECORD_HEADER (received_ns, exchange_id, flags, length) + frame bytes
+
+where received_ns is the monotonic receive time stamped in the client's read
+loop and exchange_id indexes TICK_EXCHANGES. Files rotate every
+JOURNAL_ROTATE_SECONDS and are zstd-compressed when the zstandard package is
+installed.
+
+Clients only append to an in-memory deque; a background thread encodes and
+writes the pending frames in batches, so the event loop never does file I/O.
+"""
+import heapq
+import struct
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from config import JOURNAL_FLUSH_SECONDS, JOURNAL_ROTATE_SECONDS, JOURNAL_ZSTD_LEVEL
+from shm_ring import TICK_EXCHANGES
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+MAGIC = b"ARBJRNL1"
+RECORD_HEADER = struct.Struct("<qHHI")  # received_ns, exchange_id, flags, frame length
+FLAG_BINARY = 1  # Frame arrived as a binary message (bytes), not text
+
+Frame = Tuple[str, int, Union[str, bytes]]  # (exchange name, received_ns, raw frame)
+
+
+class FrameJournal:
+    """Batched, rotating writer of raw frames (one per process).
+
+    append() may be called from any thread and never blocks on I/O. Memory
+    held is whatever arrived since the last flush, i.e. about
+    JOURNAL_FLUSH_SECONDS worth of frames.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        prefix: str = "frames",
+        compress: bool = True,
+        flush_interval: float = JOURNAL_FLUSH_SECONDS,
+        rotate_seconds: int = JOURNAL_ROTATE_SECONDS
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        if compress and zstandard is None:
+            logger.warning("zstandard not installed - frame journal will be written uncompressed")
+        self.compress = compress and zstandard is not None
+        self.flush_interval = flush_interval
+        self.rotate_seconds = rotate_seconds
+
+        self._pending: deque = deque()  # (received_ns, exchange_id, frame); deque append/popleft are thread-safe
+        self._file = None
+        self._stream = None
+        self._period = None
+        self.path: Optional[Path] = None
+
+        self.frames_written = 0
+        self.bytes_written = 0  # Uncompressed record bytes
+        self.files_opened = 0
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"journal-{prefix}", daemon=True)
+        self._thread.start()
+
+    def append(self, exchange_id: int, received_ns: int, frame: Union[str, bytes]):
+        """Queue one raw frame for writing."""
+        self._pending.append((received_ns, exchange_id, frame))
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _run(self):
+        """Writer thread: flush whatever is pending every flush_interval until closed."""
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self._flush()
+            except Exception as e:
+                logger.error(f"Frame journal write failed: {e}")
+        self._flush()
+        self._close_file()
+
+    def _flush(self):
+        """Encode every pending frame into one buffer and write it to the current file."""
+        pending = self._pending
+        if not pending:
+            return
+        self._rotate_if_due()
+
+        chunks: List[bytes] = []
+        pack = RECORD_HEADER.pack
+        count = 0
+        while pending:
+            received_ns, exchange_id, frame = pending.popleft()
+            if isinstance(frame, str):
+                data, flags = frame.encode(), 0
+            else:
+                data, flags = bytes(frame), FLAG_BINARY
+            chunks.append(pack(received_ns, exchange_id, flags, len(data)))
+            chunks.append(data)
+            count += 1
+
+        buffer = b"".join(chunks)
+        self._stream.write(buffer)
+        self.frames_written += count
+        self.bytes_written += len(buffer)
+
+    def _rotate_if_due(self):
+        """Switch to a new file when the wall clock enters a new rotation period."""
+        period = int(time.time()) // self.rotate_seconds
+        if period == self._period:
+            return
+        self._close_file()
+        self._period = period
+
+        started = datetime.fromtimestamp(period * self.rotate_seconds, tz=timezone.utc)
+        suffix = ".jrnl.zst" if self.compress else ".jrnl"
+        self.path = self.directory / f"{self.prefix}_{started.strftime('%Y%m%dT%H%M')}{suffix}"
+
+        self._file = open(self.path, "ab")  # Append: a restart within the period continues the same file
+        new_file = self._file.tell() == 0
+        if self.compress:
+            # Each (re)open starts a new zstd frame; readers decode across frames
+            self._stream = zstandard.ZstdCompressor(level=JOURNAL_ZSTD_LEVEL).stream_writer(self._file, closefd=False)
+        else:
+            self._stream = self._file
+        if new_file:
+            self._stream.write(MAGIC)
+        self.files_opened += 1
+        logger.info(f"📼 Journaling raw frames to {self.path}")
+
+    def _close_file(self):
+        if self._stream is not None and self._stream is not self._file:
+            self._stream.flush(zstandard.FLUSH_FRAME)
+            self._stream.close()
+        if self._file is not None:
+            self._file.close()
+        self._stream = None
+        self._file = None
+
+    def close(self):
+        """Write out everything still pending and close the current file."""
+        self._stop.set()
+        self._thread.join()
+
+    def stats(self) -> dict:
+        """Frames/bytes written so far, current file and backlog."""
+        return {
+            'frames_written': self.frames_written,
+            'bytes_written': self.bytes_written,
+            'files_opened': self.files_opened,
+            'pending': self.pending,
+            'path': str(self.path) if self.path else None,
+        }
+
+
+def read_journal(path: Union[str, Path]) -> Iterator[Frame]:
+    """Yield (exchange, received_ns, frame) from one journal file, in write order.
+
+    Text frames come back as str and binary frames as bytes, exactly as the
+    websocket delivered them. A record cut short by a crash ends the file.
+    """
+    path = Path(path)
+    with open(path, "rb") as raw:
+        if path.suffix == ".zst":
+            if zstandard is None:
+                raise RuntimeError(f"zstandard is required to read {path}")
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            stream = raw
+
+        if _read_exact(stream, len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a frame journal")
+        header_size = RECORD_HEADER.size
+        unpack = RECORD_HEADER.unpack
+        while True:
+            header = _read_exact(stream, header_size)
+            if len(header) < header_size:
+                return
+            received_ns, exchange_id, flags, length = unpack(header)
+            data = _read_exact(stream, length)
+            if len(data) < length:
+                logger.warning(f"Truncated record at the end of {path}")
+                return
+            frame = data if flags & FLAG_BINARY else data.decode()
+            yield TICK_EXCHANGES[exchange_id], received_ns, frame
+
+
+def _read_exact(stream, size: int) -> bytes:
+    """Read up to size bytes, looping over short reads (decompressing readers return partial chunks)."""
+    chunks = []
+    while size > 0:
+        chunk = stream.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def journal_files(directory: Union[str, Path]) -> List[Path]:
+    """Every journal file in a directory, oldest period first."""
+    directory = Path(directory)
+    return sorted(
+        list(directory.glob("*.jrnl")) + list(directory.glob("*.jrnl.zst")),
+        key=lambda path: (path.name.split("_")[-1], path.name)
+    )
+
+
+def iter_journal(directory: Union[str, Path]) -> Iterator[Frame]:
+    """Yield every frame in a journal directory in receive order.
+
+    Files from different writers (e.g. one per ingestion worker process) are
+    merged on received_ns; the monotonic clock is shared by every process on
+    the host, so the merged order is the order frames actually arrived in.
+    """
+    streams = {}
+    for path in journal_files(directory):
+        prefix = path.name.rsplit("_", 1)[0]
+        streams.setdefault(prefix, []).append(path)
+
+    def chain(paths: List[Path]) -> Iterator[Frame]:
+        for path in paths:
+            yield from read_journal(path)
+
+    yield from heapq.merge(*(chain(paths) for paths in streams.values()), key=lambda frame: frame[1])
@@ -0,0 +1,232 @@
+"""Per-exchange feed health telemetry.
+
+Each exchange client owns a FeedHealth and updates plain Python counters on
+its read loop (connects and disconnects, message inter-arrival gaps, sampled
+exchange -> receive lag, parse errors, silences longer than
+STALE_FEED_SECONDS). Every HEALTH_FLUSH_SECONDS it copies them into its row
+of a HealthRegistry, one HEALTH_DTYPE record per exchange, which readers
+summarize in O(1). In multi-process ingestion the registry lives in shared
+memory and each worker writes only its own row.
+
+Hot-standby legs of one exchange (data_ingestion.RedundantFeed) share a
+FeedHealth: the feed is up while any leg is, and message counts and gaps
+include every leg's copy of each frame.
+
+All times are monotonic ns except lag, which compares the exchange's event
+timestamp with the local wall clock (so it includes clock skew).
+"""
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+
+from clock import monotonic_ns, seconds_to_ns
+from config import HEALTH_FLUSH_SECONDS, HEALTH_WINDOW_SECONDS, STALE_FEED_SECONDS, TRACE_SAMPLE_EVERY
+from latency import LatencyHistogram
+from shm_ring import TICK_EXCHANGES
+
+HEALTH_DTYPE = np.dtype([
+    ('connected', '<i8'),  # Live websocket connections
+    ('connections', '<i8'),  # Configured connections (> 1 with hot-standby legs)
+    ('connects', '<i8'),
+    ('messages', '<i8'),
+    ('parse_errors', '<i8'),
+    ('started_ns', '<i8'),  # First connection attempt (0 = never started)
+    ('connected_since_ns', '<i8'),
+    ('disconnected_since_ns', '<i8'),
+    ('downtime_ns', '<i8'),  # Finished periods with no live connection
+    ('last_message_ns', '<i8'),
+    ('gap_ewma_ns', '<f8'),  # Smoothed message inter-arrival gap
+    ('gap_max_ns', '<i8'),  # Longest gap since the last connect
+    ('lag_p50_ns', '<i8'),  # Exchange event time -> receive, last one to two windows
+    ('lag_p99_ns', '<i8'),
+    ('stale_count', '<i8'),  # Gaps longer than STALE_FEED_SECONDS
+    ('stale_ns', '<i8'),  # Total time spent stale
+])
+GAP_EWMA_ALPHA = 0.05
+
+
+class FeedHealth:
+    """Writer side for one exchange: hot-path counters, flushed to a registry row."""
+
+    __slots__ = (
+        'row', 'connected', 'connections', 'connects', 'messages', 'parse_errors', 'started_ns',
+        'connected_since_ns', 'disconnected_since_ns', 'downtime_ns', 'last_message_ns',
+        'gap_ewma_ns', 'gap_max_ns', 'stale_count', 'stale_ns', 'stale_after_ns',
+        'flush_interval_ns', 'window_ns', '_flushed_ns', '_window_start_ns',
+        '_lag', '_lag_previous', '_lag_merged', '_lag_countdown'
+    )
+
+    def __init__(self, row: Optional[np.ndarray] = None):
+        self.row = row  # Length-1 view of this exchange's registry record (None = not published)
+        self.connected = 0
+        self.connections = 1  # Set by RedundantFeed; all its legs share this FeedHealth
+        self.connects = 0
+        self.messages = 0
+        self.parse_errors = 0
+        self.started_ns = 0
+        self.connected_since_ns = 0
+        self.disconnected_since_ns = 0
+        self.downtime_ns = 0
+        self.last_message_ns = 0
+        self.gap_ewma_ns = 0.0
+        self.gap_max_ns = 0
+        self.stale_count = 0
+        self.stale_ns = 0
+        self.stale_after_ns = seconds_to_ns(STALE_FEED_SECONDS)
+        self.flush_interval_ns = seconds_to_ns(HEALTH_FLUSH_SECONDS)
+        self.window_ns = seconds_to_ns(HEALTH_WINDOW_SECONDS)
+        self._flushed_ns = 0
+        self._window_start_ns = 0
+        self._lag = LatencyHistogram()  # Current window
+        self._lag_previous = LatencyHistogram()  # Last full window
+        self._lag_merged = LatencyHistogram()  # Scratch for flush: both windows combined
+        self._lag_countdown = 1
+
+    def start(self, now_ns: int):
+        """Client is about to make its first connection attempt."""
+        if not self.started_ns:
+            self.started_ns = self.disconnected_since_ns = self._window_start_ns = now_ns
+            self.flush(now_ns)
+
+    def on_connected(self, now_ns: int):
+        if not self.connected:
+            if self.disconnected_since_ns:
+                self.downtime_ns += now_ns - self.disconnected_since_ns
+                self.disconnected_since_ns = 0
+            self.connected_since_ns = self.last_message_ns = now_ns
+            self.gap_max_ns = 0
+        self.connected += 1
+        self.connects += 1
+        self.flush(now_ns)
+
+    def on_disconnected(self, now_ns: int):
+        if self.connected:
+            self.connected -= 1
+            if not self.connected:
+                self.disconnected_since_ns = now_ns
+            self.flush(now_ns)
+
+    def on_message(self, received_ns: int):
+        """Every frame received (including ones the parser ignores)."""
+        gap = received_ns - self.last_message_ns
+        self.last_message_ns = received_ns
+        self.messages += 1
+        self.gap_ewma_ns += GAP_EWMA_ALPHA * (gap - self.gap_ewma_ns)
+        if gap > self.gap_max_ns:
+            self.gap_max_ns = gap
+        if gap > self.stale_after_ns:
+            self.stale_count += 1
+            self.stale_ns += gap
+        if received_ns - self._flushed_ns >= self.flush_interval_ns:
+            self.flush(received_ns)
+
+    def on_tick(self, timestamp_ns: int):
+        """A parsed tick: sample its exchange -> receive lag."""
+        self._lag_countdown -= 1
+        if self._lag_countdown:
+            return
+        self._lag_countdown = TRACE_SAMPLE_EVERY
+        if timestamp_ns:
+            self._lag.record(time.time_ns() - timestamp_ns)
+
+    def on_parse_error(self):
+        self.parse_errors += 1
+
+    def flush(self, now_ns: int):
+        """Publish the counters to the registry row."""
+        self._flushed_ns = now_ns
+        if now_ns - self._window_start_ns >= self.window_ns:
+            self._lag, self._lag_previous = self._lag_previous, self._lag
+            self._lag.reset()
+            self._window_start_ns = now_ns
+        if self.row is None:
+            return
+
+        lag = self._lag_merged
+        lag.reset()
+        lag.merge(self._lag)
+        lag.merge(self._lag_previous)
+        self.row[0] = (
+            self.connected, self.connections, self.connects, self.messages, self.parse_errors, self.started_ns,
+            self.connected_since_ns, self.disconnected_since_ns, self.downtime_ns, self.last_message_ns,
+            self.gap_ewma_ns, self.gap_max_ns, lag.percentile(50), lag.percentile(99),
+            self.stale_count, self.stale_ns
+        )
+
+
+def summarize(record, now_ns: int) -> dict:
+    """Dashboard-ready health figures from one HEALTH_DTYPE record."""
+    started = int(record['started_ns'])
+    connected = bool(record['connected'])
+    downtime = int(record['downtime_ns'])
+    if not connected and record['disconnected_since_ns']:
+        downtime += now_ns - int(record['disconnected_since_ns'])
+    elapsed = now_ns - started if started else 0
+    messages = int(record['messages'])
+    silent_ns = now_ns - int(record['last_message_ns']) if connected else 0
+    return {
+        'started': bool(started),
+        'connected': connected,
+        'connections_up': int(record['connected']),
+        'connections': int(record['connections']),
+        'uptime_pct': 100.0 * (1 - downtime / elapsed) if elapsed > 0 else 0.0,
+        'reconnects': max(int(record['connects']) - max(int(record['connections']), 1), 0),
+        'downtime_s': downtime / 1e9,
+        'messages': messages,
+        'msg_rate': float(1e9 / record['gap_ewma_ns']) if record['gap_ewma_ns'] > 0 else 0.0,
+        'gap_ms': float(record['gap_ewma_ns']) / 1e6,
+        'max_gap_ms': int(record['gap_max_ns']) / 1e6,
+        'lag_p50_ms': int(record['lag_p50_ns']) / 1e6,
+        'lag_p99_ms': int(record['lag_p99_ns']) / 1e6,
+        'parse_errors': int(record['parse_errors']),
+        'parse_error_rate': int(record['parse_errors']) / messages if messages else 0.0,
+        'stale_for_s': silent_ns / 1e9 if silent_ns > seconds_to_ns(STALE_FEED_SECONDS) else 0.0,
+        'stale_count': int(record['stale_count']),
+        'stale_s': int(record['stale_ns']) / 1e9,
+    }
+
+
+class HealthRegistry:
+    """One HEALTH_DTYPE record per exchange (TICK_EXCHANGES order).
+
+    shared=True puts the records in a SharedMemory block that worker
+    processes attach to by name.
+    """
+
+    def __init__(self, shared: bool = False, name: Optional[str] = None):
+        self.shm = None
+        if shared or name is not None:
+            size = HEALTH_DTYPE.itemsize * len(TICK_EXCHANGES)
+            self.shm = shared_memory.SharedMemory(create=name is None, size=size, name=name)
+            self.records = np.ndarray((len(TICK_EXCHANGES),), dtype=HEALTH_DTYPE, buffer=self.shm.buf)
+            if name is None:
+                self.records[:] = np.zeros(len(TICK_EXCHANGES), dtype=HEALTH_DTYPE)
+        else:
+            self.records = np.zeros(len(TICK_EXCHANGES), dtype=HEALTH_DTYPE)
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.shm.name if self.shm is not None else None
+
+    def feed(self, exchange_id: int) -> FeedHealth:
+        """Writer for one exchange's record."""
+        return FeedHealth(self.records[exchange_id:exchange_id + 1])
+
+    def get_exchange_health(self) -> Dict[str, dict]:
+        """{exchange: summarize(record)} for every exchange."""
+        now_ns = monotonic_ns()
+        return {exchange: summarize(self.records[i], now_ns) for i, exchange in enumerate(TICK_EXCHANGES)}
+
+    def close(self):
+        """Detach from the shared block, keeping a private copy of the last values."""
+        if self.shm is not None:
+            self.records = self.records.copy()
+            self.shm.close()
+
+    def unlink(self):
+        """Free the shared block (creator only)."""
+        if self.shm is not None:
+            self.shm.unlink()
+            self.shm = None
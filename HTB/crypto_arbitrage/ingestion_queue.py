@@ -0,0 +1,82 @@
+"""Bounded, conflating hand-off between exchange clients and the detector."""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from config import PriceData, INGEST_QUEUE_CAPACITY
+
+
+class ConflatingQueue:
+    """Latest-value-wins queue keyed by (exchange, symbol).
+
+    Clients put() from their read loops and never wait. A newer tick for a key
+    that is still pending replaces the older one in place (the key keeps its
+    position), so under burst load superseded ticks are dropped instead of
+    piling up as socket backlog. Depth is bounded by the number of distinct
+    keys and capped at `capacity`; a new key beyond that is rejected.
+
+    The consumer takes everything pending as one snapshot per get_batch().
+    Both sides must run on the same event loop.
+    """
+
+    def __init__(self, capacity: int = INGEST_QUEUE_CAPACITY):
+        self.capacity = capacity
+        self._pending: Dict[Tuple[str, str], PriceData] = {}
+        self._ready: Optional[asyncio.Event] = None  # Created on the consumer's loop
+
+        self.enqueued = 0  # Ticks accepted
+        self.conflated = 0  # Pending ticks replaced by a newer one for the same key
+        self.rejected = 0  # Ticks refused because the queue was at capacity
+        self.batches = 0
+        self.max_depth = 0
+
+    def put(self, price_data: PriceData) -> bool:
+        """Queue a tick without blocking; False if it had to be rejected."""
+        key = (price_data.exchange, price_data.symbol)
+        pending = self._pending
+        if key in pending:
+            self.conflated += 1
+        elif len(pending) >= self.capacity:
+            self.rejected += 1
+            return False
+        pending[key] = price_data
+        self.enqueued += 1
+
+        depth = len(pending)
+        if depth > self.max_depth:
+            self.max_depth = depth
+        if self._ready is not None:
+            self._ready.set()
+        return True
+
+    def drain(self) -> List[PriceData]:
+        """Take every pending tick (oldest key first) without waiting."""
+        if not self._pending:
+            return []
+        batch = list(self._pending.values())
+        self._pending = {}
+        self.batches += 1
+        return batch
+
+    async def get_batch(self) -> List[PriceData]:
+        """Wait until something is pending, then take it all."""
+        if self._ready is None:
+            self._ready = asyncio.Event()
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        return self.drain()
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and drop counters."""
+        return {
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'enqueued': self.enqueued,
+            'conflated': self.conflated,
+            'rejected': self.rejected,
+            'batches': self.batches,
+        }
@@ -0,0 +1,163 @@
+"""Tick-to-alert latency tracing.
+
+Every stage measures the same thing, time since the frame was received (the
+monotonic received_ns that travels with each tick), so stages need no
+per-tick bookkeeping and the increase from one stage to the next is the time
+spent in between:
+
+    parse     frame received -> tick parsed             (per exchange, client side)
+    detector  frame received -> detector entry          (per exchange; includes queue / ring hand-off)
+    emit      frame received -> opportunity recorded    (per exchange that triggered it)
+    deliver   frame received -> first read by a consumer (dashboards / bots, all exchanges)
+
+Each probe records one event in `sample_every`, into a fixed-bucket
+log-linear (HDR-style) histogram: 64 linear buckets, then 32 per power of two,
+so any value is reported within ~3%. In multi-process ingestion the parse
+probes live in the worker processes; the detector stage still covers them.
+"""
+import threading
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from clock import monotonic_ns
+from config import TRACE_SAMPLE_EVERY
+
+STAGES = ('parse', 'detector', 'emit', 'deliver')
+ALL_EXCHANGES = 'all'
+
+SUB_BUCKET_BITS = 6
+_HALF = 1 << (SUB_BUCKET_BITS - 1)  # Buckets per power of two above the linear range
+MAX_TRACKABLE_NS = (1 << 37) - 1  # ~137 s; larger values land in the last bucket
+BUCKET_COUNT = (MAX_TRACKABLE_NS.bit_length() - SUB_BUCKET_BITS + 2) * _HALF
+
+
+def bucket_index(value_ns: int) -> int:
+    """Bucket for one non-negative latency."""
+    if value_ns < 2 * _HALF:
+        return max(value_ns, 0)
+    value_ns = min(value_ns, MAX_TRACKABLE_NS)
+    shift = value_ns.bit_length() - SUB_BUCKET_BITS
+    return shift * _HALF + (value_ns >> shift)
+
+
+def bucket_upper_bound(index: int) -> int:
+    """Largest value (ns) that falls in a bucket."""
+    if index < 2 * _HALF:
+        return index
+    shift = index // _HALF - 1
+    return ((index - shift * _HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of ns latencies."""
+
+    def __init__(self):
+        self.counts = np.zeros(BUCKET_COUNT, dtype=np.int64)
+        self.count = 0
+        self.max_ns = 0
+
+    def record(self, value_ns: int):
+        self.counts[bucket_index(value_ns)] += 1
+        self.count += 1
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def record_many(self, values_ns: np.ndarray):
+        """Vectorized record of an int64 array of latencies."""
+        if not len(values_ns):
+            return
+        values = np.clip(values_ns.astype(np.int64), 0, MAX_TRACKABLE_NS)
+        shift = np.zeros(len(values), dtype=np.int64)
+        large = values >= 2 * _HALF
+        shift[large] = np.floor(np.log2(values[large])).astype(np.int64) + 1 - SUB_BUCKET_BITS
+        shift += (values >> shift) >= 2 * _HALF  # log2 rounding just below a power of two
+        np.add.at(self.counts, shift * _HALF + (values >> shift), 1)
+        self.count += len(values)
+        self.max_ns = max(self.max_ns, int(values_ns.max()))
+
+    def percentile(self, q: float) -> int:
+        """Upper bound (ns) of the bucket holding the q-th percentile (0 when empty)."""
+        if self.count == 0:
+            return 0
+        rank = max(int(np.ceil(q / 100 * self.count)), 1)
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return min(bucket_upper_bound(index), self.max_ns)
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts += other.counts
+        self.count += other.count
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def reset(self):
+        self.counts[:] = 0
+        self.count = 0
+        self.max_ns = 0
+
+
+class StageProbe:
+    """Sampling entry point for one (stage, exchange) histogram.
+
+    An unsampled call is one decrement and one test, so probes can sit on the
+    per-tick path.
+    """
+
+    __slots__ = ('histogram', 'sample_every', 'now', '_countdown')
+
+    def __init__(self, histogram: LatencyHistogram, sample_every: int, now: Callable[[], int]):
+        self.histogram = histogram
+        self.sample_every = sample_every
+        self.now = now  # Same clock as the received_ns values being measured from
+        self._countdown = 1  # First event is always recorded
+
+    def sample(self, received_ns: int):
+        """Record now - received_ns for one event in sample_every."""
+        self._countdown -= 1
+        if self._countdown:
+            return
+        self._countdown = self.sample_every
+        if received_ns:
+            self.histogram.record(self.now() - received_ns)
+
+
+class LatencyTracer:
+    """Registry of per-(stage, exchange) histograms for one process."""
+
+    def __init__(self, sample_every: int = TRACE_SAMPLE_EVERY):
+        self.sample_every = sample_every
+        self.histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()  # Probes are created from client, detector and dashboard threads
+
+    def histogram(self, stage: str, exchange: str = ALL_EXCHANGES) -> LatencyHistogram:
+        key = (stage, exchange)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def probe(self, stage: str, exchange: str = ALL_EXCHANGES, now: Callable[[], int] = monotonic_ns) -> StageProbe:
+        """A sampling probe feeding the (stage, exchange) histogram."""
+        return StageProbe(self.histogram(stage, exchange), self.sample_every, now)
+
+    def summary(self) -> Dict[str, Dict[str, dict]]:
+        """{stage: {exchange: {count, p50_ms, p99_ms, p999_ms, max_ms}}} in STAGES order."""
+        summary: Dict[str, Dict[str, dict]] = {}
+        for (stage, exchange), histogram in sorted(
+            self.histograms.items(), key=lambda item: (STAGES.index(item[0][0]) if item[0][0] in STAGES else len(STAGES), item[0])
+        ):
+            summary.setdefault(stage, {})[exchange] = {
+                'count': histogram.count,
+                'p50_ms': histogram.percentile(50) / 1e6,
+                'p99_ms': histogram.percentile(99) / 1e6,
+                'p999_ms': histogram.percentile(99.9) / 1e6,
+                'max_ms': histogram.max_ns / 1e6,
+            }
+        return summary
+
+    def reset(self):
+        for histogram in list(self.histograms.values()):
+            histogram.reset()
+
+
+TRACER = LatencyTracer()  # Process-wide default
@@ -117,9 +117,13 @@ import threading
 from loguru import logger
 from pathlib import Path
 from data_ingestion import MultiExchangeAggregator
+from config import DETECTOR_SHARDS, INGEST_MULTIPROCESS, SNAPSHOT_PATH, SNAPSHOT_PUBLISH_INTERVAL
 from arbitrage_detector import ArbitrageDetector
 from ml_predictor import SpreadPredictor, OpportunityScorer
 from dashboard import ArbitrageDashboard
+from snapshot import SnapshotWriter
+from sharded_detector import ShardedDetector
+from latency import TRACER
 
 
 class ArbitrageSystem:
@@ -131,46 +135,71 @@ class ArbitrageSystem:
         self.opportunity_scorer = OpportunityScorer()
         
         # Initialize detector - Try different initialization patterns
-        try:
-            # Try with ml_predictor parameter
-            self.detector = ArbitrageDetector(ml_predictor=self.spread_predictor)
-        except TypeError:
+        self.sharded = DETECTOR_SHARDS > 1
+        if self.sharded:
+            # Detection runs in symbol-sharded worker processes; queries read their merged snapshots
+            self.detector = ShardedDetector()
+        else:
             try:
-                # Try with spread_predictor and opportunity_scorer
-                self.detector = ArbitrageDetector(
-                    spread_predictor=self.spread_predictor,
-                    opportunity_scorer=self.opportunity_scorer
-                )
+                # Try with ml_predictor parameter
+                self.detector = ArbitrageDetector(ml_predictor=self.spread_predictor)
             except TypeError:
                 try:
-                    # Try with just predictor
-                    self.detector = ArbitrageDetector(predictor=self.spread_predictor)
+                    # Try with spread_predictor and opportunity_scorer
+                    self.detector = ArbitrageDetector(
+                        spread_predictor=self.spread_predictor,
+                        opportunity_scorer=self.opportunity_scorer
+                    )
                 except TypeError:
-                    # Initialize without ML components
-                    logger.warning("⚠️  ArbitrageDetector doesn't accept ML predictor - initializing without it")
-                    self.detector = ArbitrageDetector()
-                    # Manually attach ML components if detector has these attributes
-                    if hasattr(self.detector, 'ml_predictor'):
-                        self.detector.ml_predictor = self.spread_predictor
-                    if hasattr(self.detector, 'spread_predictor'):
-                        self.detector.spread_predictor = self.spread_predictor
-                    if hasattr(self.detector, 'opportunity_scorer'):
-                        self.detector.opportunity_scorer = self.opportunity_scorer
+                    try:
+                        # Try with just predictor
+                        self.detector = ArbitrageDetector(predictor=self.spread_predictor)
+                    except TypeError:
+                        # Initialize without ML components
+                        logger.warning("⚠️  ArbitrageDetector doesn't accept ML predictor - initializing without it")
+                        self.detector = ArbitrageDetector()
+                        # Manually attach ML components if detector has these attributes
+                        if hasattr(self.detector, 'ml_predictor'):
+                            self.detector.ml_predictor = self.spread_predictor
+                        if hasattr(self.detector, 'spread_predictor'):
+                            self.detector.spread_predictor = self.spread_predictor
+                        if hasattr(self.detector, 'opportunity_scorer'):
+                            self.detector.opportunity_scorer = self.opportunity_scorer
         
-        # Initialize data aggregator
-        self.aggregator = MultiExchangeAggregator(self.on_price_update)
+        # Initialize data aggregator (ticks reach the detector as conflated batches)
+        self.aggregator = MultiExchangeAggregator(
+            batch_callback=self.on_price_batch,
+            multiprocess=INGEST_MULTIPROCESS
+        )
+        self.detector.books = self.aggregator.books  # L2 depth for sizing (ORDER_BOOKS, single-process only)
         
+        # Read-only state snapshot for dashboards / bots in other processes (each shard publishes its own)
+        self.snapshot = None if self.sharded else SnapshotWriter(SNAPSHOT_PATH)
+
         self.dashboard = None
         self.running = False
         
         # Training interval (5 minutes)
         self.training_interval = 300
 
+        # How often to check the fee overrides file for changes
+        self.fee_reload_interval = 10
+
+        # How often to log ingestion queue depth / drop counts
+        self.queue_report_interval = 60
+
+        # How often to log per-stage tick-to-alert latency percentiles
+        self.latency_report_interval = 60
+
     def on_price_update(self, price_data):
         """Callback for new price data."""
         # Update detector (which checks for arbitrage)
         self.detector.update_price(price_data)
 
+    def on_price_batch(self, batch):
+        """Callback for a conflated batch of price updates."""
+        self.detector.update_prices(batch)
+
     async def train_ml_models(self):
         """Periodically retrain ML models with new data."""
         while self.running:
@@ -179,15 +208,16 @@ class ArbitrageSystem:
             logger.info("🧠 Training ML models with recent data...")
             
             try:
-                # Train spread predictor
-                for symbol in ['BTC-USD', 'ETH-USD', 'SOL-USD']:
-                    df = self.detector.get_historical_data(symbol)
-                    if df is not None and len(df) > 100:
-                        self.spread_predictor.train(df)
-                        logger.info(f"✅ Spread predictor updated for {symbol}")
-                
-                # Save updated models
-                self.spread_predictor.save("models/spread_predictor_live.pkl")
+                # Train spread predictor (needs tick history, which sharded detection keeps in its workers)
+                if self.detector.has_history:
+                    for symbol in ['BTC-USD', 'ETH-USD', 'SOL-USD']:
+                        df = self.detector.get_historical_data(symbol)
+                        if df is not None and len(df) > 100:
+                            self.spread_predictor.train(df)
+                            logger.info(f"✅ Spread predictor updated for {symbol}")
+
+                    # Save updated models
+                    self.spread_predictor.save("models/spread_predictor_live.pkl")
                 
                 # Train opportunity scorer if we have enough opportunities
                 recent_opps = self.detector.get_recent_opportunities(minutes=30)
@@ -211,6 +241,57 @@ class ArbitrageSystem:
             except Exception as e:
                 logger.error(f"❌ Error training ML models: {e}")
 
+    async def watch_fee_overrides(self):
+        """Hot-reload fee overrides into the detector's cost model without restarting ingestion."""
+        if self.sharded:
+            return  # Shard workers reload their own
+        while self.running:
+            await asyncio.sleep(self.fee_reload_interval)
+            if self.detector.cost_model.reload_if_changed():
+                logger.info("💸 Fee overrides reloaded")
+
+    async def report_ingestion_queue(self):
+        """Periodically log how far the detector is keeping up with the feeds."""
+        while self.running:
+            await asyncio.sleep(self.queue_report_interval)
+            stats = self.aggregator.get_queue_stats()
+            logger.info(
+                f"📥 Ingestion queue: depth {stats['depth']} (max {stats['max_depth']}), "
+                f"{stats['enqueued']} ticks in {stats['batches']} batches, "
+                f"{stats['conflated']} superseded, {stats['rejected']} rejected"
+            )
+            for exchange, worker in self.aggregator.get_worker_stats().items():
+                if not worker['alive'] or worker['dropped']:
+                    logger.warning(f"⚠️  {exchange} worker alive={worker['alive']}, {worker['dropped']} ring records dropped")
+            if self.sharded:
+                for shard, worker in self.detector.get_worker_stats().items():
+                    if not worker['alive']:
+                        logger.warning(f"⚠️  Detector {shard} is not running ({worker['routed']:,} ticks routed to it)")
+
+    async def report_latency(self):
+        """Periodically log p50/p99/p999 latency from frame receive to each pipeline stage."""
+        while self.running:
+            await asyncio.sleep(self.latency_report_interval)
+            for stage, exchanges in TRACER.summary().items():
+                for exchange, latency in exchanges.items():
+                    if latency['count']:
+                        logger.info(
+                            f"⏱️  {stage:<8} {exchange:<9} p50 {latency['p50_ms']:.2f}ms | "
+                            f"p99 {latency['p99_ms']:.2f}ms | p999 {latency['p999_ms']:.2f}ms | "
+                            f"max {latency['max_ms']:.2f}ms ({latency['count']:,} samples)"
+                        )
+
+    async def publish_snapshot(self):
+        """Publish detector state to the shared snapshot file for out-of-process readers."""
+        if self.snapshot is None:
+            return
+        while self.running:
+            await asyncio.sleep(SNAPSHOT_PUBLISH_INTERVAL)
+            try:
+                self.snapshot.publish(self.detector, self.aggregator.health)
+            except Exception as e:
+                logger.error(f"❌ Error publishing snapshot: {e}")
+
     async def run_data_collection(self):
         """Run the data collection and arbitrage detection."""
         logger.info("Starting data collection and arbitrage detection...")
@@ -265,6 +346,11 @@ class ArbitrageSystem:
         logger.info("✅ System ready. Dashboard: http://localhost:8050")
         logger.info("=" * 60)
         
+        if self.sharded:
+            self.detector.start()
+            logger.info(f"🧩 Detection sharded across {DETECTOR_SHARDS} worker processes")
+            logger.warning("⚠️  Tick history stays in the detector shards: spread predictor retraining and predictions are off")
+
         # Start dashboard in separate thread
         dashboard_thread = threading.Thread(target=self.start_dashboard, daemon=True)
         dashboard_thread.start()
@@ -276,6 +362,10 @@ class ArbitrageSystem:
         await asyncio.gather(
             self.run_data_collection(),
             self.train_ml_models(),
+            self.watch_fee_overrides(),
+            self.report_ingestion_queue(),
+            self.report_latency(),
+            self.publish_snapshot(),
             return_exceptions=True
         )
 
@@ -283,6 +373,8 @@ class ArbitrageSystem:
         """Stop the system."""
         logger.info("🛑 Stopping arbitrage system...")
         self.running = False
+        if self.sharded:
+            self.detector.stop()
 
 
 def main():
@@ -0,0 +1,411 @@
+"""Schema-specific decoders for raw exchange WebSocket frames.
+
+Each parser reduces one frame to a tick tuple
+
+    (exchange symbol, price, volume, timestamp_ns, bid, ask, bid_size, ask_size, sequence)
+
+or None for frames we do not use. Trades and tickers carry the last price;
+top-of-book quote events (Binance bookTicker, Bitstamp order_book) carry the
+mid price and volume 0. Fields a venue does not send are 0; `sequence` is
+the exchange's per-symbol update / trade id where there is one.
+
+Order book parsers (Coinbase level2, Binance depth diffs, Bitstamp
+diff_order_book) return a BookUpdate instead
+
+    (exchange symbol, bids, asks, timestamp_ns, first_sequence, last_sequence, is_snapshot)
+
+with [(price, size), ...] levels (size 0 removes a level). Symbol and
+timestamp_ns sit where they are in a Tick, so the client read loop treats
+both alike. A cheap substring check rejects irrelevant
+message types (heartbeats, subscription acks) before any JSON decoding.
+
+Decoding uses msgspec typed structs when installed (only the declared fields
+are materialized, numeric strings are converted during decoding), otherwise
+orjson, otherwise the stdlib json module.
+"""
+import json
+import time
+from typing import List, Optional, Tuple, Union
+
+from clock import iso8601_to_ns
+
+try:
+    import msgspec
+except ImportError:  # Optional dependency
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+Tick = Tuple[str, float, float, int, float, float, float, float, int]  # See module docstring
+BookUpdate = Tuple[str, List[Tuple[float, float]], List[Tuple[float, float]], int, int, int, bool]
+
+BACKENDS = tuple(
+    name for name, module in (("msgspec", msgspec), ("orjson", orjson), ("json", json)) if module is not None
+)
+DEFAULT_BACKEND = BACKENDS[0]
+LEVEL_PEEK_BYTES = 256  # Bytes of a raw level array scanned for its first level
+
+_DECODE_ERRORS: tuple = (ValueError, KeyError, TypeError)
+if msgspec is not None:
+    _DECODE_ERRORS += (msgspec.DecodeError,)
+
+
+class FrameDecodeError(ValueError):
+    """A relevant-looking frame could not be decoded."""
+
+
+if msgspec is not None:
+    class _CoinbaseTicker(msgspec.Struct):
+        type: str
+        product_id: str = ""
+        price: float = 0.0
+        volume_24h: float = 0.0
+        time: str = ""
+        best_bid: float = 0.0
+        best_ask: float = 0.0
+        best_bid_size: float = 0.0
+        best_ask_size: float = 0.0
+        sequence: int = 0
+
+    class _BinanceTicker(msgspec.Struct):
+        e: str
+        E: int = 0  # Event time, epoch ms
+        s: str = ""
+        c: float = 0.0  # Last price
+        v: float = 0.0  # Base volume
+        b: float = 0.0  # Best bid
+        B: float = 0.0  # Best bid quantity
+        a: float = 0.0  # Best ask
+        A: float = 0.0  # Best ask quantity
+
+    class _BinanceBookTicker(msgspec.Struct):
+        u: int = 0  # Order book update id
+        s: str = ""
+        b: float = 0.0
+        B: float = 0.0
+        a: float = 0.0
+        A: float = 0.0
+        E: int = 0  # Event time, epoch ms (not sent on spot streams)
+
+    class _BitstampTrade(msgspec.Struct):
+        id: int = 0
+        price: float = 0.0
+        amount: float = 0.0
+        timestamp: int = 0  # Epoch seconds
+        microtimestamp: int = 0  # Epoch µs (0 = absent)
+
+    class _BitstampMessage(msgspec.Struct):
+        event: str
+        channel: str = ""
+        data: Optional[_BitstampTrade] = None
+
+    class _BitstampBook(msgspec.Struct):
+        timestamp: int = 0
+        microtimestamp: int = 0
+        bids: msgspec.Raw = msgspec.Raw(b"[]")  # [[price, amount], ...] best first; only the top level is decoded
+        asks: msgspec.Raw = msgspec.Raw(b"[]")
+
+    class _BitstampBookMessage(msgspec.Struct):
+        event: str
+        channel: str = ""
+        data: Optional[_BitstampBook] = None
+
+    _decode_level = msgspec.json.Decoder(Tuple[float, float], strict=False).decode
+
+    class _CoinbaseLevel2(msgspec.Struct):
+        type: str
+        product_id: str = ""
+        time: str = ""
+        bids: List[Tuple[float, float]] = []  # snapshot
+        asks: List[Tuple[float, float]] = []
+        changes: List[Tuple[str, float, float]] = []  # l2update: [side, price, new size]
+
+    class _BinanceDepthUpdate(msgspec.Struct):
+        e: str
+        E: int = 0  # Event time, epoch ms
+        s: str = ""
+        U: int = 0  # First update id in the event
+        u: int = 0  # Final update id in the event
+        b: List[Tuple[float, float]] = []
+        a: List[Tuple[float, float]] = []
+
+    class _BitstampDiff(msgspec.Struct):
+        timestamp: int = 0
+        microtimestamp: int = 0
+        bids: List[Tuple[float, float]] = []
+        asks: List[Tuple[float, float]] = []
+
+    class _BitstampDiffMessage(msgspec.Struct):
+        event: str
+        channel: str = ""
+        data: Optional[_BitstampDiff] = None
+else:
+    _CoinbaseTicker = _BinanceTicker = _BinanceBookTicker = _BitstampMessage = _BitstampBookMessage = None
+    _CoinbaseLevel2 = _BinanceDepthUpdate = _BitstampDiffMessage = None
+
+
+def parse_levels(levels) -> List[Tuple[float, float]]:
+    """[[price, size], ...] with string or numeric fields -> [(price, size), ...]."""
+    return [(float(level[0]), float(level[1])) for level in levels]
+
+
+def _mid(bid: float, ask: float) -> float:
+    return (bid + ask) / 2 if bid > 0 and ask > 0 else bid or ask
+
+
+def _top_level(raw) -> Optional[Tuple[float, float]]:
+    """(price, amount) of the first level in a raw JSON array of levels, without decoding the others."""
+    head = bytes(memoryview(raw)[:LEVEL_PEEK_BYTES])
+    end = head.find(b"]")
+    if end <= 1:  # Empty side
+        return None
+    return _decode_level(head[1:end + 1])
+
+
+def bitstamp_ns(timestamp, microtimestamp) -> int:
+    """Bitstamp event time: the microsecond field when present, else whole seconds."""
+    if microtimestamp:
+        return int(microtimestamp) * 1000
+    return int(timestamp or 0) * 1_000_000_000
+
+
+class FrameParser:
+    """Base parser: pre-filter on a marker substring, then decode with the chosen backend."""
+
+    marker = ""  # Substring every relevant frame contains
+    struct_type = None  # msgspec Struct describing the fields we use
+
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = backend or DEFAULT_BACKEND
+        if self.backend not in BACKENDS:
+            raise ValueError(f"JSON backend '{self.backend}' is not available (have {BACKENDS})")
+
+        self._marker_bytes = self.marker.encode()
+        self._struct_decode = None
+        self._loads = None
+        if self.backend == "msgspec":
+            self._struct_decode = msgspec.json.Decoder(self.struct_type, strict=False).decode
+        else:
+            self._loads = orjson.loads if self.backend == "orjson" else json.loads
+
+    def parse(self, frame: Union[str, bytes]) -> Optional[Tick]:
+        """Decode one frame; None when it is not a message type we use."""
+        marker = self._marker_bytes if isinstance(frame, bytes) else self.marker
+        if marker not in frame:
+            return None
+        try:
+            if self._struct_decode is not None:
+                return self.from_struct(self._struct_decode(frame))
+            return self.from_dict(self._loads(frame))
+        except _DECODE_ERRORS as e:
+            raise FrameDecodeError(str(e)) from e
+
+    def from_struct(self, message) -> Optional[Tick]:
+        raise NotImplementedError
+
+    def from_dict(self, message: dict) -> Optional[Tick]:
+        raise NotImplementedError
+
+
+class CoinbaseParser(FrameParser):
+    """Coinbase 'ticker' channel."""
+
+    marker = '"ticker"'
+    struct_type = _CoinbaseTicker
+
+    def from_struct(self, message) -> Optional[Tick]:
+        if message.type != "ticker":
+            return None
+        return (message.product_id, message.price, message.volume_24h,
+                iso8601_to_ns(message.time), message.best_bid, message.best_ask,
+                message.best_bid_size, message.best_ask_size, message.sequence)
+
+    def from_dict(self, message: dict) -> Optional[Tick]:
+        if message.get("type") != "ticker":
+            return None
+        return (message["product_id"], float(message["price"]), float(message.get("volume_24h", 0)),
+                iso8601_to_ns(message["time"]),
+                float(message.get("best_bid", 0)), float(message.get("best_ask", 0)),
+                float(message.get("best_bid_size", 0)), float(message.get("best_ask_size", 0)),
+                int(message.get("sequence", 0)))
+
+
+class BinanceParser(FrameParser):
+    """Binance '<symbol>@ticker' stream (24hrTicker events)."""
+
+    marker = '24hrTicker'
+    struct_type = _BinanceTicker
+
+    def from_struct(self, message) -> Optional[Tick]:
+        if message.e != "24hrTicker":
+            return None
+        return (message.s, message.c, message.v, message.E * 1_000_000, message.b, message.a, message.B, message.A, 0)
+
+    def from_dict(self, message: dict) -> Optional[Tick]:
+        if message.get("e") != "24hrTicker":
+            return None
+        return (message["s"], float(message["c"]), float(message["v"]), int(message["E"]) * 1_000_000,
+                float(message.get("b", 0)), float(message.get("a", 0)),
+                float(message.get("B", 0)), float(message.get("A", 0)), 0)
+
+
+class BinanceBookTickerParser(FrameParser):
+    """Binance '<symbol>@bookTicker' stream: every best bid/ask change, in real time.
+
+    Spot bookTicker frames have no event type and no event time, so the
+    pre-filter keys on the update id and the tick is stamped with the local
+    wall clock at parse time.
+    """
+
+    marker = '"u":'
+    struct_type = _BinanceBookTicker
+
+    def from_struct(self, message) -> Optional[Tick]:
+        if not message.u or not message.s:
+            return None
+        timestamp_ns = message.E * 1_000_000 if message.E else time.time_ns()
+        return (message.s, _mid(message.b, message.a), 0.0, timestamp_ns,
+                message.b, message.a, message.B, message.A, message.u)
+
+    def from_dict(self, message: dict) -> Optional[Tick]:
+        if "u" not in message or "s" not in message:
+            return None
+        bid, ask = float(message["b"]), float(message["a"])
+        timestamp_ns = int(message["E"]) * 1_000_000 if "E" in message else time.time_ns()
+        return (message["s"], _mid(bid, ask), 0.0, timestamp_ns,
+                bid, ask, float(message["B"]), float(message["A"]), int(message["u"]))
+
+
+class BitstampParser(FrameParser):
+    """Bitstamp 'live_trades_<pair>' channel; the symbol is taken from the channel name.
+
+    Trades carry no bid/ask, so both are 0.0. The microsecond trade time is
+    preferred; "timestamp" is whole seconds.
+    """
+
+    marker = '"trade"'
+    struct_type = _BitstampMessage
+    channel_prefix = "live_trades_"
+
+    def from_struct(self, message) -> Optional[Tick]:
+        if message.event != "trade" or message.data is None:
+            return None
+        data = message.data
+        return (message.channel.replace(self.channel_prefix, ""), data.price, data.amount,
+                bitstamp_ns(data.timestamp, data.microtimestamp), 0.0, 0.0, 0.0, 0.0, data.id)
+
+    def from_dict(self, message: dict) -> Optional[Tick]:
+        if message.get("event") != "trade":
+            return None
+        data = message.get("data", {})
+        return (message.get("channel", "").replace(self.channel_prefix, ""),
+                float(data.get("price", 0)), float(data.get("amount", 0)),
+                bitstamp_ns(data.get("timestamp"), data.get("microtimestamp")),
+                0.0, 0.0, 0.0, 0.0, int(data.get("id", 0)))
+
+
+class BitstampOrderBookParser(FrameParser):
+    """Bitstamp 'order_book_<pair>' channel, reduced to its top level (best bid/ask and sizes)."""
+
+    marker = '"bids"'
+    struct_type = _BitstampBookMessage
+    channel_prefix = "order_book_"
+
+    def from_struct(self, message) -> Optional[Tick]:
+        data = message.data
+        if message.event != "data" or data is None:
+            return None
+        best_bid, best_ask = _top_level(data.bids), _top_level(data.asks)
+        if best_bid is None or best_ask is None:
+            return None
+        (bid, bid_size), (ask, ask_size) = best_bid, best_ask
+        return (message.channel.replace(self.channel_prefix, ""), _mid(bid, ask), 0.0,
+                bitstamp_ns(data.timestamp, data.microtimestamp), bid, ask, bid_size, ask_size, 0)
+
+    def from_dict(self, message: dict) -> Optional[Tick]:
+        data = message.get("data") or {}
+        if message.get("event") != "data" or not data.get("bids") or not data.get("asks"):
+            return None
+        bid, bid_size = map(float, data["bids"][0][:2])
+        ask, ask_size = map(float, data["asks"][0][:2])
+        return (message.get("channel", "").replace(self.channel_prefix, ""), _mid(bid, ask), 0.0,
+                bitstamp_ns(data.get("timestamp"), data.get("microtimestamp")), bid, ask, bid_size, ask_size, 0)
+
+
+class CoinbaseLevel2Parser(FrameParser):
+    """Coinbase 'level2' / 'level2_batch' channel: one snapshot per subscription, then l2update changes.
+
+    Level2 frames carry no sequence number; the snapshot after every
+    (re)subscribe is the resync point.
+    """
+
+    marker = '"product_id"'  # Skips the subscriptions ack; heartbeats still reach the type check
+    struct_type = _CoinbaseLevel2
+
+    def from_struct(self, message) -> Optional[BookUpdate]:
+        timestamp_ns = iso8601_to_ns(message.time) if message.time else 0
+        if message.type == "l2update":
+            changes = message.changes
+            bids = [(price, size) for side, price, size in changes if side == "buy"]
+            asks = [(price, size) for side, price, size in changes if side != "buy"]
+            return (message.product_id, bids, asks, timestamp_ns, 0, 0, False)
+        if message.type == "snapshot":
+            return (message.product_id, message.bids, message.asks, timestamp_ns, 0, 0, True)
+        return None
+
+    def from_dict(self, message: dict) -> Optional[BookUpdate]:
+        kind = message.get("type")
+        timestamp_ns = iso8601_to_ns(message["time"]) if message.get("time") else 0
+        if kind == "l2update":
+            changes = [(side, float(price), float(size)) for side, price, size in message.get("changes", [])]
+            bids = [(price, size) for side, price, size in changes if side == "buy"]
+            asks = [(price, size) for side, price, size in changes if side != "buy"]
+            return (message["product_id"], bids, asks, timestamp_ns, 0, 0, False)
+        if kind == "snapshot":
+            return (message["product_id"], parse_levels(message.get("bids", [])), parse_levels(message.get("asks", [])),
+                    timestamp_ns, 0, 0, True)
+        return None
+
+
+class BinanceDepthParser(FrameParser):
+    """Binance '<symbol>@depth' diff streams (depthUpdate events covering update ids U..u)."""
+
+    marker = 'depthUpdate'
+    struct_type = _BinanceDepthUpdate
+
+    def from_struct(self, message) -> Optional[BookUpdate]:
+        if message.e != "depthUpdate":
+            return None
+        return (message.s, message.b, message.a, message.E * 1_000_000, message.U, message.u, False)
+
+    def from_dict(self, message: dict) -> Optional[BookUpdate]:
+        if message.get("e") != "depthUpdate":
+            return None
+        return (message["s"], parse_levels(message.get("b", [])), parse_levels(message.get("a", [])),
+                int(message.get("E", 0)) * 1_000_000, int(message["U"]), int(message["u"]), False)
+
+
+class BitstampDiffParser(FrameParser):
+    """Bitstamp 'diff_order_book_<pair>' channel (changed levels only; amount 0 removes one)."""
+
+    marker = '"bids"'
+    struct_type = _BitstampDiffMessage
+    channel_prefix = "diff_order_book_"
+
+    def from_struct(self, message) -> Optional[BookUpdate]:
+        data = message.data
+        if message.event != "data" or data is None:
+            return None
+        return (message.channel.replace(self.channel_prefix, ""), data.bids, data.asks,
+                bitstamp_ns(data.timestamp, data.microtimestamp), 0, 0, False)
+
+    def from_dict(self, message: dict) -> Optional[BookUpdate]:
+        data = message.get("data") or {}
+        if message.get("event") != "data" or "bids" not in data:
+            return None
+        return (message.get("channel", "").replace(self.channel_prefix, ""),
+                parse_levels(data.get("bids", [])), parse_levels(data.get("asks", [])),
+                bitstamp_ns(data.get("timestamp"), data.get("microtimestamp")), 0, 0, False)
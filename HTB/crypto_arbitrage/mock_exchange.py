@@ -0,0 +1,366 @@
+"""Local mock of the Coinbase, Binance and Bitstamp websocket feeds.
+
+One server, one path per exchange, each speaking the handshake and message
+format its client in data_ingestion.py expects:
+
+    /coinbase   subscribe {"type": "subscribe", ...}  ->  "subscriptions" ack, then "ticker" frames
+    /binance    streams in the URL path (/binance/btcusdt@ticker/...)  ->  "24hrTicker" frames
+                (or bookTicker frames for <symbol>@bookTicker streams)
+    /bitstamp   {"event": "bts:subscribe", ...} per pair  ->  "bts:subscription_succeeded", then "trade" frames
+                (or order book frames for order_book_<pair> channels)
+
+Every connection streams `rate` frames/sec across its subscribed symbols,
+with optional bursts, stalls and abrupt disconnects. Prices are a seeded
+random walk, or cycled from recorded captured_data CSVs. Frames are stamped
+with the wall time they are sent at, so event-time -> receive latency
+measured by the clients is the real local delivery latency.
+
+Point the system at it through the environment (config.py reads these):
+
+    COINBASE_WS_URL=ws://127.0.0.1:8765/coinbase
+    BINANCE_WS_URL=ws://127.0.0.1:8765/binance
+    BITSTAMP_WS_URL=ws://127.0.0.1:8765/bitstamp
+
+Usage: python mock_exchange.py [--port 8765] [--rate 1000] [--csv FILE ...]
+       [--burst-size N --burst-interval S] [--stall-seconds S --stall-interval S] [--disconnect-interval S]
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import websockets
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from clock import ns_to_datetime
+from config import Exchange, EXCHANGE_CONFIGS, SYMBOL_MAPPINGS
+
+SEND_INTERVAL = 0.001  # Pacing granularity: frames due are sent in one go every millisecond
+BOOK_LEVELS = 100  # Bitstamp sends 100 levels per side on order_book_*
+
+
+def coinbase_ticker(symbol: str, price: float, volume: float, bid: float, ask: float, timestamp_ns: int, sequence: int) -> str:
+    """Coinbase 'ticker' channel frame (full schema)."""
+    return json.dumps({
+        "type": "ticker", "sequence": sequence, "product_id": symbol,
+        "price": f"{price:.8g}", "open_24h": f"{price * 0.99:.8g}", "volume_24h": f"{volume:.8f}",
+        "low_24h": f"{price * 0.98:.8g}", "high_24h": f"{price * 1.01:.8g}", "volume_30d": "289341.1",
+        "best_bid": f"{bid:.8g}", "best_bid_size": "0.10000000", "best_ask": f"{ask:.8g}",
+        "best_ask_size": "0.25000000", "side": "buy",
+        "time": ns_to_datetime(timestamp_ns).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        "trade_id": 90000000 + sequence, "last_size": "0.00010000",
+    }, separators=(",", ":"))
+
+
+def binance_ticker(symbol: str, price: float, volume: float, bid: float, ask: float, timestamp_ns: int, sequence: int) -> str:
+    """Binance '<symbol>@ticker' 24hrTicker frame (full schema)."""
+    return json.dumps({
+        "e": "24hrTicker", "E": timestamp_ns // 1_000_000, "s": symbol,
+        "p": "120.00", "P": "0.110", "w": f"{price:.8g}", "x": f"{price:.8g}",
+        "c": f"{price:.8g}", "Q": "0.00100000", "b": f"{bid:.8g}", "B": "1.20000000",
+        "a": f"{ask:.8g}", "A": "0.80000000", "o": f"{price * 0.99:.8g}",
+        "h": f"{price * 1.01:.8g}", "l": f"{price * 0.98:.8g}", "v": f"{volume:.8f}",
+        "q": "1500000000.00", "O": 0, "C": 0, "F": 3000000000 + sequence, "L": 3000100000 + sequence,
+        "n": 100000,
+    }, separators=(",", ":"))
+
+
+def bitstamp_trade(symbol: str, price: float, volume: float, bid: float, ask: float, timestamp_ns: int, sequence: int) -> str:
+    """Bitstamp 'live_trades_<pair>' trade frame (full schema; trades carry no bid/ask)."""
+    return json.dumps({
+        "event": "trade", "channel": f"live_trades_{symbol}",
+        "data": {
+            "id": 400000000 + sequence, "timestamp": str(timestamp_ns // 1_000_000_000),
+            "amount": volume, "amount_str": f"{volume:.8f}",
+            "price": price, "price_str": f"{price:.0f}", "type": sequence % 2,
+            "microtimestamp": str(timestamp_ns // 1000), "buy_order_id": 1, "sell_order_id": 2,
+        },
+    }, separators=(",", ":"))
+
+
+def binance_book_ticker(symbol: str, price: float, volume: float, bid: float, ask: float, timestamp_ns: int, sequence: int) -> str:
+    """Binance '<symbol>@bookTicker' frame (spot schema: no event type or time)."""
+    return json.dumps({
+        "u": 400900217 + sequence, "s": symbol,
+        "b": f"{bid:.8g}", "B": f"{volume / 1000:.8f}", "a": f"{ask:.8g}", "A": f"{volume / 1500:.8f}",
+    }, separators=(",", ":"))
+
+
+def bitstamp_order_book(symbol: str, price: float, volume: float, bid: float, ask: float, timestamp_ns: int, sequence: int) -> str:
+    """Bitstamp 'order_book_<pair>' frame: top BOOK_LEVELS levels per side, best first."""
+    tick = price * 1e-5
+    return json.dumps({
+        "data": {
+            "timestamp": str(timestamp_ns // 1_000_000_000), "microtimestamp": str(timestamp_ns // 1000),
+            "bids": [[f"{bid - i * tick:.8g}", f"{volume / 1000 * (i + 1):.8f}"] for i in range(BOOK_LEVELS)],
+            "asks": [[f"{ask + i * tick:.8g}", f"{volume / 1500 * (i + 1):.8f}"] for i in range(BOOK_LEVELS)],
+        },
+        "channel": f"order_book_{symbol}", "event": "data",
+    }, separators=(",", ":"))
+
+ENCODERS = {
+    Exchange.COINBASE: coinbase_ticker,
+    Exchange.BINANCE: binance_ticker,
+    Exchange.BITSTAMP: bitstamp_trade,
+}
+QUOTE_ENCODERS = {  # Top-of-book channels (data_ingestion TOP_OF_BOOK mode)
+    Exchange.BINANCE: binance_book_ticker,
+    Exchange.BITSTAMP: bitstamp_order_book,
+}
+
+# Rough price levels for the synthetic walk
+BASE_PRICES = {"BTC-USD": 110000.0, "ETH-USD": 3900.0, "SOL-USD": 185.0, "ETH-BTC": 0.03545}
+
+
+class SyntheticTicks:
+    """Seeded random walk per (exchange, symbol), with small per-exchange offsets so spreads open and close."""
+
+    def __init__(self, seed: int = 0, volatility: float = 1e-4):
+        self.random = random.Random(seed)
+        self.volatility = volatility
+        self.prices: Dict[tuple, float] = {}
+
+    def next_tick(self, exchange: Exchange, symbol: str) -> tuple:
+        """(price, volume, bid, ask) for a normalized symbol."""
+        key = (exchange, symbol)
+        price = self.prices.get(key)
+        if price is None:
+            price = BASE_PRICES.get(symbol, 100.0) * (1 + self.random.uniform(-0.002, 0.002))
+        price *= 1 + self.random.gauss(0, self.volatility)
+        self.prices[key] = price
+        half_spread = price * 0.00005
+        return price, self.random.uniform(1000, 2000), price - half_spread, price + half_spread
+
+
+class RecordedTicks:
+    """Cycles through the recorded (price, volume, bid, ask) sequence of each (exchange, symbol)."""
+
+    def __init__(self, paths: List[Path]):
+        from replay import load_ticks
+
+        ticks = load_ticks(paths)
+        self.series: Dict[tuple, list] = {}
+        self.positions: Counter = Counter()
+        names = {config.name: exchange for exchange, config in EXCHANGE_CONFIGS.items()}
+        for (name, symbol), group in ticks.groupby(['exchange', 'symbol'], sort=False):
+            if name in names:
+                self.series[(names[name], symbol)] = list(zip(
+                    group['price'].tolist(), group['volume'].tolist(), group['bid'].tolist(), group['ask'].tolist()
+                ))
+        self.fallback = SyntheticTicks()  # For pairs the recording does not cover
+
+    def next_tick(self, exchange: Exchange, symbol: str) -> tuple:
+        series = self.series.get((exchange, symbol))
+        if not series:
+            return self.fallback.next_tick(exchange, symbol)
+        position = self.positions[(exchange, symbol)]
+        self.positions[(exchange, symbol)] = position + 1
+        return series[position % len(series)]
+
+
+class MockExchangeServer:
+    """Serves all three mock feeds on one port and keeps per-exchange counters."""
+
+    def __init__(
+        self,
+        source,
+        rate: float = 1000.0,
+        burst_size: int = 0,
+        burst_interval: float = 0.0,
+        stall_seconds: float = 0.0,
+        stall_interval: float = 0.0,
+        disconnect_interval: float = 0.0
+    ):
+        self.source = source
+        self.rate = rate  # Frames/sec per connection
+        self.burst_size = burst_size  # Extra frames sent back-to-back every burst_interval seconds
+        self.burst_interval = burst_interval
+        self.stall_seconds = stall_seconds  # Silence every stall_interval seconds (connection stays open)
+        self.stall_interval = stall_interval
+        self.disconnect_interval = disconnect_interval  # Abort the TCP connection after this long (0 = never)
+
+        self.frames_sent: Counter = Counter()  # {exchange name: frames}
+        self.connections: Counter = Counter()
+        self.disconnects: Counter = Counter()
+        self._sequence = 0
+
+    async def handler(self, websocket):
+        """Route a connection by its path to the matching exchange session."""
+        parts = websocket.path.strip("/").split("/")
+        try:
+            exchange = Exchange(parts[0])
+        except ValueError:
+            await websocket.close(code=1008, reason="unknown exchange")
+            return
+
+        config = EXCHANGE_CONFIGS[exchange]
+        self.connections[config.name] += 1
+        subscribed: Dict[str, Callable] = {}  # {exchange-format symbol: frame encoder for its channel}
+        if exchange is Exchange.BINANCE:
+            for stream in parts[1:]:
+                symbol, _, kind = stream.partition("@")
+                if kind in ("ticker", "bookTicker"):
+                    subscribed[symbol.upper()] = binance_book_ticker if kind == "bookTicker" else binance_ticker
+
+        reader = asyncio.create_task(self._read_subscriptions(websocket, exchange, subscribed))
+        try:
+            await self._stream(websocket, exchange, subscribed)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            reader.cancel()
+
+    async def _read_subscriptions(self, websocket, exchange: Exchange, subscribed: Dict[str, Callable]):
+        """Handle subscribe requests for the life of the connection, acknowledging each."""
+        async for message in websocket:
+            request = json.loads(message)
+            if exchange is Exchange.COINBASE and request.get("type") == "subscribe":
+                subscribed.update(dict.fromkeys(request.get("product_ids", []), coinbase_ticker))
+                await websocket.send(json.dumps({
+                    "type": "subscriptions",
+                    "channels": [{"name": channel, "product_ids": sorted(subscribed)} for channel in request.get("channels", [])]
+                }))
+            elif exchange is Exchange.BITSTAMP and request.get("event") == "bts:subscribe":
+                channel = request.get("data", {}).get("channel", "")
+                if channel.startswith("live_trades_"):
+                    subscribed[channel[len("live_trades_"):]] = bitstamp_trade
+                elif channel.startswith("order_book_"):
+                    subscribed[channel[len("order_book_"):]] = bitstamp_order_book
+                await websocket.send(json.dumps({"event": "bts:subscription_succeeded", "channel": channel, "data": {}}))
+
+    async def _stream(self, websocket, exchange: Exchange, subscribed: Dict[str, Callable]):
+        """Send frames at the configured rate until the client leaves or a disconnect is due."""
+        loop = asyncio.get_running_loop()
+        name = EXCHANGE_CONFIGS[exchange].name
+        started = loop.time()
+        sent = 0
+        next_burst = started + self.burst_interval if self.burst_size and self.burst_interval else None
+        next_stall = started + self.stall_interval if self.stall_seconds and self.stall_interval else None
+        disconnect_at = started + self.disconnect_interval if self.disconnect_interval else None
+
+        while True:
+            await asyncio.sleep(SEND_INTERVAL)
+            now = loop.time()
+            if disconnect_at is not None and now >= disconnect_at:
+                self.disconnects[name] += 1
+                websocket.transport.abort()  # No close frame: the client sees an abnormal closure
+                await websocket.wait_closed()
+                return
+            if next_stall is not None and now >= next_stall:
+                await asyncio.sleep(self.stall_seconds)
+                started += self.stall_seconds  # Resume at the normal rate rather than catching up
+                next_stall += self.stall_interval
+                continue
+            if not subscribed:
+                started, sent = now, 0
+                continue
+
+            due = int((now - started) * self.rate) - sent
+            sent += max(due, 0)
+            if next_burst is not None and now >= next_burst:
+                due += self.burst_size
+                next_burst += self.burst_interval
+            if due > 0:
+                await self._send_frames(websocket, exchange, subscribed, due)
+
+    async def _send_frames(self, websocket, exchange: Exchange, subscribed: Dict[str, Callable], count: int):
+        """Send `count` frames, round-robin over the subscribed symbols."""
+        symbols = sorted(subscribed)
+        for i in range(count):
+            symbol = symbols[(self._sequence + i) % len(symbols)]
+            price, volume, bid, ask = self.source.next_tick(exchange, SYMBOL_MAPPINGS.get(symbol, symbol))
+            encode = subscribed[symbol]
+            await websocket.send(encode(symbol, price, volume, bid, ask, time.time_ns(), self._sequence + i))
+        self._sequence += count
+        self.frames_sent[EXCHANGE_CONFIGS[exchange].name] += count
+
+    def stats(self) -> dict:
+        """Frames sent, connections accepted and disconnects forced, per exchange."""
+        return {
+            name: {
+                'frames_sent': self.frames_sent[name],
+                'connections': self.connections[name],
+                'disconnects': self.disconnects[name],
+            }
+            for name in (config.name for config in EXCHANGE_CONFIGS.values())
+        }
+
+    async def report(self, interval: float):
+        """Log send rates every `interval` seconds."""
+        previous = Counter()
+        while True:
+            await asyncio.sleep(interval)
+            rates = ", ".join(
+                f"{name} {(self.frames_sent[name] - previous[name]) / interval:,.0f}/s"
+                for name in (config.name for config in EXCHANGE_CONFIGS.values())
+            )
+            previous = Counter(self.frames_sent)
+            logger.info(f"📡 Mock feeds: {rates} | connections {sum(self.connections.values())}, disconnects {sum(self.disconnects.values())}")
+
+
+def environment(host: str, port: int) -> Dict[str, str]:
+    """<EXCHANGE>_WS_URL variables pointing every client at a mock server."""
+    return {f"{exchange.name}_WS_URL": f"ws://{host}:{port}/{exchange.value}" for exchange in Exchange}
+
+
+async def serve(server: MockExchangeServer, host: str, port: int, report_interval: Optional[float] = None):
+    """Run the server until cancelled."""
+    async with websockets.serve(server.handler, host, port, max_queue=None):
+        tasks = [asyncio.Future()]
+        if report_interval:
+            tasks.append(server.report(report_interval))
+        await asyncio.gather(*tasks)
+
+
+def run_server(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    csv: Optional[List[Path]] = None,
+    seed: int = 0,
+    report_interval: Optional[float] = None,
+    **options
+):
+    """Blocking entry point (also the target for running the mock in a separate process)."""
+    source = RecordedTicks(csv) if csv else SyntheticTicks(seed=seed)
+    server = MockExchangeServer(source, **options)
+    try:
+        asyncio.run(serve(server, host, port, report_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=1000.0, help="Frames/sec per connection")
+    parser.add_argument("--csv", nargs="*", type=Path, default=None, help="Cycle prices from recorded CSVs instead of a random walk")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--burst-size", type=int, default=0)
+    parser.add_argument("--burst-interval", type=float, default=0.0)
+    parser.add_argument("--stall-seconds", type=float, default=0.0)
+    parser.add_argument("--stall-interval", type=float, default=0.0)
+    parser.add_argument("--disconnect-interval", type=float, default=0.0)
+    parser.add_argument("--report-interval", type=float, default=10.0)
+    args = parser.parse_args()
+
+    logger.info(f"Mock exchanges on ws://{args.host}:{args.port} ({args.rate:g} frames/s per connection)")
+    for key, value in environment(args.host, args.port).items():
+        logger.info(f"  export {key}={value}")
+    run_server(
+        args.host, args.port, csv=args.csv, seed=args.seed, report_interval=args.report_interval,
+        rate=args.rate, burst_size=args.burst_size, burst_interval=args.burst_interval,
+        stall_seconds=args.stall_seconds, stall_interval=args.stall_interval,
+        disconnect_interval=args.disconnect_interval
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Bounded, columnar, time-indexed store of detected arbitrage opportunities."""
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+from clock import ns_to_datetime
+from config import ArbitrageOpportunity, OPPORTUNITY_STORE_SIZE, DEPTH_NOTIONALS_USD
+
+
+class OpportunityStore:
+    """Ring buffer of opportunities kept as NumPy columns.
+
+    Rows are appended in timestamp order, so the ring is at most two sorted
+    physical segments and a "since T" window is found with a binary search per
+    segment: O(log n) to locate, O(k) to copy the k matching rows.
+    ArbitrageOpportunity objects are only built for rows a caller materializes.
+
+    It also behaves like a read-only sequence (len, iteration, indexing) so
+    code that used the old list of opportunities keeps working.
+    """
+
+    COLUMNS = ('timestamp_ns', 'symbol_id', 'pair_id', 'buy_price', 'sell_price',
+               'spread_pct', 'profit_after_fees', 'confidence_score', 'received_ns',
+               'max_size_usd', 'size_profit')
+
+    def __init__(self, capacity: int = OPPORTUNITY_STORE_SIZE, notionals=DEPTH_NOTIONALS_USD):
+        self.capacity = capacity
+        self.notionals = tuple(notionals)  # Trade sizes of the size_profit columns
+        self.timestamp_ns = np.zeros(capacity, dtype=np.int64)
+        self.symbol_id = np.zeros(capacity, dtype=np.int32)
+        self.pair_id = np.zeros(capacity, dtype=np.int32)
+        self.buy_price = np.zeros(capacity)
+        self.sell_price = np.zeros(capacity)
+        self.spread_pct = np.zeros(capacity)
+        self.profit_after_fees = np.zeros(capacity)
+        self.confidence_score = np.zeros(capacity)
+        self.received_ns = np.zeros(capacity, dtype=np.int64)  # Monotonic receive time of the triggering tick (0 = unknown)
+        self.max_size_usd = np.full(capacity, np.nan)  # NaN = not sized (no depth known, or unprofitable at the touch)
+        self.size_profit = np.full((capacity, len(self.notionals)), np.nan)  # Profit after fees at each notional's VWAPs
+
+        self.symbols: List[str] = []  # {symbol id: symbol}
+        self.pairs: List[Tuple[str, str]] = []  # {pair id: (buy exchange, sell exchange)}
+        self._symbol_ids: Dict[str, int] = {}
+        self._pair_ids: Dict[Tuple[str, str], int] = {}
+
+        self.head = 0  # Next physical row to write
+        self.size = 0
+        self.total_appended = 0
+
+    def append(
+        self,
+        symbol: str,
+        buy_exchange: str,
+        sell_exchange: str,
+        buy_price: float,
+        sell_price: float,
+        spread_pct: float,
+        profit_after_fees: float,
+        timestamp_ns: int,
+        confidence_score: float = 0.0,
+        received_ns: int = 0,
+        max_size_usd: float = np.nan,
+        size_profit: Optional[np.ndarray] = None
+    ) -> int:
+        """Append one opportunity (overwriting the oldest when full) and return its physical row."""
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+
+        pair = (buy_exchange, sell_exchange)
+        pair_id = self._pair_ids.get(pair)
+        if pair_id is None:
+            pair_id = self._pair_ids[pair] = len(self.pairs)
+            self.pairs.append(pair)
+
+        row = self.head
+        self.timestamp_ns[row] = timestamp_ns
+        self.symbol_id[row] = symbol_id
+        self.pair_id[row] = pair_id
+        self.buy_price[row] = buy_price
+        self.sell_price[row] = sell_price
+        self.spread_pct[row] = spread_pct
+        self.profit_after_fees[row] = profit_after_fees
+        self.confidence_score[row] = confidence_score
+        self.received_ns[row] = received_ns
+        self.max_size_usd[row] = max_size_usd
+        self.size_profit[row] = np.nan if size_profit is None else size_profit
+
+        # Publish the row only after all columns are written
+        self.head = (row + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+        self.total_appended += 1
+        return row
+
+    def _segments(self) -> List[Tuple[int, int]]:
+        """Physical [start, stop) ranges of the ring in chronological order."""
+        head, size = self.head, self.size
+        if size < self.capacity:
+            return [(0, size)] if size else []
+        return [(head, self.capacity), (0, head)] if head else [(0, self.capacity)]
+
+    def _ranges_since(self, start_ns: int) -> List[Tuple[int, int]]:
+        """Physical ranges holding rows with timestamp_ns >= start_ns (binary search per segment)."""
+        ranges = []
+        for start, stop in self._segments():
+            first = start + int(np.searchsorted(self.timestamp_ns[start:stop], start_ns, side='left'))
+            if first < stop:
+                ranges.append((first, stop))
+        return ranges
+
+    def columns_since(self, start_ns: int) -> Dict[str, np.ndarray]:
+        """Get the columns for every row at or after start_ns, oldest first.
+
+        Returns views when the window is contiguous in the ring and copies otherwise.
+        """
+        ranges = self._ranges_since(start_ns) or [(0, 0)]
+        columns = {}
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            if len(ranges) == 1:
+                start, stop = ranges[0]
+                columns[name] = column[start:stop]
+            else:
+                columns[name] = np.concatenate([column[start:stop] for start, stop in ranges])
+        return columns
+
+    def count_since(self, start_ns: int) -> int:
+        """Count rows at or after start_ns without copying anything."""
+        return sum(stop - start for start, stop in self._ranges_since(start_ns))
+
+    def materialize(self, columns: Dict[str, np.ndarray], index: int) -> ArbitrageOpportunity:
+        """Build the ArbitrageOpportunity for one row of a column window."""
+        buy_exchange, sell_exchange = self.pairs[columns['pair_id'][index]]
+        max_size_usd = float(columns['max_size_usd'][index])
+        return ArbitrageOpportunity(
+            buy_exchange=buy_exchange,
+            sell_exchange=sell_exchange,
+            symbol=self.symbols[columns['symbol_id'][index]],
+            buy_price=float(columns['buy_price'][index]),
+            sell_price=float(columns['sell_price'][index]),
+            spread_pct=float(columns['spread_pct'][index]),
+            profit_after_fees=float(columns['profit_after_fees'][index]),
+            timestamp=ns_to_datetime(int(columns['timestamp_ns'][index])),
+            confidence_score=float(columns['confidence_score'][index]),
+            max_size_usd=None if np.isnan(max_size_usd) else max_size_usd,
+            size_profits={
+                notional: float(profit)
+                for notional, profit in zip(self.notionals, columns['size_profit'][index])
+                if not np.isnan(profit)
+            } or None
+        )
+
+    def since(self, start_ns: int) -> List[ArbitrageOpportunity]:
+        """Materialize every opportunity at or after start_ns, oldest first."""
+        columns = self.columns_since(start_ns)
+        return [self.materialize(columns, i) for i in range(len(columns['timestamp_ns']))]
+
+    def best_since(self, start_ns: int) -> Optional[ArbitrageOpportunity]:
+        """Materialize only the most profitable opportunity at or after start_ns."""
+        columns = self.columns_since(start_ns)
+        if len(columns['profit_after_fees']) == 0:
+            return None
+        return self.materialize(columns, int(np.argmax(columns['profit_after_fees'])))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def __iter__(self) -> Iterator[ArbitrageOpportunity]:
+        columns = self.columns_since(np.iinfo(np.int64).min)
+        for i in range(len(columns['timestamp_ns'])):
+            yield self.materialize(columns, i)
+
+    def __getitem__(self, index: int) -> ArbitrageOpportunity:
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("opportunity index out of range")
+        row = (self.head - self.size + index) % self.capacity
+        columns = {name: getattr(self, name) for name in self.COLUMNS}
+        return self.materialize(columns, row)
@@ -0,0 +1,214 @@
+"""Incrementally maintained L2 order books.
+
+Each side is a PriceLadder: level keys and sizes in two flat array('d')
+buffers kept sorted so the best level is always the last element. Best-level
+reads are O(1), a level update is one bisect (O(log n)) plus a C-level
+memmove that is short because most updates land near the top of the book,
+and depth queries slice the buffers straight into NumPy. Nothing is
+allocated per update.
+
+OrderBook adds the sync protocol shared by every venue. Updates that arrive
+before a snapshot are buffered. A snapshot clears the book and replays the
+buffer, skipping what the snapshot already covers (by update id, or for
+venues without sequence numbers, by event time). After that an update must
+continue the venue's sequence; a gap marks the book unsynced until the next
+snapshot.
+"""
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import BOOK_MAX_LEVELS, BOOK_PENDING_UPDATES
+
+Level = Tuple[float, float]  # (price, size); size 0 removes the level
+
+
+class PriceLadder:
+    """One side of a book, best level last.
+
+    Keys are prices for bids and negated prices for asks, so both sides are
+    stored ascending and the best level (highest bid, lowest ask) is last.
+    """
+
+    __slots__ = ('sign', 'keys', 'sizes', 'max_levels')
+
+    def __init__(self, bids: bool, max_levels: int = BOOK_MAX_LEVELS):
+        self.sign = 1.0 if bids else -1.0
+        self.keys = array('d')
+        self.sizes = array('d')
+        self.max_levels = max_levels  # Worst levels beyond this are dropped
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def clear(self):
+        del self.keys[:]
+        del self.sizes[:]
+
+    def set(self, price: float, size: float):
+        """Set the size at one price level (0 removes it)."""
+        keys = self.keys
+        key = self.sign * price
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            if size > 0:
+                self.sizes[i] = size
+            else:
+                del keys[i]
+                del self.sizes[i]
+        elif size > 0:
+            keys.insert(i, key)
+            self.sizes.insert(i, size)
+            if len(keys) > self.max_levels:
+                del keys[0]
+                del self.sizes[0]
+
+    def load(self, levels: Iterable[Level]):
+        """Replace the side with a snapshot's levels (any order)."""
+        self.clear()
+        sign = self.sign
+        pairs = sorted((sign * price, size) for price, size in levels if size > 0)[-self.max_levels:]
+        self.keys.extend(key for key, _ in pairs)
+        self.sizes.extend(size for _, size in pairs)
+
+    def best(self) -> Optional[Level]:
+        """(price, size) of the best level, None when the side is empty."""
+        if not self.keys:
+            return None
+        return self.sign * self.keys[-1], self.sizes[-1]
+
+    def levels(self, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(prices, sizes) of the best n levels (all by default), best first."""
+        start = 0 if n is None else max(len(self.keys) - n, 0)
+        prices = np.frombuffer(self.keys[start:], dtype=np.float64)[::-1] * self.sign
+        sizes = np.frombuffer(self.sizes[start:], dtype=np.float64)[::-1].copy()
+        return prices, sizes
+
+    def cumulative_depth(self, n: Optional[int] = None) -> np.ndarray:
+        """Cumulative size through each of the best n levels, best first."""
+        return self.levels(n)[1].cumsum()
+
+    def size_within(self, price: float) -> float:
+        """Total size at prices at least as good as `price`."""
+        return sum(self.sizes[bisect_left(self.keys, self.sign * price):])
+
+
+class OrderBook:
+    """L2 book for one (exchange, symbol) with snapshot / sequence-gap handling."""
+
+    def __init__(self, exchange: str, symbol: str, max_levels: int = BOOK_MAX_LEVELS):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.bids = PriceLadder(bids=True, max_levels=max_levels)
+        self.asks = PriceLadder(bids=False, max_levels=max_levels)
+        self.synced = False  # False until a snapshot has been applied, and again after a gap
+        self.sequence = 0  # Last applied update id (0 = venue sends none)
+        self.timestamp_ns = 0  # Exchange event time of the last applied snapshot / update
+        self.snapshot_ns = 0  # Exchange event time of the last snapshot
+        self.pending = deque(maxlen=BOOK_PENDING_UPDATES)  # Updates received while unsynced
+        self.updates = 0
+        self.snapshots = 0
+        self.gaps = 0
+
+    def invalidate(self):
+        """Mark the book unsynced (e.g. the connection dropped); levels stay until the next snapshot."""
+        self.synced = False
+        self.pending.clear()
+
+    def apply_snapshot(self, bids: Iterable[Level], asks: Iterable[Level], sequence: int = 0, timestamp_ns: int = 0):
+        """Replace the book with a snapshot, then replay updates buffered since it was requested."""
+        self.bids.load(bids)
+        self.asks.load(asks)
+        self.sequence = sequence
+        self.timestamp_ns = self.snapshot_ns = timestamp_ns
+        self.synced = True
+        self.snapshots += 1
+        pending, self.pending = self.pending, deque(maxlen=BOOK_PENDING_UPDATES)
+        for update in pending:
+            if not self.apply_update(*update):
+                break
+
+    def apply_update(
+        self,
+        bids: List[Level],
+        asks: List[Level],
+        timestamp_ns: int = 0,
+        first_sequence: int = 0,
+        last_sequence: int = 0
+    ) -> bool:
+        """Apply one incremental update; False when it was buffered or revealed a gap.
+
+        Updates the snapshot already covers are skipped: last_sequence at or
+        below the book's sequence, or, for venues without sequence numbers,
+        an event time at or before the snapshot's.
+        """
+        if not self.synced:
+            self.pending.append((bids, asks, timestamp_ns, first_sequence, last_sequence))
+            return False
+        if last_sequence:
+            if last_sequence <= self.sequence:
+                return True
+            if self.sequence and first_sequence > self.sequence + 1:
+                self.gaps += 1
+                self.invalidate()
+                self.pending.append((bids, asks, timestamp_ns, first_sequence, last_sequence))
+                return False
+            self.sequence = last_sequence
+        elif timestamp_ns and timestamp_ns <= self.snapshot_ns:
+            return True
+
+        set_bid, set_ask = self.bids.set, self.asks.set
+        for price, size in bids:
+            set_bid(price, size)
+        for price, size in asks:
+            set_ask(price, size)
+        if timestamp_ns:
+            self.timestamp_ns = timestamp_ns
+        self.updates += 1
+        return True
+
+    def top(self) -> Tuple[float, float, float, float]:
+        """(bid, ask, bid_size, ask_size) at the top of the book (0.0 for an empty side)."""
+        bid = self.bids.best() or (0.0, 0.0)
+        ask = self.asks.best() or (0.0, 0.0)
+        return bid[0], ask[0], bid[1], ask[1]
+
+    def stats(self) -> dict:
+        return {
+            'synced': self.synced,
+            'bid_levels': len(self.bids),
+            'ask_levels': len(self.asks),
+            'updates': self.updates,
+            'snapshots': self.snapshots,
+            'gaps': self.gaps,
+            'pending': len(self.pending),
+        }
+
+
+class OrderBookSet:
+    """Every book maintained in this process, keyed by (exchange, normalized symbol)."""
+
+    def __init__(self, max_levels: int = BOOK_MAX_LEVELS):
+        self.max_levels = max_levels
+        self.books: Dict[Tuple[str, str], OrderBook] = {}
+
+    def book(self, exchange: str, symbol: str) -> OrderBook:
+        """The book for one pair, created empty (unsynced) on first use."""
+        key = (exchange, symbol)
+        book = self.books.get(key)
+        if book is None:
+            book = self.books[key] = OrderBook(exchange, symbol, self.max_levels)
+        return book
+
+    def get(self, exchange: str, symbol: str) -> Optional[OrderBook]:
+        return self.books.get((exchange, symbol))
+
+    def for_symbol(self, symbol: str) -> Dict[str, OrderBook]:
+        """Synced books for one symbol, by exchange."""
+        return {exchange: book for (exchange, sym), book in self.books.items() if sym == symbol and book.synced}
+
+    def stats(self) -> Dict[str, dict]:
+        return {f"{exchange} {symbol}": book.stats() for (exchange, symbol), book in self.books.items()}
@@ -0,0 +1,112 @@
+"""Preallocated struct-of-arrays ring buffer of price ticks for one symbol."""
+from typing import Dict, Iterator, List
+import numpy as np
+import pandas as pd
+
+from clock import ns_to_datetime, ns_to_datetime_index
+
+
+class PriceRingBuffer:
+    """Fixed-capacity tick history stored as NumPy columns.
+
+    Each column is allocated at twice the capacity and every tick is written
+    to slot i and its mirror i + capacity. The most recent `size` ticks are
+    then always one contiguous, chronologically ordered slice, so columns()
+    returns views with no copying or reordering, at the cost of two scalar
+    writes per column on append.
+
+    Exchanges are stored as small integer codes; `exchange_names` maps them
+    back. Iterating yields the old per-tick dicts for code that still wants them.
+    """
+
+    def __init__(self, symbol: str, capacity: int, exchange_names: List[str]):
+        self.symbol = symbol
+        self.capacity = capacity
+        self.exchange_names = exchange_names  # Shared, append-only list owned by the detector
+
+        self.timestamp_ns = np.zeros(2 * capacity, dtype=np.int64)
+        self.exchange_id = np.zeros(2 * capacity, dtype=np.int16)
+        self.price = np.zeros(2 * capacity)
+        self.bid = np.zeros(2 * capacity)
+        self.ask = np.zeros(2 * capacity)
+        self.volume = np.zeros(2 * capacity)
+
+        self.head = 0  # Next slot to write
+        self.size = 0
+
+    def append(
+        self,
+        timestamp_ns: int,
+        exchange_id: int,
+        price: float,
+        bid: float,
+        ask: float,
+        volume: float
+    ):
+        """Append one tick, overwriting the oldest when full. O(1)."""
+        i = self.head
+        j = i + self.capacity
+        self.timestamp_ns[i] = self.timestamp_ns[j] = timestamp_ns
+        self.exchange_id[i] = self.exchange_id[j] = exchange_id
+        self.price[i] = self.price[j] = price
+        self.bid[i] = self.bid[j] = bid
+        self.ask[i] = self.ask[j] = ask
+        self.volume[i] = self.volume[j] = volume
+
+        self.head = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def _window(self) -> slice:
+        """Slice of the mirrored arrays holding the retained ticks, oldest first."""
+        stop = self.head + self.capacity
+        return slice(stop - self.size, stop)
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Zero-copy views of every column in chronological order."""
+        window = self._window()
+        return {
+            'timestamp_ns': self.timestamp_ns[window],
+            'exchange_id': self.exchange_id[window],
+            'price': self.price[window],
+            'bid': self.bid[window],
+            'ask': self.ask[window],
+            'volume': self.volume[window],
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Build the historical-data DataFrame (same columns as the old dict buffer).
+
+        The DataFrame constructor copies the column views, so the frame stays valid
+        after the ring wraps.
+        """
+        if self.size == 0:
+            return pd.DataFrame()
+
+        cols = self.columns()
+        names = np.array(self.exchange_names, dtype=object)
+        return pd.DataFrame({
+            'exchange': names[cols['exchange_id']],
+            'symbol': self.symbol,
+            'price': cols['price'],
+            'timestamp': ns_to_datetime_index(cols['timestamp_ns']),
+            'bid': cols['bid'],
+            'ask': cols['ask'],
+            'volume': cols['volume'],
+        })
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[Dict]:
+        cols = self.columns()
+        for k in range(len(cols['price'])):
+            yield {
+                'exchange': self.exchange_names[cols['exchange_id'][k]],
+                'symbol': self.symbol,
+                'price': float(cols['price'][k]),
+                'timestamp': ns_to_datetime(int(cols['timestamp_ns'][k])),
+                'bid': float(cols['bid'][k]),
+                'ask': float(cols['ask'][k]),
+                'volume': float(cols['volume'][k])
+            }
@@ -0,0 +1,141 @@
+"""Replay recorded ticks through the production ingestion -> detection pipeline.
+
+Ticks from captured_data/prices_*.csv are fed in event-time order into
+MultiExchangeAggregator.on_price_update, exactly as an exchange client would
+deliver them, while a SimulatedClock follows the data. Staleness checks,
+opportunity timestamps and rolling windows all run on recorded time, so the
+same input always produces the same opportunities.
+
+--speed 1 replays in real time, --speed N at N x, --speed 0 as fast as the CPU allows.
+
+Usage: python replay.py [CSV ...] [--speed 0] [--batch] [--opportunities-out FILE]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Union
+
+import pandas as pd
+from loguru import logger
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from arbitrage_detector import ArbitrageDetector
+from clock import NS_PER_SECOND, SimulatedClock, iso8601_column_to_ns
+from config import PriceData, REPLAY_YIELD_EVERY
+from data_ingestion import MultiExchangeAggregator
+
+TICK_COLUMNS = ['exchange', 'symbol', 'price', 'volume', 'timestamp_ns', 'bid', 'ask']
+
+
+def load_ticks(paths: Iterable[Union[str, Path]]) -> pd.DataFrame:
+    """Read price CSVs into one frame sorted by event time (ties keep file order)."""
+    df = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+    df['timestamp_ns'] = iso8601_column_to_ns(df['timestamp'])
+    return df.sort_values('timestamp_ns', kind='stable', ignore_index=True)
+
+
+class ReplayDriver:
+    """Streams recorded ticks into an aggregator on simulated time."""
+
+    def __init__(
+        self,
+        aggregator: MultiExchangeAggregator,
+        clock: SimulatedClock,
+        speed: float = 0.0,
+        yield_every: int = REPLAY_YIELD_EVERY
+    ):
+        self.aggregator = aggregator
+        self.clock = clock
+        self.speed = speed  # Simulated seconds per real second; 0 = no pacing
+        self.yield_every = yield_every  # Ticks between event-loop yields when not sleeping
+
+    async def run(self, ticks: pd.DataFrame) -> dict:
+        """Replay every tick; return throughput figures for the run."""
+        aggregator, clock = self.aggregator, self.clock
+        delivery = None
+        if aggregator.queue is not None:
+            delivery = asyncio.create_task(aggregator.deliver_batches())
+
+        rows = zip(*(ticks[column].tolist() for column in TICK_COLUMNS))
+        first_ns = int(ticks['timestamp_ns'].iloc[0]) if len(ticks) else 0
+        started = time.perf_counter()
+        count = 0
+        for exchange, symbol, price, volume, timestamp_ns, bid, ask in rows:
+            if self.speed > 0:
+                delay = (timestamp_ns - first_ns) / NS_PER_SECOND / self.speed - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif count % self.yield_every == 0:
+                    await asyncio.sleep(0)
+            elif count % self.yield_every == 0:
+                await asyncio.sleep(0)  # Let batch delivery run, as it would between socket reads
+
+            clock.advance_to(timestamp_ns)
+            aggregator.on_price_update(PriceData(
+                exchange, symbol, price, volume, timestamp_ns, bid, ask, clock.monotonic_ns()
+            ))
+            count += 1
+
+        if delivery is not None:
+            delivery.cancel()
+            batch = aggregator.queue.drain()
+            if batch:
+                aggregator.batch_callback(batch)
+
+        elapsed = time.perf_counter() - started
+        simulated = (clock.wall_ns() - first_ns) / NS_PER_SECOND if count else 0.0
+        return {
+            'ticks': count,
+            'elapsed_seconds': elapsed,
+            'simulated_seconds': simulated,
+            'ticks_per_second': count / elapsed if elapsed > 0 else 0.0,
+            'speedup': simulated / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="*", type=Path, help="Recorded prices CSVs (default: all of captured_data/prices_*.csv)")
+    parser.add_argument("--speed", type=float, default=0.0, help="Replay speed multiple; 0 = as fast as possible")
+    parser.add_argument("--batch", action="store_true", help="Deliver through the conflating queue (main.py's path)")
+    parser.add_argument("--opportunities-out", type=Path, default=None, help="Write detected opportunities to this CSV")
+    parser.add_argument("--log-level", default="WARNING", help="Detector log level during the replay (per-episode logs are INFO)")
+    args = parser.parse_args()
+
+    paths = args.csv or sorted((Path(__file__).parent / "captured_data").glob("prices_*.csv"))
+    ticks = load_ticks(paths)
+    logger.info(f"Replaying {len(ticks):,} ticks from {len(paths)} file(s) at {'max' if args.speed <= 0 else f'{args.speed:g}x'} speed")
+
+    clock = SimulatedClock()
+    detector = ArbitrageDetector(clock=clock)
+    if args.batch:
+        aggregator = MultiExchangeAggregator(batch_callback=detector.update_prices)
+    else:
+        aggregator = MultiExchangeAggregator(detector.update_price)
+
+    logger.remove()
+    handler = logger.add(sys.stderr, level=args.log_level)
+    result = asyncio.run(ReplayDriver(aggregator, clock, speed=args.speed).run(ticks))
+    logger.remove(handler)
+    logger.add(sys.stderr, level="INFO")
+    stats = detector.get_statistics()
+
+    logger.info(
+        f"{result['ticks']:,} ticks in {result['elapsed_seconds']:.2f}s "
+        f"({result['ticks_per_second']:,.0f} ticks/s, {result['speedup']:,.0f}x real time)"
+    )
+    logger.info(
+        f"Opportunities: {stats['total_opportunities']:,} total, {stats['recent_count']:,} in the last hour, "
+        f"avg profit {stats['avg_profit']:.4f}%, {detector.episodes.total_closed:,} closed episodes"
+    )
+
+    if args.opportunities_out:
+        pd.DataFrame([o.to_dict() for o in detector.opportunities]).to_csv(args.opportunities_out, index=False)
+        logger.info(f"Wrote {len(detector.opportunities):,} opportunities to {args.opportunities_out}")
+
+
+if __name__ == "__main__":
+    main()
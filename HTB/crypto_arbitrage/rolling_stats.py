@@ -0,0 +1,111 @@
+"""Incremental windowed aggregates for constant-time detector statistics."""
+from collections import deque
+from typing import Dict, List, Tuple
+
+
+class RollingWindowStats:
+    """Count / sum / min / max over a sliding time window, updated per insert.
+
+    Count and sum are kept in fixed-width time buckets: a running total is
+    adjusted when a value is added and when a whole bucket falls out of the
+    window. Min and max use monotonic deques, so every value is pushed and
+    popped at most once. Both add() and expire() are amortized O(1), and the
+    read-side properties are O(1).
+    """
+
+    def __init__(self, window_seconds: float = 3600, bucket_seconds: float = 1.0):
+        self.window_ns = int(window_seconds * 1e9)
+        self.bucket_ns = int(bucket_seconds * 1e9)
+
+        self._buckets: deque = deque()  # [bucket start ns, count, sum], oldest first
+        self._min: deque = deque()  # (timestamp ns, value), values increasing
+        self._max: deque = deque()  # (timestamp ns, value), values decreasing
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, timestamp_ns: int, value: float):
+        """Add one observation (timestamps must be non-decreasing)."""
+        bucket_start = timestamp_ns - timestamp_ns % self.bucket_ns
+        if self._buckets and self._buckets[-1][0] == bucket_start:
+            bucket = self._buckets[-1]
+            bucket[1] += 1
+            bucket[2] += value
+        else:
+            self._buckets.append([bucket_start, 1, value])
+        self.count += 1
+        self.total += value
+
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((timestamp_ns, value))
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((timestamp_ns, value))
+
+    def expire(self, now_ns: int):
+        """Drop everything older than the window."""
+        cutoff = now_ns - self.window_ns
+
+        # A bucket leaves once it lies entirely before the cutoff
+        while self._buckets and self._buckets[0][0] + self.bucket_ns <= cutoff:
+            _, count, total = self._buckets.popleft()
+            self.count -= count
+            self.total -= total
+        if not self._buckets:
+            self.count, self.total = 0, 0.0
+
+        while self._min and self._min[0][0] < cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] < cutoff:
+            self._max.popleft()
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def min(self) -> float:
+        return self._min[0][1] if self._min else 0.0
+
+    @property
+    def max(self) -> float:
+        return self._max[0][1] if self._max else 0.0
+
+
+class TopKCounter:
+    """All-time counts per key with a maintained top-K list.
+
+    Counts only ever grow by one, so a key can only enter or move up in the
+    top K; each increment costs O(K) at worst instead of sorting every key.
+    """
+
+    def __init__(self, k: int = 5):
+        self.k = k
+        self.counts: Dict[str, int] = {}
+        self._top: List[Tuple[str, int]] = []  # (key, count), highest first
+
+    def increment(self, key: str):
+        """Add one to a key's count and update the top-K list."""
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+
+        for i, (top_key, _) in enumerate(self._top):
+            if top_key == key:
+                del self._top[i]
+                break
+        else:
+            if len(self._top) == self.k and count <= self._top[-1][1]:
+                return
+            if len(self._top) == self.k:
+                self._top.pop()
+
+        # Insert after every entry with an equal or higher count (earlier keys win ties)
+        position = len(self._top)
+        while position > 0 and self._top[position - 1][1] < count:
+            position -= 1
+        self._top.insert(position, (key, count))
+
+    def top(self) -> List[Tuple[str, int]]:
+        """Get the top-K (key, count) pairs, highest first."""
+        return list(self._top)
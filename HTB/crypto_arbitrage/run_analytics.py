@@ -1,10 +1,14 @@
 """Launch Analytics Dashboard on Port 8051"""
+import argparse
 import asyncio
 from loguru import logger
 
 from data_ingestion import MultiExchangeAggregator
 from arbitrage_detector import ArbitrageDetector
 from analytics_dashboard import AnalyticsDashboard
+from snapshot import SnapshotReader
+from sharded_detector import ShardedDetector, ShardedSnapshotReader, shard_snapshot_paths
+from config import DETECTOR_SHARDS, SNAPSHOT_PATH
 
 
 async def run_system():
@@ -17,9 +21,14 @@ async def run_system():
     logger.info("="*70)
 
     # Create components
-    detector = ArbitrageDetector()
+    if DETECTOR_SHARDS > 1:
+        detector = ShardedDetector()
+        detector.start()
+    else:
+        detector = ArbitrageDetector()
     aggregator = MultiExchangeAggregator(detector.update_price)
-    analytics = AnalyticsDashboard(detector)
+    detector.books = aggregator.books
+    analytics = AnalyticsDashboard(detector, health=aggregator.health)
 
     # Start data collection in background
     asyncio.create_task(aggregator.start())
@@ -29,8 +38,34 @@ async def run_system():
     analytics.run(host='0.0.0.0', port=8051, debug=False)
 
 
+def run_attached(snapshot_path: str, shards: int = 1):
+    """Serve the analytics dashboard from a running main.py's published snapshot (no ingestion here)."""
+    logger.info(f"🔬 Analytics dashboard attached to snapshot {snapshot_path}" + (f" ({shards} shards)" if shards > 1 else ""))
+    if shards > 1:
+        reader = ShardedSnapshotReader(shard_snapshot_paths(snapshot_path, shards))
+        analytics = AnalyticsDashboard(reader)  # Shards publish no feed health
+    else:
+        reader = SnapshotReader(snapshot_path)
+        analytics = AnalyticsDashboard(reader, health=reader)
+    logger.info("Starting analytics dashboard on http://0.0.0.0:8051")
+    analytics.run(host='0.0.0.0', port=8051, debug=False)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Launch the analytics dashboard")
+    parser.add_argument(
+        "--attach", nargs="?", const=SNAPSHOT_PATH, default=None, metavar="SNAPSHOT",
+        help=f"Read from a running main.py's snapshot instead of ingesting (default path: {SNAPSHOT_PATH})"
+    )
+    parser.add_argument(
+        "--shards", type=int, default=DETECTOR_SHARDS,
+        help=f"Detector shards main.py runs (merges SNAPSHOT.0 .. SNAPSHOT.<N-1>; default {DETECTOR_SHARDS})"
+    )
+    args = parser.parse_args()
     try:
-        asyncio.run(run_system())
+        if args.attach:
+            run_attached(args.attach, args.shards)
+        else:
+            asyncio.run(run_system())
     except KeyboardInterrupt:
         logger.info("\nShutting down analytics dashboard...")
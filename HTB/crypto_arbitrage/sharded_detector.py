@@ -0,0 +1,295 @@
+"""Symbol-sharded detection: one ArbitrageDetector per worker process.
+
+Pair opportunities for different symbols never interact, so symbols are
+hashed (crc32, the same in every process) onto DETECTOR_SHARDS workers:
+
+    ingesting process --tick--> SharedTickRing[shard] --> worker: ArbitrageDetector
+                                                           |
+    dashboards / bots <-- ShardedSnapshotReader <-- snapshot file per shard
+
+ShardedDetector is the ingesting side: update_price / update_prices route
+each tick into its shard's ring, and the query methods read the merged view.
+Each worker applies its ticks in batches (as update_prices), publishes its
+own snapshot (snapshot.py) every SNAPSHOT_PUBLISH_INTERVAL and hot-reloads
+fee overrides. ShardedSnapshotReader merges the shard snapshots into one
+view with ArbitrageDetector's query methods, from any process.
+
+Limits of the sharded mode: cycle search (cycle_engine.py) needs every pair
+in one process, so shards run without it (`has_cycles` is False), and cross
+pairs such as ETH-BTC, which only feed it, are not routed; order books stay
+in the ingesting process, so shards size opportunities on top-of-book depth;
+and tick history stays inside the workers, so the sharded views have no
+get_historical_data (`has_history` is False) and the spread predictor's
+training and predictions are switched off.
+"""
+import multiprocessing
+import signal
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+from config import (
+    PriceData, ArbitrageOpportunity, OpportunityEpisode, DETECTOR_SHARDS, DETECTOR_SHARD_START_TIMEOUT,
+    PAIR_QUOTE_ASSET, SNAPSHOT_PATH, SNAPSHOT_PUBLISH_INTERVAL, TICK_RING_CAPACITY, TICK_RING_POLL_SECONDS
+)
+from shm_ring import SharedTickRing, TICK_EXCHANGES, TICK_SYMBOLS, encode_ids
+from snapshot import SnapshotReader, SnapshotWriter, TOP_PAIRS
+
+FEE_RELOAD_SECONDS = 10  # Workers check the fee overrides file this often
+
+
+def shard_of(symbol: str, shards: int) -> int:
+    """Shard index for a normalized symbol (stable across processes, unlike hash())."""
+    return zlib.crc32(symbol.encode()) % shards
+
+
+def shard_snapshot_paths(path: str, shards: int) -> List[str]:
+    """Snapshot file of each shard, derived from the single-detector SNAPSHOT_PATH."""
+    return [f"{path}.{shard}" for shard in range(shards)]
+
+
+def run_detector_worker(shard: int, ring_name: str, ring_capacity: int, snapshot_path: str):
+    """Worker process entry point: detect on one shard's ticks and publish its snapshot."""
+    from arbitrage_detector import ArbitrageDetector
+
+    ring = SharedTickRing(ring_capacity, name=ring_name)
+    detector = ArbitrageDetector(cycle_detection=False)  # Cycles span symbols on other shards
+    writer = SnapshotWriter(snapshot_path)
+    writer.publish(detector)  # Readers can attach as soon as the file exists
+
+    running = [True]
+    signal.signal(signal.SIGTERM, lambda *_: running.__setitem__(0, False))
+    next_publish = next_fee_reload = time.monotonic()
+    dropped = 0
+    try:
+        while running[0]:
+            records = ring.read()
+            if len(records):
+                detector.update_prices([
+                    PriceData(
+                        TICK_EXCHANGES[exchange_id], TICK_SYMBOLS[symbol_id],
+                        price, volume, timestamp_ns, bid, ask, received_ns, bid_size, ask_size
+                    )
+                    for timestamp_ns, received_ns, price, volume, bid, ask, bid_size, ask_size, symbol_id, exchange_id
+                    in records.tolist()
+                ])
+            else:
+                time.sleep(TICK_RING_POLL_SECONDS)
+
+            now = time.monotonic()
+            if now >= next_publish:
+                writer.publish(detector)
+                next_publish = now + SNAPSHOT_PUBLISH_INTERVAL
+                if ring.dropped > dropped:
+                    logger.warning(f"Detector shard {shard} fell behind: {ring.dropped - dropped} ticks dropped")
+                    dropped = ring.dropped
+            if now >= next_fee_reload:
+                if detector.cost_model.reload_if_changed():
+                    logger.info(f"Detector shard {shard} reloaded fee overrides")
+                next_fee_reload = now + FEE_RELOAD_SECONDS
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+        ring.close()
+
+
+class ShardedSnapshotReader:
+    """Merged read-only view of every shard's snapshot, with ArbitrageDetector's query methods.
+
+    Symbols live on exactly one shard, so per-pair records never need
+    combining: opportunity and episode lists are concatenated in time order,
+    and the all-time top pairs are exact (each shard publishes its own top
+    TOP_PAIRS, and a pair's count is only ever on its shard).
+    """
+    has_history = False  # Tick history stays in the shard workers
+    has_cycles = False  # Shards run without cycle search, so get_recent_cycles is always empty
+
+    def __init__(self, paths: List[str]):
+        self.readers = [SnapshotReader(path) for path in paths]
+
+    @property
+    def publish_count(self) -> int:
+        return sum(reader.publish_count for reader in self.readers)
+
+    def get_latest_prices(self, symbol: str) -> Dict[str, PriceData]:
+        """Get latest prices for a symbol across all exchanges (from its shard)."""
+        return self.readers[shard_of(symbol, len(self.readers))].get_latest_prices(symbol)
+
+    def get_recent_opportunities(self, minutes: int = 5) -> List[ArbitrageOpportunity]:
+        """Get every shard's published opportunities from the last N minutes, oldest first."""
+        opportunities = [opp for reader in self.readers for opp in reader.get_recent_opportunities(minutes)]
+        opportunities.sort(key=lambda opp: opp.timestamp)
+        return opportunities
+
+    def get_best_opportunity(self, minutes: int = 1) -> Optional[ArbitrageOpportunity]:
+        """Get the most profitable published opportunity in the last N minutes, across shards."""
+        best = [opp for opp in (reader.get_best_opportunity(minutes) for reader in self.readers) if opp is not None]
+        return max(best, key=lambda opp: opp.profit_after_fees, default=None)
+
+    def get_recent_episodes(self, minutes: int = 60) -> List[OpportunityEpisode]:
+        """Every shard's closed episodes that ended in the last N minutes, oldest first."""
+        episodes = [episode for reader in self.readers for episode in reader.get_recent_episodes(minutes)]
+        episodes.sort(key=lambda episode: episode.end_ns)
+        return episodes
+
+    def get_recent_cycles(self, minutes: int = 5) -> List[ArbitrageOpportunity]:
+        """Every shard's published cycle opportunities from the last N minutes, oldest first."""
+        cycles = [opp for reader in self.readers for opp in reader.get_recent_cycles(minutes)]
+        cycles.sort(key=lambda opp: opp.timestamp)
+        return cycles
+
+    def get_statistics(self) -> Dict:
+        """Combined detection statistics (same shape as ArbitrageDetector.get_statistics)."""
+        shards = [reader.get_statistics() for reader in self.readers]
+        total = sum(stats['total_opportunities'] for stats in shards)
+        cycles = {key: sum(stats[key] for stats in shards) for key in ('total_cycles', 'recent_cycles')}
+        active = [stats for stats in shards if stats['recent_count']]
+        if not active:
+            return {
+                'total_opportunities': total, 'recent_count': 0, 'avg_profit': 0, 'max_profit': 0, 'top_pairs': [],
+                **cycles
+            }
+
+        recent_count = sum(stats['recent_count'] for stats in active)
+        top_pairs = sorted(
+            (pair for stats in shards for pair in stats['top_pairs']), key=lambda pair: pair['count'], reverse=True
+        )
+        return {
+            'total_opportunities': total,
+            'recent_count': recent_count,
+            'avg_profit': sum(stats['avg_profit'] * stats['recent_count'] for stats in active) / recent_count,
+            'max_profit': max(stats['max_profit'] for stats in active),
+            'min_profit': min(stats['min_profit'] for stats in active),
+            'top_pairs': top_pairs[:TOP_PAIRS],
+            **cycles
+        }
+
+    def close(self):
+        for reader in self.readers:
+            reader.close()
+
+
+class ShardedDetector:
+    """Drop-in for ArbitrageDetector on the ingesting side, with detection spread over worker processes.
+
+    Call start() before feeding ticks and stop() on shutdown. Ticks for
+    symbols outside SYMBOL_MAPPINGS cannot be encoded for the rings and are
+    dropped with a warning.
+    """
+    has_history = False  # Tick history stays in the shard workers
+    has_cycles = False  # Shards run without cycle search
+
+    def __init__(
+        self,
+        shards: int = DETECTOR_SHARDS,
+        ring_capacity: int = TICK_RING_CAPACITY,
+        snapshot_path: str = SNAPSHOT_PATH
+    ):
+        self.shards = shards
+        self.ring_capacity = ring_capacity
+        self.snapshot_paths = shard_snapshot_paths(snapshot_path, shards)
+        self.workers: List[Tuple[multiprocessing.Process, SharedTickRing]] = []
+        self.view: Optional[ShardedSnapshotReader] = None
+        self.books = None  # Accepted for symmetry with ArbitrageDetector; shards size on top-of-book depth
+        self._routes: Dict[Tuple[str, str], Tuple[SharedTickRing, int, int]] = {}  # {(exchange, symbol): (ring, exchange id, symbol id)}
+        self._unmapped = set()
+
+    def start(self, timeout: float = DETECTOR_SHARD_START_TIMEOUT):
+        """Spawn one detector worker (and tick ring) per shard; return once every shard has published."""
+        for path in self.snapshot_paths:
+            Path(path).unlink(missing_ok=True)  # A stale file would be truncated under a reader's mapping
+
+        context = multiprocessing.get_context("spawn")
+        for shard, path in enumerate(self.snapshot_paths):
+            ring = SharedTickRing(self.ring_capacity)
+            process = context.Process(
+                target=run_detector_worker,
+                args=(shard, ring.name, self.ring_capacity, path),
+                name=f"detector-shard-{shard}",
+                daemon=True
+            )
+            process.start()
+            self.workers.append((process, ring))
+            logger.info(f"Started detector shard {shard} (pid {process.pid})")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self.view = ShardedSnapshotReader(self.snapshot_paths)
+                break
+            except (FileNotFoundError, ValueError):  # Not created yet / layout not written yet
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise TimeoutError(f"Detector shards did not publish within {timeout}s")
+                time.sleep(0.05)
+
+    def update_price(self, price_data: PriceData):
+        """Hand one tick to its symbol's shard."""
+        key = (price_data.exchange, price_data.symbol)
+        route = self._routes.get(key)
+        if route is None:
+            if price_data.symbol.partition('-')[2] != PAIR_QUOTE_ASSET:
+                return  # Cross pairs only feed cycle search, which shards do not run
+            exchange_id, symbol_id = encode_ids(price_data.exchange, price_data.symbol)
+            if exchange_id < 0 or symbol_id < 0:
+                if key not in self._unmapped:
+                    self._unmapped.add(key)
+                    logger.warning(f"Not routing {price_data.symbol} from {price_data.exchange}: not in the tick id tables")
+                return
+            ring = self.workers[shard_of(price_data.symbol, self.shards)][1]
+            route = self._routes[key] = (ring, exchange_id, symbol_id)
+
+        ring, exchange_id, symbol_id = route
+        ring.write(
+            exchange_id, symbol_id, price_data.price, price_data.volume,
+            price_data.timestamp_ns, price_data.bid, price_data.ask, price_data.received_ns,
+            price_data.bid_size, price_data.ask_size
+        )
+
+    def update_prices(self, batch: Iterable[PriceData]):
+        """Hand a batch of ticks to their shards (each shard checks its symbols once per read)."""
+        for price_data in batch:
+            self.update_price(price_data)
+
+    def stop(self):
+        """Stop the workers and free their rings."""
+        if self.view is not None:
+            self.view.close()
+            self.view = None
+        for process, ring in self.workers:
+            process.terminate()
+            process.join(timeout=5)
+            ring.close()
+            ring.unlink()
+        self.workers = []
+
+    def get_worker_stats(self) -> dict:
+        """Per-shard worker liveness and ticks routed to it."""
+        return {
+            f"shard-{shard}": {'alive': process.is_alive(), 'routed': ring.written}
+            for shard, (process, ring) in enumerate(self.workers)
+        }
+
+    # Queries read the shards' merged snapshots (at most SNAPSHOT_PUBLISH_INTERVAL old)
+
+    def get_latest_prices(self, symbol: str) -> Dict[str, PriceData]:
+        return self.view.get_latest_prices(symbol)
+
+    def get_recent_opportunities(self, minutes: int = 5) -> List[ArbitrageOpportunity]:
+        return self.view.get_recent_opportunities(minutes)
+
+    def get_best_opportunity(self) -> Optional[ArbitrageOpportunity]:
+        return self.view.get_best_opportunity()
+
+    def get_recent_cycles(self, minutes: int = 5) -> List[ArbitrageOpportunity]:
+        return self.view.get_recent_cycles(minutes)
+
+    def get_recent_episodes(self, minutes: int = 60) -> List[OpportunityEpisode]:
+        return self.view.get_recent_episodes(minutes)
+
+    def get_statistics(self) -> Dict:
+        return self.view.get_statistics()
@@ -0,0 +1,152 @@
+"""Single-producer / single-consumer tick ring in shared memory.
+
+Used by the multi-process ingestion mode: each exchange worker process owns
+one ring and writes fixed-size tick records into it; the detector process
+reads them straight out of the shared buffer, with no pickling or pipes.
+
+Platform: publishing is plain stores (record, then count) with no memory
+barriers, which is only safe under x86's total store order. On weakly
+ordered CPUs (ARM, POWER) a reader could see the new count before the
+record bytes, so the ring (and snapshot.py's seqlock, which relies on the
+same ordering) refuses to start there; see require_total_store_order.
+"""
+import platform
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import EXCHANGE_CONFIGS, SYMBOL_MAPPINGS
+
+# Fixed record layout; symbols and exchanges travel as small integer codes
+TICK_DTYPE = np.dtype([
+    ('timestamp_ns', '<i8'),
+    ('received_ns', '<i8'),
+    ('price', '<f8'),
+    ('volume', '<f8'),
+    ('bid', '<f8'),
+    ('ask', '<f8'),
+    ('bid_size', '<f8'),
+    ('ask_size', '<f8'),
+    ('symbol_id', '<i4'),
+    ('exchange_id', '<i4'),
+])
+HEADER_BYTES = 64  # Write counter (uint64) on its own cache line
+
+TICK_SYMBOLS: List[str] = list(dict.fromkeys(SYMBOL_MAPPINGS.values()))  # {symbol id: normalized symbol}
+TICK_EXCHANGES: List[str] = [config.name for config in EXCHANGE_CONFIGS.values()]  # {exchange id: name}
+_SYMBOL_IDS = {symbol: i for i, symbol in enumerate(TICK_SYMBOLS)}
+_EXCHANGE_IDS = {exchange: i for i, exchange in enumerate(TICK_EXCHANGES)}
+TOTAL_STORE_ORDER_MACHINES = {"x86_64", "amd64", "x86", "i386", "i686"}  # platform.machine(), lowercased
+
+
+def require_total_store_order():
+    """Raise RuntimeError unless this CPU keeps stores in program order for other cores (x86)."""
+    machine = platform.machine().lower()
+    if machine not in TOTAL_STORE_ORDER_MACHINES:
+        raise RuntimeError(
+            f"Shared-memory tick rings and snapshots need an x86 host (total store order); "
+            f"this is {machine or 'an unknown machine'}"
+        )
+
+
+class SharedTickRing:
+    """Fixed-capacity ring of TICK_DTYPE records in a SharedMemory block.
+
+    The producer writes a record into slot count % capacity, then publishes
+    it by storing count + 1 in the header. The consumer keeps its own read
+    count and copies everything between the two. On x86 (total store order)
+    a reader never sees a published count before the record it covers; the
+    constructor refuses other machines. If the consumer falls more than
+    `capacity` records behind, the overwritten records are skipped and
+    counted in `dropped`.
+    """
+
+    def __init__(self, capacity: int, name: Optional[str] = None):
+        """Create a new ring (name=None) or attach to an existing one by name.
+
+        Attach from processes started by the creator via multiprocessing, so
+        they share its resource tracker and do not unlink the block on exit.
+        """
+        require_total_store_order()
+        self.capacity = capacity
+        size = HEADER_BYTES + capacity * TICK_DTYPE.itemsize
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self._count = np.ndarray((1,), dtype=np.uint64, buffer=self.shm.buf)
+        self.records = np.ndarray((capacity,), dtype=TICK_DTYPE, buffer=self.shm.buf, offset=HEADER_BYTES)
+        if name is None:
+            self._count[0] = 0
+
+        self.written = int(self._count[0])  # Producer side: records published
+        self.read_count = self.written  # Consumer side: records consumed
+        self.dropped = 0  # Consumer side: records overwritten before they were read
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(
+        self,
+        exchange_id: int,
+        symbol_id: int,
+        price: float,
+        volume: float,
+        timestamp_ns: int,
+        bid: float,
+        ask: float,
+        received_ns: int,
+        bid_size: float = 0.0,
+        ask_size: float = 0.0
+    ):
+        """Append one record and publish it (producer only)."""
+        self.records[self.written % self.capacity] = (
+            timestamp_ns, received_ns, price, volume, bid, ask, bid_size, ask_size, symbol_id, exchange_id
+        )
+        self.written += 1
+        self._count[0] = self.written
+
+    def read(self, max_records: Optional[int] = None) -> np.ndarray:
+        """Copy out every record published since the last read, oldest first (consumer only)."""
+        available = int(self._count[0])
+        start = self.read_count
+        if available - start > self.capacity:
+            self.dropped += available - self.capacity - start
+            start = available - self.capacity
+        if max_records is not None:
+            available = min(available, start + max_records)
+        if available == start:
+            return np.empty(0, dtype=TICK_DTYPE)
+
+        first, last = start % self.capacity, available % self.capacity
+        if first < last:
+            batch = self.records[first:last].copy()
+        else:
+            batch = np.concatenate([self.records[first:], self.records[:last]])
+
+        # Records the producer may have started overwriting while we copied (it writes
+        # record k + capacity into k's slot before publishing count k + capacity + 1)
+        lapped = int(self._count[0]) + 1 - self.capacity - start
+        if lapped > 0:
+            self.dropped += lapped
+            batch = batch[lapped:]
+        self.read_count = available
+        return batch
+
+    def close(self):
+        """Detach from the shared block (both sides)."""
+        self._count = None
+        self.records = None
+        self.shm.close()
+
+    def unlink(self):
+        """Free the shared block (creator only, after every side has closed)."""
+        self.shm.unlink()
+
+
+def encode_ids(exchange: str, symbol: str) -> Tuple[int, int]:
+    """Exchange and symbol codes for a tick record (-1 when unknown)."""
+    return _EXCHANGE_IDS.get(exchange, -1), _SYMBOL_IDS.get(symbol, -1)
@@ -0,0 +1,570 @@
+"""Seqlock-protected, memory-mapped snapshot of detector state for other processes.
+
+The ingesting process periodically publishes a fixed-layout file holding:
+
+- a [symbol, exchange] top-of-book table,
+- a ring of recent opportunities,
+- a ring of recently closed episodes,
+- a ring of recent multi-leg cycle opportunities (with their legs),
+- the summary statistics,
+- the exchange feed health records (health.HEALTH_DTYPE, TICK_EXCHANGES order).
+
+Dashboards and bots map it read-only through SnapshotReader, which offers the
+same query methods the dashboards call on ArbitrageDetector. Any number of
+readers can attach without touching the ingestion loop.
+
+Seqlock protocol: the writer makes `seq` odd, writes, then makes it even.
+A reader copies what it needs between two reads of `seq` and retries if
+`seq` was odd or changed. Like shm_ring, this relies on x86's total store
+order (no explicit barriers), so writers and readers refuse other machines.
+"""
+import mmap
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from clock import datetime_to_ns, monotonic_ns, ns_to_datetime
+from config import (
+    PriceData, ArbitrageOpportunity, CycleLeg, OpportunityEpisode,
+    SNAPSHOT_MAX_SYMBOLS, SNAPSHOT_MAX_EXCHANGES, SNAPSHOT_OPPORTUNITY_CAPACITY, SNAPSHOT_EPISODE_CAPACITY,
+    SNAPSHOT_CYCLE_CAPACITY, CYCLE_MAX_LEGS, DEPTH_NOTIONALS_USD
+)
+from health import HEALTH_DTYPE, summarize
+from shm_ring import TICK_EXCHANGES, TICK_SYMBOLS, require_total_store_order
+
+MAGIC = b"ARBSNAP5"
+TOP_PAIRS = 5
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('seq', '<u8'),  # Odd while a publish is in progress
+    ('publish_count', '<u8'),
+    ('published_ns', '<i8'),  # Wall-clock epoch ns of the last publish
+    ('max_symbols', '<u4'),
+    ('max_exchanges', '<u4'),
+    ('opportunity_capacity', '<u4'),
+    ('episode_capacity', '<u4'),
+    ('cycle_capacity', '<u4'),
+    ('symbol_count', '<u4'),
+    ('exchange_count', '<u4'),
+    ('opportunities_written', '<u8'),
+    ('episodes_written', '<u8'),
+    ('cycles_written', '<u8'),
+    ('health_count', '<u4'),  # 0 = no health registry published
+    ('cycle_detection', 'u1'),  # 1 = the publishing detector searches cycles
+])
+QUOTE_DTYPE = np.dtype([
+    ('price', '<f8'), ('bid', '<f8'), ('ask', '<f8'), ('volume', '<f8'), ('bid_size', '<f8'), ('ask_size', '<f8'),
+    ('timestamp_ns', '<i8'), ('received_ns', '<i8'),  # timestamp_ns 0 = no quote yet
+])
+STATS_DTYPE = np.dtype([
+    ('total_opportunities', '<u8'), ('recent_count', '<u8'),
+    ('avg_profit', '<f8'), ('max_profit', '<f8'), ('min_profit', '<f8'),
+    ('top_pair', 'S64', (TOP_PAIRS,)), ('top_count', '<u8', (TOP_PAIRS,)),
+    ('total_cycles', '<u8'), ('recent_cycles', '<u8'),
+])
+OPPORTUNITY_DTYPE = np.dtype([
+    ('timestamp_ns', '<i8'), ('symbol_id', '<i4'), ('buy_id', '<i2'), ('sell_id', '<i2'),
+    ('buy_price', '<f8'), ('sell_price', '<f8'), ('spread_pct', '<f8'),
+    ('profit_after_fees', '<f8'), ('confidence_score', '<f8'),
+    ('max_size_usd', '<f8'), ('size_profit', '<f8', (len(DEPTH_NOTIONALS_USD),)),  # NaN = no depth known
+])
+EPISODE_DTYPE = np.dtype([
+    ('start_ns', '<i8'), ('end_ns', '<i8'), ('symbol_id', '<i4'), ('buy_id', '<i2'), ('sell_id', '<i2'),
+    ('peak_profit', '<f8'), ('avg_profit', '<f8'), ('tick_count', '<i8'), ('close_reason', 'S8'),
+])
+CYCLE_LEG_DTYPE = np.dtype([
+    ('exchange_id', '<i2'), ('to_exchange_id', '<i2'), ('symbol', 'S16'), ('side', 'S8'),
+    ('price', '<f8'), ('rate', '<f8'),
+])
+CYCLE_DTYPE = np.dtype([
+    ('timestamp_ns', '<i8'), ('path', 'S64'), ('gross', '<f8'), ('spread_pct', '<f8'), ('profit_after_fees', '<f8'),
+    ('leg_count', '<u1'), ('legs', CYCLE_LEG_DTYPE, (CYCLE_MAX_LEGS,)),
+])
+NAME_DTYPE = np.dtype('S32')
+
+
+class _SnapshotLayout:
+    """Offsets of every section in the file, and NumPy views onto a buffer."""
+
+    def __init__(
+        self, max_symbols: int, max_exchanges: int, opportunity_capacity: int, episode_capacity: int, cycle_capacity: int
+    ):
+        self.sections = [
+            ('header', HEADER_DTYPE, (1,)),
+            ('symbols', NAME_DTYPE, (max_symbols,)),
+            ('exchanges', NAME_DTYPE, (max_exchanges,)),
+            ('quotes', QUOTE_DTYPE, (max_symbols, max_exchanges)),
+            ('stats', STATS_DTYPE, (1,)),
+            ('opportunities', OPPORTUNITY_DTYPE, (opportunity_capacity,)),
+            ('episodes', EPISODE_DTYPE, (episode_capacity,)),
+            ('cycles', CYCLE_DTYPE, (cycle_capacity,)),
+            ('health', HEALTH_DTYPE, (len(TICK_EXCHANGES),)),
+        ]
+        self.offsets = {}
+        offset = 0
+        for name, dtype, shape in self.sections:
+            offset = (offset + 63) // 64 * 64  # Cache-line align every section
+            self.offsets[name] = offset
+            offset += dtype.itemsize * int(np.prod(shape))
+        self.size = offset
+
+    def views(self, buffer) -> Dict[str, np.ndarray]:
+        return {
+            name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=self.offsets[name])
+            for name, dtype, shape in self.sections
+        }
+
+
+class SnapshotWriter:
+    """Publishes an ArbitrageDetector's state into a memory-mapped snapshot file.
+
+    Call publish() from the ingesting process's event loop (between ticks),
+    e.g. a few times per second; it only copies what changed since the last
+    publish for the two rings.
+
+    The id tables cover every configured symbol and exchange by default.
+    Opportunities, episodes and cycles of a symbol or exchange beyond them are not
+    published (they cannot be labelled) and are counted in `unpublished`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_symbols: Optional[int] = None,
+        max_exchanges: Optional[int] = None,
+        opportunity_capacity: int = SNAPSHOT_OPPORTUNITY_CAPACITY,
+        episode_capacity: int = SNAPSHOT_EPISODE_CAPACITY,
+        cycle_capacity: int = SNAPSHOT_CYCLE_CAPACITY
+    ):
+        require_total_store_order()
+        if max_symbols is None:
+            max_symbols = max(SNAPSHOT_MAX_SYMBOLS, len(TICK_SYMBOLS))
+        if max_exchanges is None:
+            max_exchanges = max(SNAPSHOT_MAX_EXCHANGES, len(TICK_EXCHANGES))
+        self.path = Path(path)
+        self.layout = _SnapshotLayout(max_symbols, max_exchanges, opportunity_capacity, episode_capacity, cycle_capacity)
+        with open(self.path, 'wb') as f:
+            f.truncate(self.layout.size)
+        self._file = open(self.path, 'r+b')
+        self._mmap = mmap.mmap(self._file.fileno(), self.layout.size)
+        self.views = self.layout.views(self._mmap)
+
+        header = self.views['header']
+        header['max_symbols'] = max_symbols
+        header['max_exchanges'] = max_exchanges
+        header['opportunity_capacity'] = opportunity_capacity
+        header['episode_capacity'] = episode_capacity
+        header['cycle_capacity'] = cycle_capacity
+        header['magic'] = MAGIC  # Last: readers refuse the file until the layout fields are set
+
+        self._opportunities_published = 0  # detector.opportunities.total_appended at last publish
+        self._episodes_published = 0  # detector.episodes.total_closed at last publish
+        self._cycles_published = 0  # detector.total_cycles_found at last publish
+        self.unpublished = 0  # Opportunities / episodes / cycles skipped for a symbol or exchange past the id tables
+
+    def publish(self, detector, health=None):
+        """Copy the detector's current state (and a HealthRegistry's records) into the snapshot under the seqlock."""
+        views = self.views
+        header = views['header']
+        symbols = detector.spread_engine.symbols[:len(views['symbols'])]
+        exchanges = detector.exchange_names[:len(views['exchanges'])]
+        symbol_ids = {symbol: i for i, symbol in enumerate(symbols)}
+        exchange_ids = {exchange: i for i, exchange in enumerate(exchanges)}
+        stats = detector.get_statistics()
+
+        header['seq'] += 1
+        try:
+            views['symbols'][:len(symbols)] = [s.encode() for s in symbols]
+            views['exchanges'][:len(exchanges)] = [e.encode() for e in exchanges]
+            header['symbol_count'] = len(symbols)
+            header['exchange_count'] = len(exchanges)
+
+            self._publish_quotes(detector, symbols, len(exchanges))
+            self._publish_opportunities(detector.opportunities, symbol_ids, exchange_ids)
+            self._publish_episodes(detector.episodes, symbol_ids, exchange_ids)
+            self._publish_cycles(detector, exchange_ids)
+            self._publish_stats(stats, detector.total_opportunities_found)
+            if health is not None:
+                views['health'][:] = health.records
+                header['health_count'] = len(health.records)
+
+            header['publish_count'] += 1
+            header['published_ns'] = time.time_ns()
+        finally:
+            header['seq'] += 1
+
+    def _publish_quotes(self, detector, symbols: List[str], exchange_count: int):
+        quotes = self.views['quotes']
+        for row, symbol in enumerate(symbols):
+            slots = detector.symbol_slots.get(symbol, [])
+            for col in range(min(exchange_count, len(slots))):
+                price_data = slots[col]
+                if price_data is not None:
+                    quotes[row, col] = (
+                        price_data.price, price_data.bid, price_data.ask, price_data.volume,
+                        price_data.bid_size, price_data.ask_size, price_data.timestamp_ns, price_data.received_ns
+                    )
+
+    def _publish_opportunities(self, store, symbol_ids: Dict[str, int], exchange_ids: Dict[str, int]):
+        ring = self.views['opportunities']
+        header = self.views['header']
+        new = min(store.total_appended - self._opportunities_published, store.size, len(ring))
+        self._opportunities_published = store.total_appended
+        if new <= 0:
+            return
+
+        rows = (store.head - new + np.arange(new)) % store.capacity  # Physical rows, oldest first
+        symbol_map = np.array([symbol_ids.get(s, -1) for s in store.symbols], dtype=np.int32)
+        buy_map = np.array([exchange_ids.get(b, -1) for b, _ in store.pairs], dtype=np.int16)
+        sell_map = np.array([exchange_ids.get(s, -1) for _, s in store.pairs], dtype=np.int16)
+
+        symbol_id = symbol_map[store.symbol_id[rows]]
+        buy_id, sell_id = buy_map[store.pair_id[rows]], sell_map[store.pair_id[rows]]
+        known = (symbol_id >= 0) & (buy_id >= 0) & (sell_id >= 0)
+        if not known.all():
+            self._count_unpublished(int(np.count_nonzero(~known)), "opportunities")
+            rows, symbol_id, buy_id, sell_id = rows[known], symbol_id[known], buy_id[known], sell_id[known]
+            new = len(rows)
+
+        written = int(header['opportunities_written'][0])
+        slots = (written + np.arange(new)) % len(ring)
+        ring['timestamp_ns'][slots] = store.timestamp_ns[rows]
+        ring['symbol_id'][slots] = symbol_id
+        ring['buy_id'][slots] = buy_id
+        ring['sell_id'][slots] = sell_id
+        for column in ('buy_price', 'sell_price', 'spread_pct', 'profit_after_fees', 'confidence_score',
+                       'max_size_usd', 'size_profit'):
+            ring[column][slots] = getattr(store, column)[rows]
+        header['opportunities_written'] = written + new
+
+    def _publish_episodes(self, tracker, symbol_ids: Dict[str, int], exchange_ids: Dict[str, int]):
+        ring = self.views['episodes']
+        header = self.views['header']
+        closed = list(tracker.closed)
+        new = min(tracker.total_closed - self._episodes_published, len(closed), len(ring))
+        self._episodes_published = tracker.total_closed
+        if new <= 0:
+            return
+
+        written = int(header['episodes_written'][0])
+        skipped = 0
+        for episode in closed[-new:]:
+            ids = (
+                symbol_ids.get(episode.symbol, -1),
+                exchange_ids.get(episode.buy_exchange, -1), exchange_ids.get(episode.sell_exchange, -1)
+            )
+            if min(ids) < 0:
+                skipped += 1
+                continue
+            ring[written % len(ring)] = (
+                episode.start_ns, episode.end_ns, *ids,
+                episode.peak_profit, episode.avg_profit, episode.tick_count, episode.close_reason.encode()
+            )
+            written += 1
+        header['episodes_written'] = written
+        if skipped:
+            self._count_unpublished(skipped, "episodes")
+
+    def _publish_cycles(self, detector, exchange_ids: Dict[str, int]):
+        ring = self.views['cycles']
+        header = self.views['header']
+        header['cycle_detection'] = detector.has_cycles
+        history = list(detector.cycle_opportunities)
+        new = min(detector.total_cycles_found - self._cycles_published, len(history), len(ring))
+        self._cycles_published = detector.total_cycles_found
+        if new <= 0:
+            return
+
+        written = int(header['cycles_written'][0])
+        skipped = 0
+        for opp in history[-new:]:
+            legs = np.zeros(CYCLE_MAX_LEGS, dtype=CYCLE_LEG_DTYPE)
+            legs[:len(opp.legs)] = [
+                (exchange_ids.get(leg.exchange, -1), exchange_ids.get(leg.to_exchange, -1),
+                 leg.symbol.encode(), leg.side.encode(), leg.price, leg.rate)
+                for leg in opp.legs
+            ]
+            if min(legs['exchange_id'].min(), legs['to_exchange_id'].min()) < 0:
+                skipped += 1
+                continue
+            ring[written % len(ring)] = (
+                datetime_to_ns(opp.timestamp), opp.symbol.encode(), opp.sell_price,
+                opp.spread_pct, opp.profit_after_fees, len(opp.legs), legs
+            )
+            written += 1
+        header['cycles_written'] = written
+        if skipped:
+            self._count_unpublished(skipped, "cycles")
+
+    def _count_unpublished(self, count: int, what: str):
+        if not self.unpublished:
+            logger.warning(
+                f"Snapshot {self.path} skipping {what} of symbols / exchanges past its id tables "
+                f"({len(self.views['symbols'])} symbols, {len(self.views['exchanges'])} exchanges)"
+            )
+        self.unpublished += count
+
+    def _publish_stats(self, stats: Dict, total_opportunities: int):
+        record = self.views['stats']
+        record['total_opportunities'] = total_opportunities
+        record['recent_count'] = stats.get('recent_count', 0)
+        record['avg_profit'] = stats.get('avg_profit', 0.0)
+        record['max_profit'] = stats.get('max_profit', 0.0)
+        record['min_profit'] = stats.get('min_profit', 0.0)
+        top_pairs = stats.get('top_pairs', [])[:TOP_PAIRS]
+        record['top_pair'][0] = [p['pair'].encode()[:64] for p in top_pairs] + [b''] * (TOP_PAIRS - len(top_pairs))
+        record['top_count'][0] = [p['count'] for p in top_pairs] + [0] * (TOP_PAIRS - len(top_pairs))
+        record['total_cycles'] = stats.get('total_cycles', 0)
+        record['recent_cycles'] = stats.get('recent_cycles', 0)
+
+    def close(self):
+        self.views = None
+        self._mmap.close()
+        self._file.close()
+
+
+class SnapshotReader:
+    """Read-only view of a published snapshot with ArbitrageDetector's query methods.
+
+    Every query takes its own consistent copy, so one reader can be shared by
+    dashboard callbacks running in different threads. Tick history is not
+    part of the snapshot, so there is no get_historical_data.
+    """
+    has_history = False
+
+    def __init__(self, path: str, max_retries: int = 1000):
+        require_total_store_order()
+        self.path = Path(path)
+        self.max_retries = max_retries
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = np.ndarray((1,), dtype=HEADER_DTYPE, buffer=self._mmap)[0]
+        if header['magic'] != MAGIC:
+            raise ValueError(f"{path} is not an arbitrage snapshot (or is still being created)")
+        self.layout = _SnapshotLayout(
+            int(header['max_symbols']), int(header['max_exchanges']),
+            int(header['opportunity_capacity']), int(header['episode_capacity']), int(header['cycle_capacity'])
+        )
+        self.views = self.layout.views(self._mmap)
+
+    def _consistent(self, copy: Callable[[Dict[str, np.ndarray]], object]):
+        """Run copy(views) until it completes without a concurrent publish."""
+        seq = self.views['header']['seq']
+        for _ in range(self.max_retries):
+            before = int(seq[0])
+            if before % 2:
+                time.sleep(0)
+                continue
+            result = copy(self.views)
+            if int(seq[0]) == before:
+                return result
+        raise TimeoutError(f"Could not read a consistent snapshot from {self.path}")
+
+    @staticmethod
+    def _names(views) -> Tuple[List[str], List[str]]:
+        header = views['header'][0]
+        symbols = [s.decode() for s in views['symbols'][:int(header['symbol_count'])]]
+        exchanges = [e.decode() for e in views['exchanges'][:int(header['exchange_count'])]]
+        return symbols, exchanges
+
+    @staticmethod
+    def _ring_tail(ring: np.ndarray, written: int) -> np.ndarray:
+        """Copy of a ring's retained records, oldest first."""
+        count = min(written, len(ring))
+        return ring[(written - count + np.arange(count)) % len(ring)]
+
+    @staticmethod
+    def _labelled(records: np.ndarray, symbols: List[str], exchanges: List[str]) -> np.ndarray:
+        """Records whose symbol and exchange ids index the published name tables (never wrap negative ids)."""
+        known = (
+            (records['symbol_id'] >= 0) & (records['symbol_id'] < len(symbols))
+            & (records['buy_id'] >= 0) & (records['buy_id'] < len(exchanges))
+            & (records['sell_id'] >= 0) & (records['sell_id'] < len(exchanges))
+        )
+        return records[known]
+
+    @property
+    def publish_count(self) -> int:
+        """Number of publishes so far (changes whenever the snapshot does)."""
+        return int(self.views['header']['publish_count'][0])
+
+    @property
+    def has_cycles(self) -> bool:
+        """Whether the publishing detector searches multi-leg cycles."""
+        return bool(self.views['header']['cycle_detection'][0])
+
+    @property
+    def published_at(self):
+        """Wall-clock time of the last publish."""
+        return ns_to_datetime(int(self.views['header']['published_ns'][0]))
+
+    def get_latest_prices(self, symbol: str) -> Dict[str, PriceData]:
+        """Get latest prices for a symbol across all exchanges."""
+        def copy(views):
+            symbols, exchanges = self._names(views)
+            if symbol not in symbols:
+                return exchanges, None
+            return exchanges, views['quotes'][symbols.index(symbol), :len(exchanges)].copy()
+
+        exchanges, row = self._consistent(copy)
+        if row is None:
+            return {}
+        return {
+            exchange: PriceData(
+                exchange=exchange, symbol=symbol, price=float(q['price']), volume=float(q['volume']),
+                timestamp_ns=int(q['timestamp_ns']), bid=float(q['bid']), ask=float(q['ask']),
+                received_ns=int(q['received_ns']), bid_size=float(q['bid_size']), ask_size=float(q['ask_size'])
+            )
+            for exchange, q in zip(exchanges, row)
+            if q['timestamp_ns']
+        }
+
+    def _opportunities(self, minutes: float) -> Tuple[List[str], List[str], np.ndarray]:
+        def copy(views):
+            symbols, exchanges = self._names(views)
+            written = int(views['header']['opportunities_written'][0])
+            return symbols, exchanges, self._ring_tail(views['opportunities'], written)
+
+        symbols, exchanges, records = self._consistent(copy)
+        cutoff = time.time_ns() - int(minutes * 60e9)
+        return symbols, exchanges, self._labelled(records[records['timestamp_ns'] >= cutoff], symbols, exchanges)
+
+    @staticmethod
+    def _to_opportunity(record, symbols: List[str], exchanges: List[str]) -> ArbitrageOpportunity:
+        max_size_usd = float(record['max_size_usd'])
+        size_profits = {
+            notional: float(profit)
+            for notional, profit in zip(DEPTH_NOTIONALS_USD, record['size_profit'])
+            if not np.isnan(profit)
+        }
+        return ArbitrageOpportunity(
+            buy_exchange=exchanges[record['buy_id']],
+            sell_exchange=exchanges[record['sell_id']],
+            symbol=symbols[record['symbol_id']],
+            buy_price=float(record['buy_price']),
+            sell_price=float(record['sell_price']),
+            spread_pct=float(record['spread_pct']),
+            profit_after_fees=float(record['profit_after_fees']),
+            timestamp=ns_to_datetime(int(record['timestamp_ns'])),
+            confidence_score=float(record['confidence_score']),
+            max_size_usd=None if np.isnan(max_size_usd) else max_size_usd,
+            size_profits=size_profits or None
+        )
+
+    def get_recent_opportunities(self, minutes: int = 5) -> List[ArbitrageOpportunity]:
+        """Get published opportunities from the last N minutes (at most the ring capacity)."""
+        symbols, exchanges, records = self._opportunities(minutes)
+        return [self._to_opportunity(r, symbols, exchanges) for r in records]
+
+    def get_best_opportunity(self, minutes: int = 1) -> Optional[ArbitrageOpportunity]:
+        """Get the most profitable published opportunity in the last N minutes."""
+        symbols, exchanges, records = self._opportunities(minutes)
+        if len(records) == 0:
+            return None
+        return self._to_opportunity(records[np.argmax(records['profit_after_fees'])], symbols, exchanges)
+
+    def get_recent_episodes(self, minutes: int = 60) -> List[OpportunityEpisode]:
+        """Published closed episodes that ended in the last N minutes, oldest first."""
+        def copy(views):
+            symbols, exchanges = self._names(views)
+            written = int(views['header']['episodes_written'][0])
+            return symbols, exchanges, self._ring_tail(views['episodes'], written)
+
+        symbols, exchanges, records = self._consistent(copy)
+        cutoff = time.time_ns() - int(minutes * 60e9)
+        return [
+            OpportunityEpisode(
+                symbol=symbols[r['symbol_id']],
+                buy_exchange=exchanges[r['buy_id']],
+                sell_exchange=exchanges[r['sell_id']],
+                start_ns=int(r['start_ns']),
+                end_ns=int(r['end_ns']),
+                peak_profit=float(r['peak_profit']),
+                avg_profit=float(r['avg_profit']),
+                tick_count=int(r['tick_count']),
+                close_reason=r['close_reason'].decode()
+            )
+            for r in self._labelled(records[records['end_ns'] >= cutoff], symbols, exchanges)
+        ]
+
+    def get_recent_cycles(self, minutes: int = 5) -> List[ArbitrageOpportunity]:
+        """Published multi-leg cycle opportunities from the last N minutes, oldest first."""
+        def copy(views):
+            _, exchanges = self._names(views)
+            written = int(views['header']['cycles_written'][0])
+            return exchanges, self._ring_tail(views['cycles'], written)
+
+        exchanges, records = self._consistent(copy)
+        cutoff = time.time_ns() - int(minutes * 60e9)
+        opportunities = []
+        for record in records[records['timestamp_ns'] >= cutoff]:
+            legs = record['legs'][:int(record['leg_count'])]
+            ids = np.concatenate([legs['exchange_id'], legs['to_exchange_id']])
+            if len(legs) == 0 or ids.min() < 0 or ids.max() >= len(exchanges):
+                continue  # Never label a leg with an exchange the name table does not have
+            legs = [
+                CycleLeg(
+                    exchanges[leg['exchange_id']], leg['symbol'].decode(), leg['side'].decode(),
+                    float(leg['price']), float(leg['rate']), exchanges[leg['to_exchange_id']]
+                )
+                for leg in legs
+            ]
+            trades = [leg for leg in legs if leg.side != "transfer"]
+            opportunities.append(ArbitrageOpportunity(
+                buy_exchange=trades[0].exchange,
+                sell_exchange=trades[-1].exchange,
+                symbol=record['path'].decode(),
+                buy_price=1.0,
+                sell_price=float(record['gross']),
+                spread_pct=float(record['spread_pct']),
+                profit_after_fees=float(record['profit_after_fees']),
+                timestamp=ns_to_datetime(int(record['timestamp_ns'])),
+                legs=legs
+            ))
+        return opportunities
+
+    def get_statistics(self) -> Dict:
+        """Get the published detection statistics (same shape as ArbitrageDetector.get_statistics)."""
+        record = self._consistent(lambda views: views['stats'][0].copy())
+        cycles = {'total_cycles': int(record['total_cycles']), 'recent_cycles': int(record['recent_cycles'])}
+        if not record['recent_count']:
+            return {
+                'total_opportunities': int(record['total_opportunities']),
+                'recent_count': 0,
+                'avg_profit': 0,
+                'max_profit': 0,
+                'top_pairs': [],
+                **cycles
+            }
+        return {
+            'total_opportunities': int(record['total_opportunities']),
+            'recent_count': int(record['recent_count']),
+            'avg_profit': float(record['avg_profit']),
+            'max_profit': float(record['max_profit']),
+            'min_profit': float(record['min_profit']),
+            'top_pairs': [
+                {'pair': pair.decode(), 'count': int(count)}
+                for pair, count in zip(record['top_pair'], record['top_count'])
+                if pair
+            ],
+            **cycles
+        }
+
+    def get_exchange_health(self) -> Dict[str, dict]:
+        """Published feed health per exchange (same shape as HealthRegistry.get_exchange_health).
+
+        Health times are monotonic, so this only makes sense on the publishing host.
+        """
+        records = self._consistent(lambda views: views['health'][:int(views['header']['health_count'][0])].copy())
+        now_ns = monotonic_ns()
+        return {exchange: summarize(record, now_ns) for exchange, record in zip(TICK_EXCHANGES, records)}
+
+    def close(self):
+        self.views = None
+        self._mmap.close()
+        self._file.close()
@@ -0,0 +1,128 @@
+"""Vectorized spread-matrix engine for all symbols and exchange pairs."""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from cost_model import CostModel
+
+NEVER_NS = np.iinfo(np.int64).min // 2  # updated_at sentinel; any age check against it fails
+
+
+class SpreadMatrixEngine:
+    """Dense [symbol, exchange] price table with vectorized buy x sell spread matrices.
+
+    Matrices are indexed [symbol, buy exchange, sell exchange]. Buying uses the ask
+    (falling back to the last trade) and selling uses the bid (same fallback), which
+    matches how the detector has always priced a pair.
+    """
+
+    def __init__(self, cost_model: CostModel, initial_symbols: int = 16):
+        self.cost_model = cost_model
+        self.symbol_ids: Dict[str, int] = {}  # {symbol: row index}
+        self.symbols: List[str] = []  # {row index: symbol}
+        self.exchange_names: List[str] = []  # {column index: exchange name}
+
+        self.last = np.zeros((initial_symbols, 0))
+        self.bid = np.zeros((initial_symbols, 0))
+        self.ask = np.zeros((initial_symbols, 0))
+        self.updated_at = np.full((initial_symbols, 0), NEVER_NS, dtype=np.int64)  # Monotonic receive ns
+
+    def add_exchange(self, exchange_name: str) -> int:
+        """Add an exchange column and return its index (must match the cost model's id)."""
+        self.exchange_names.append(exchange_name)
+        rows = self.last.shape[0]
+        self.last = np.hstack([self.last, np.zeros((rows, 1))])
+        self.bid = np.hstack([self.bid, np.zeros((rows, 1))])
+        self.ask = np.hstack([self.ask, np.zeros((rows, 1))])
+        self.updated_at = np.hstack([self.updated_at, np.full((rows, 1), NEVER_NS, dtype=np.int64)])
+        return len(self.exchange_names) - 1
+
+    def intern_symbol(self, symbol: str) -> int:
+        """Return the row index for a symbol, growing the tables if it is new."""
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is not None:
+            return symbol_id
+
+        symbol_id = len(self.symbols)
+        if symbol_id == self.last.shape[0]:
+            extra = max(symbol_id, 1)
+            cols = len(self.exchange_names)
+            self.last = np.vstack([self.last, np.zeros((extra, cols))])
+            self.bid = np.vstack([self.bid, np.zeros((extra, cols))])
+            self.ask = np.vstack([self.ask, np.zeros((extra, cols))])
+            self.updated_at = np.vstack([self.updated_at, np.full((extra, cols), NEVER_NS, dtype=np.int64)])
+
+        self.symbol_ids[symbol] = symbol_id
+        self.symbols.append(symbol)
+        return symbol_id
+
+    def update(
+        self,
+        symbol_id: int,
+        exchange_id: int,
+        price: float,
+        bid: float,
+        ask: float,
+        received_ns: int
+    ):
+        """Store the latest quote for one (symbol, exchange) cell, stamped with its monotonic receive time."""
+        self.last[symbol_id, exchange_id] = price
+        self.bid[symbol_id, exchange_id] = bid
+        self.ask[symbol_id, exchange_id] = ask
+        self.updated_at[symbol_id, exchange_id] = received_ns
+
+    def executable_prices(self, rows=slice(None)) -> Tuple[np.ndarray, np.ndarray]:
+        """Get (buy, sell) price arrays: ask/bid where quoted, else last trade."""
+        ask, bid, last = self.ask[rows], self.bid[rows], self.last[rows]
+        buy = np.where(ask > 0, ask, last)
+        sell = np.where(bid > 0, bid, last)
+        return buy, sell
+
+    def fresh_mask(self, symbol_id: int, now_ns: int, max_age_ns: int) -> np.ndarray:
+        """Per-exchange mask of quotes for one symbol received within max_age_ns (monotonic ns)."""
+        return (now_ns - self.updated_at[symbol_id]) < max_age_ns
+
+    def compute(
+        self,
+        rows=slice(None),
+        now_ns: Optional[int] = None,
+        max_age_ns: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """Compute buy x sell spread and net-of-fee matrices in one vectorized pass.
+
+        Args:
+            rows: Symbol rows to evaluate (all interned symbols by default)
+            now_ns: Current time.monotonic_ns(), required when max_age_ns is set
+            max_age_ns: Quotes received longer ago than this are masked out
+
+        Returns:
+            Dict with 'buy' and 'sell' [S, E] prices plus 'spread', 'net' and
+            'valid' [S, E, E] arrays indexed [symbol, buy exchange, sell exchange]
+        """
+        if isinstance(rows, slice):
+            rows = slice(*rows.indices(len(self.symbols)))
+
+        buy, sell = self.executable_prices(rows)
+        usable_buy = buy > 0
+        usable_sell = sell > 0
+        if max_age_ns is not None:
+            fresh = (now_ns - self.updated_at[rows]) < max_age_ns
+            usable_buy &= fresh
+            usable_sell &= fresh
+
+        valid = usable_buy[:, :, None] & usable_sell[:, None, :]
+        valid &= ~np.eye(len(self.exchange_names), dtype=bool)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spread = (sell[:, None, :] - buy[:, :, None]) / buy[:, :, None] * 100
+        spread = np.where(valid, spread, np.nan)
+        net = spread - self.cost_model.tables.total_fees
+
+        return {'buy': buy, 'sell': sell, 'spread': spread, 'net': net, 'valid': valid}
+
+    def symbol_matrix(self, symbol: str) -> Optional[Dict[str, np.ndarray]]:
+        """Get the unfiltered [buy, sell] matrices for one symbol, or None if unseen."""
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            return None
+        result = self.compute(rows=slice(symbol_id, symbol_id + 1))
+        return {key: value[0] for key, value in result.items()}
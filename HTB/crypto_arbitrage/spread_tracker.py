@@ -0,0 +1,140 @@
+"""Online, per-pair spread statistics updated on every tick."""
+import math
+from typing import Dict, Optional, Tuple
+
+
+class PairSpreadStats:
+    """Welford mean/variance, min, max and current value of one pair's spread series.
+
+    The series is as-of aligned: every row (tick) of the symbol contributes the
+    pair's current spread, even when neither of its exchanges moved. Repeated
+    values are not applied one row at a time; a value is folded in with its
+    row count (Chan's parallel update) when it is superseded or read, so a tick
+    only touches the pairs that involve the exchange that ticked.
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'value', 'since_row',
+                 'decay_alpha', 'ewm_mean', 'ewm_var')
+
+    def __init__(self, decay_alpha: Optional[float] = None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.value: Optional[float] = None  # Current spread %, not yet folded in
+        self.since_row = 0  # Row at which `value` became current
+
+        self.decay_alpha = decay_alpha
+        self.ewm_mean: Optional[float] = None
+        self.ewm_var = 0.0
+
+    def set_value(self, value: float, row: int):
+        """Make `value` current from `row` onwards, folding in the value it replaces."""
+        self._fold(row)
+        self.value = value
+        self.since_row = row
+
+    def _fold(self, row: int):
+        """Apply the current value for every row from since_row up to (not including) row."""
+        weight = row - self.since_row
+        if self.value is None or weight <= 0:
+            return
+        self.count, self.mean, self.m2 = self._combine(self.count, self.mean, self.m2, weight, self.value)
+        self.min = min(self.min, self.value)
+        self.max = max(self.max, self.value)
+        if self.decay_alpha is not None:
+            self.ewm_mean, self.ewm_var = self._decay(self.ewm_mean, self.ewm_var, weight, self.value)
+        self.since_row = row
+
+    @staticmethod
+    def _combine(count: int, mean: float, m2: float, weight: int, value: float) -> Tuple[int, float, float]:
+        """Merge `weight` copies of `value` into a Welford accumulator."""
+        total = count + weight
+        delta = value - mean
+        return total, mean + delta * weight / total, m2 + delta * delta * count * weight / total
+
+    def _decay(self, ewm_mean: Optional[float], ewm_var: float, weight: int, value: float) -> Tuple[float, float]:
+        """Apply `weight` exponentially weighted updates with the same value, in closed form."""
+        if ewm_mean is None:
+            return value, 0.0
+        keep = (1 - self.decay_alpha) ** weight
+        delta = value - ewm_mean
+        return value - keep * delta, keep * (ewm_var + delta * delta * (1 - keep))
+
+    def snapshot(self, rows: int) -> Dict[str, float]:
+        """Statistics as of `rows` rows, including the pending current value."""
+        count, mean, m2 = self.count, self.mean, self.m2
+        low, high = self.min, self.max
+        ewm_mean, ewm_var = self.ewm_mean, self.ewm_var
+        weight = rows - self.since_row
+        if self.value is not None and weight > 0:
+            count, mean, m2 = self._combine(count, mean, m2, weight, self.value)
+            low, high = min(low, self.value), max(high, self.value)
+            if self.decay_alpha is not None:
+                ewm_mean, ewm_var = self._decay(ewm_mean, ewm_var, weight, self.value)
+
+        stats = {
+            'mean': mean if count else math.nan,
+            'std': math.sqrt(m2 / (count - 1)) if count > 1 else math.nan,
+            'max': high if count else math.nan,
+            'min': low if count else math.nan,
+            'current': self.value if self.value is not None else 0,
+        }
+        if self.decay_alpha is not None:
+            stats['ewm_mean'] = ewm_mean if ewm_mean is not None else math.nan
+            stats['ewm_std'] = math.sqrt(ewm_var)
+        return stats
+
+
+class OnlineSpreadTracker:
+    """Incrementally maintained spread metrics for every exchange pair of one symbol.
+
+    Produces the same numbers as ArbitrageDetector.calculate_spread_metrics_full
+    (pivot by timestamp, forward-fill, pairwise spread stats) when ticks arrive
+    in timestamp order, but covers the whole session instead of only the
+    retained price buffer. A tick costs O(E); reading all pairs costs O(E^2).
+    """
+
+    def __init__(self, decay_alpha: Optional[float] = None):
+        self.decay_alpha = decay_alpha
+        self.prices: Dict[str, float] = {}  # {exchange: as-of price}
+        self.pairs: Dict[Tuple[str, str], PairSpreadStats] = {}  # {(ex1, ex2) sorted by name: stats}
+        self.rows = 0  # Rows (distinct timestamps) seen so far
+        self._last_timestamp_ns: Optional[int] = None
+        self._row_ticks: Dict[str, Tuple[float, int]] = {}  # {exchange: (price sum, count)} in the current row
+
+    def update(self, exchange: str, price: float, timestamp_ns: int):
+        """Apply one tick."""
+        if timestamp_ns != self._last_timestamp_ns:
+            self.rows += 1
+            self._last_timestamp_ns = timestamp_ns
+            self._row_ticks.clear()
+        row = self.rows - 1
+
+        # Ticks sharing a timestamp amend the same row; repeats on one exchange average (like pivot_table)
+        price_sum, count = self._row_ticks.get(exchange, (0.0, 0))
+        self._row_ticks[exchange] = (price_sum + price, count + 1)
+        price = (price_sum + price) / (count + 1)
+
+        self.prices[exchange] = price
+        for other, other_price in self.prices.items():
+            if other == exchange:
+                continue
+            ex1, ex2 = (exchange, other) if exchange < other else (other, exchange)
+            p1 = price if ex1 == exchange else other_price
+            p2 = other_price if ex1 == exchange else price
+            if not p1:
+                continue
+
+            stats = self.pairs.get((ex1, ex2))
+            if stats is None:
+                stats = self.pairs[(ex1, ex2)] = PairSpreadStats(self.decay_alpha)
+            stats.set_value((p2 - p1) / p1 * 100, row)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Spread statistics per pair, keyed like calculate_spread_metrics ("ex1->ex2")."""
+        return {
+            f"{ex1}->{ex2}": stats.snapshot(self.rows)
+            for (ex1, ex2), stats in sorted(self.pairs.items())
+        }
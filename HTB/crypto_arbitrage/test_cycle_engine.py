@@ -0,0 +1,67 @@
+"""Cycle engine rebuild and expiry regressions (run with pytest from this directory)."""
+from clock import seconds_to_ns
+from cost_model import CostModel
+from cycle_engine import CycleEngine
+
+MAX_AGE_NS = seconds_to_ns(5)
+
+# ETH-BTC bid 0.07 against an implied 0.06: USD -> ETH -> BTC -> USD returns ~16% before fees
+TRIANGLE = {"BTC-USD": (50000.0, 50001.0), "ETH-USD": (3000.0, 3001.0), "ETH-BTC": (0.07, 0.0701)}
+
+
+def _engine(background: bool = False):
+    cost_model = CostModel()
+    engine = CycleEngine(cost_model, background=background)
+    engine.rebuild_interval_ns = 0
+    return engine, cost_model.add_exchange("Binance")
+
+
+def _quote(engine: CycleEngine, exchange_id: int, at_ns: int, symbols=TRIANGLE):
+    for symbol in symbols:
+        bid, ask = TRIANGLE[symbol]
+        engine.update_quote(exchange_id, "Binance", symbol, bid, ask, at_ns)
+
+
+def test_open_cycle_with_stale_legs_expires_and_reopens():
+    engine, binance = _engine()
+    _quote(engine, binance, 1)
+    [(cycle_id, profit)] = engine.detect(1, MAX_AGE_NS)
+    assert engine.path(cycle_id) == ["USD", "ETH", "BTC", "USD"]
+    assert profit > 10
+
+    # No quote moves, but every leg is now older than MAX_AGE_NS: the cycle must close on its own
+    assert engine.detect(1 + MAX_AGE_NS, MAX_AGE_NS) == []
+    assert not engine.active[cycle_id]
+
+    # Fresh again and still profitable: reported again, as a new profitable run
+    later = 2 * MAX_AGE_NS
+    _quote(engine, binance, later)
+    assert [cycle for cycle, _ in engine.detect(later, MAX_AGE_NS)] == [cycle_id]
+
+
+def test_rebuild_appends_new_cycles_and_keeps_open_ones():
+    engine, binance = _engine()
+    _quote(engine, binance, 1)
+    [(cycle_id, _)] = engine.detect(1, MAX_AGE_NS)
+    before = engine.cycles.copy()
+
+    # New pairs add cycles (some through the mispriced ETH-BTC); indexed ones keep their ids
+    engine.update_quote(binance, "Binance", "SOL-USD", 100.0, 100.1, 2)
+    engine.update_quote(binance, "Binance", "SOL-BTC", 0.002, 0.00201, 2)
+    opened = [cycle for cycle, _ in engine.detect(2, MAX_AGE_NS)]
+    assert opened and min(opened) >= len(before)
+    assert len(engine.cycles) > len(before)
+    assert (engine.cycles[:len(before)] == before).all()
+    assert engine.active[cycle_id]
+
+
+def test_background_rebuild_matches_inline():
+    inline, binance = _engine()
+    background, _ = _engine(background=True)
+    for engine in (inline, background):
+        _quote(engine, binance, 1)
+        engine.detect(1, MAX_AGE_NS)
+
+    background.wait_for_rebuild()
+    assert [cycle for cycle, _ in background.detect(2, MAX_AGE_NS)] == [0]
+    assert background.cycles.tolist() == inline.cycles.tolist()
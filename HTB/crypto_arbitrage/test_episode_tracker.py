@@ -0,0 +1,55 @@
+"""Episode lifecycle regressions (run with pytest from this directory)."""
+from arbitrage_detector import ArbitrageDetector
+from clock import SimulatedClock, seconds_to_ns
+from config import PriceData
+
+START_NS = 1_700_000_000 * 10**9
+
+
+def _tick(detector: ArbitrageDetector, clock: SimulatedClock, seconds: float, exchange: str, bid: float, ask: float):
+    clock.advance_to(START_NS + seconds_to_ns(seconds))
+    detector.update_price(PriceData(exchange, "BTC-USD", (bid + ask) / 2, 1.0, clock.now_ns, bid, ask, clock.now_ns))
+
+
+def _open_episode():
+    """Binance ask 100 at t=0, Coinbase bid 102 at t=1: a Binance -> Coinbase episode opens at t=1."""
+    clock = SimulatedClock(START_NS)
+    detector = ArbitrageDetector(clock=clock, cycle_detection=False)
+    _tick(detector, clock, 0, "Binance", 99.9, 100.0)
+    _tick(detector, clock, 1, "Coinbase", 102.0, 102.1)
+    assert ("Binance", "Coinbase") in detector.episodes.open_episodes["BTC-USD"]
+    return detector, clock
+
+
+def test_stale_counterpart_closes_as_stale_at_last_observation():
+    detector, clock = _open_episode()
+
+    # Binance silent past MAX_SPREAD_AGE_SECONDS: the pair cannot be tested, so it must not "revert" at t=7
+    _tick(detector, clock, 7, "Coinbase", 99.0, 99.1)
+
+    [episode] = detector.episodes.closed
+    assert episode.close_reason == "stale"
+    assert episode.end_ns == START_NS + seconds_to_ns(1)
+    assert episode.duration_seconds == 0.0
+
+
+def test_fresh_pair_below_threshold_reverts():
+    detector, clock = _open_episode()
+
+    _tick(detector, clock, 2, "Coinbase", 99.0, 99.1)
+
+    [episode] = detector.episodes.closed
+    assert episode.close_reason == "reverted"
+    assert episode.end_ns == START_NS + seconds_to_ns(2)
+
+
+
+def test_pair_without_a_quote_side_is_not_tested():
+    detector, clock = _open_episode()
+
+    # Coinbase updates with no bid (and no trade price): Binance -> Coinbase has no sell price, so it is not tested
+    clock.advance_to(START_NS + seconds_to_ns(2))
+    detector.update_price(PriceData("Coinbase", "BTC-USD", 0.0, 0.0, clock.now_ns, 0.0, 102.1, clock.now_ns))
+
+    assert not detector.episodes.closed
+    assert ("Binance", "Coinbase") in detector.episodes.open_episodes["BTC-USD"]
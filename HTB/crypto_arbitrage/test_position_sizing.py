@@ -0,0 +1,68 @@
+"""Depth sizing and bot position caps (run with pytest from this directory)."""
+import math
+from datetime import datetime, timezone
+
+import pytest
+
+from arbitrage_detector import ArbitrageDetector
+from bot import BenchmarkBot
+from clock import SimulatedClock, seconds_to_ns
+from config import ArbitrageOpportunity, PriceData
+
+START_NS = 1_700_000_000 * 10**9
+
+
+def _detector_after(coinbase_bid: float, sizes: float = 1.0) -> ArbitrageDetector:
+    """Binance ask 100 at t=0, then Coinbase at `coinbase_bid` at t=1 (both with `sizes` at the touch)."""
+    clock = SimulatedClock(START_NS)
+    detector = ArbitrageDetector(clock=clock, cycle_detection=False)
+    detector.update_price(PriceData("Binance", "BTC-USD", 99.95, 1.0, clock.now_ns, 99.9, 100.0, clock.now_ns, sizes, sizes))
+    clock.advance_to(START_NS + seconds_to_ns(1))
+    detector.update_price(PriceData(
+        "Coinbase", "BTC-USD", coinbase_bid, 1.0, clock.now_ns, coinbase_bid, coinbase_bid + 0.1, clock.now_ns, sizes, sizes
+    ))
+    return detector
+
+
+def _only_opportunity(detector: ArbitrageDetector) -> ArbitrageOpportunity:
+    [opportunity] = [opp for opp in detector.opportunities.since(0) if opp.buy_exchange == "Binance"]
+    return opportunity
+
+
+def test_unprofitable_hit_is_not_sized():
+    # 0.4% spread, 0.7% fees: reported (above MIN_PROFIT_THRESHOLD) but never walked against depth
+    opportunity = _only_opportunity(_detector_after(100.4))
+    assert opportunity.profit_after_fees < 0
+    assert opportunity.max_size_usd is None
+
+
+def test_profitable_hit_without_depth_is_not_sized():
+    opportunity = _only_opportunity(_detector_after(102.0, sizes=0.0))
+    assert opportunity.profit_after_fees > 0
+    assert opportunity.max_size_usd is None
+
+
+def test_profitable_hit_is_sized_on_top_of_book():
+    opportunity = _only_opportunity(_detector_after(102.0, sizes=1.0))
+    assert opportunity.max_size_usd == pytest.approx(100.0)  # One unit at the 100 ask
+
+
+def _opportunity(max_size_usd) -> ArbitrageOpportunity:
+    return ArbitrageOpportunity(
+        "Binance", "Coinbase", "BTC-USD", 100.0, 102.0, 2.0, 1.3, datetime.now(timezone.utc),
+        max_size_usd=max_size_usd
+    )
+
+
+@pytest.mark.parametrize("max_size_usd", [None, math.nan, 0.0])
+def test_bot_caps_only_on_a_finite_positive_size(max_size_usd):
+    bot = BenchmarkBot(min_spread_threshold=0.0)
+    trade = bot.execute_trade(_opportunity(max_size_usd), slippage_pct=0.0)
+    assert trade is not None
+    assert trade.amount * trade.buy_price == pytest.approx(500.0)  # 5% of 10,000
+
+
+def test_bot_caps_at_sized_depth():
+    bot = BenchmarkBot(min_spread_threshold=0.0)
+    trade = bot.execute_trade(_opportunity(200.0), slippage_pct=0.0)
+    assert trade.amount * trade.buy_price == pytest.approx(200.0)
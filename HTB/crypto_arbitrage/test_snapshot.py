@@ -0,0 +1,83 @@
+"""Snapshot publish / read regressions (run with pytest from this directory)."""
+import time
+
+from arbitrage_detector import ArbitrageDetector
+from clock import SimulatedClock, seconds_to_ns
+from config import CYCLE_REBUILD_MIN_SECONDS, PriceData
+from snapshot import SnapshotReader, SnapshotWriter
+
+SYMBOLS = [f"S{i:03d}-USD" for i in range(100)]  # Past the old 64-symbol id table
+
+
+def _detector_with_opportunities() -> ArbitrageDetector:
+    """Binance ask 100 / Coinbase bid 102 on every symbol: one Binance -> Coinbase opportunity each."""
+    detector = ArbitrageDetector()
+    for symbol in SYMBOLS:
+        now = time.time_ns()
+        detector.update_price(PriceData("Binance", symbol, 100.0, 1.0, now, 99.9, 100.0, time.monotonic_ns()))
+        detector.update_price(PriceData("Coinbase", symbol, 102.05, 1.0, now, 102.0, 102.1, time.monotonic_ns()))
+    return detector
+
+
+def _published(tmp_path, detector: ArbitrageDetector, **sizes):
+    writer = SnapshotWriter(str(tmp_path / "snapshot.mmap"), **sizes)
+    writer.publish(detector)
+    reader = SnapshotReader(str(tmp_path / "snapshot.mmap"))
+    try:
+        return writer, reader.get_recent_opportunities(), reader.get_latest_prices(SYMBOLS[-1])
+    finally:
+        reader.close()
+        writer.close()
+
+
+def test_more_than_64_symbols_keep_their_labels(tmp_path):
+    detector = _detector_with_opportunities()
+    expected = [(opp.symbol, opp.buy_exchange, opp.sell_exchange) for opp in detector.get_recent_opportunities()]
+
+    writer, opportunities, latest = _published(tmp_path, detector)
+
+    assert len(expected) == len(SYMBOLS)
+    assert [(opp.symbol, opp.buy_exchange, opp.sell_exchange) for opp in opportunities] == expected
+    assert writer.unpublished == 0
+    assert set(latest) == {"Binance", "Coinbase"}
+
+
+def test_symbols_past_the_id_table_are_skipped_not_mislabelled(tmp_path):
+    detector = _detector_with_opportunities()
+
+    writer, opportunities, latest = _published(tmp_path, detector, max_symbols=64)
+
+    assert [opp.symbol for opp in opportunities] == SYMBOLS[:64]
+    assert writer.unpublished == len(SYMBOLS) - 64
+    assert latest == {}
+
+
+def test_cycles_are_counted_and_published(tmp_path):
+    """ETH-BTC bid 0.07 against an implied 0.06 opens USD -> ETH -> BTC -> USD on Binance."""
+    clock = SimulatedClock(time.time_ns())  # Rebuilds the cycle set inline
+    detector = ArbitrageDetector(clock=clock)
+    quotes = (("BTC-USD", 50000.0, 50001.0), ("ETH-USD", 3000.0, 3001.0), ("ETH-BTC", 0.07, 0.0701))
+    for at in (0, seconds_to_ns(CYCLE_REBUILD_MIN_SECONDS)):  # The second round sees the rebuilt cycle set
+        clock.advance_to(clock.now_ns + at)
+        for symbol, bid, ask in quotes:
+            detector.update_price(PriceData("Binance", symbol, (bid + ask) / 2, 1.0, clock.now_ns, bid, ask, clock.now_ns))
+    [cycle] = detector.get_recent_cycles()
+    stats = detector.get_statistics()
+    assert (stats['total_cycles'], stats['recent_cycles']) == (1, 1)
+
+    writer = SnapshotWriter(str(tmp_path / "snapshot.mmap"))
+    writer.publish(detector)
+    reader = SnapshotReader(str(tmp_path / "snapshot.mmap"))
+    try:
+        [published] = reader.get_recent_cycles()
+        assert reader.has_cycles
+        assert (reader.get_statistics()['total_cycles'], reader.get_statistics()['recent_cycles']) == (1, 1)
+    finally:
+        reader.close()
+        writer.close()
+
+    assert published.symbol == cycle.symbol == "USD->ETH->BTC->USD"
+    assert published.legs == cycle.legs
+    assert (published.buy_exchange, published.sell_exchange) == ("Binance", "Binance")
+    assert published.profit_after_fees == cycle.profit_after_fees
+    assert published.timestamp == cycle.timestamp
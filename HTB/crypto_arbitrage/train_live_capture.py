@@ -18,10 +18,11 @@ from config import ArbitrageOpportunity
 class LiveDataCapture:
     """Capture live data for training without heavy computation."""
 
-    def __init__(self, capture_hours: int = 2):
+    def __init__(self, capture_hours: int = 2, journal_dir: str = "captured_data/journal"):
         self.capture_hours = capture_hours
         self.detector = ArbitrageDetector()
-        self.aggregator = MultiExchangeAggregator(self.detector.update_price)
+        # Every raw frame goes to the journal; the CSVs below only hold what is left in the detector's buffers
+        self.aggregator = MultiExchangeAggregator(self.detector.update_price, journal_dir=journal_dir)
 
         self.start_time = None
         self.end_time = None
@@ -203,6 +204,9 @@ class LiveDataCapture:
         logger.info(f"Duration: {duration:.2f} hours")
         logger.info(f"Price updates: {total_prices:,}")
         logger.info(f"Opportunities detected: {len(self.detector.opportunities):,}")
+        if self.aggregator.journal is not None:
+            journal = self.aggregator.journal.stats()
+            logger.info(f"Raw frames journaled: {journal['frames_written']:,} ({journal['bytes_written'] / 1e6:.1f} MB) in {journal['files_opened']} file(s)")
 
         if self.detector.opportunities:
             profits = [o.profit_after_fees for o in self.detector.opportunities]
@@ -222,7 +226,7 @@ class LiveDataCapture:
         logger.info("="*70)
 
 
-def run_capture(hours: int = 2):
+def run_capture(hours: int = 2, journal_dir: str = "captured_data/journal"):
     """Run the live data capture and training."""
 
     # Setup signal handler for graceful shutdown
@@ -236,7 +240,7 @@ def run_capture(hours: int = 2):
     signal.signal(signal.SIGINT, signal_handler)
 
     # Create capture instance
-    capture = LiveDataCapture(capture_hours=hours)
+    capture = LiveDataCapture(capture_hours=hours, journal_dir=journal_dir)
 
     # Run capture
     logger.info(f"\n🎯 Starting {hours}-hour live data capture...")
@@ -288,6 +292,12 @@ if __name__ == "__main__":
         help='Hours to capture data (default: 2.0, min: 0.5, max: 24)'
     )
 
+    parser.add_argument(
+        '--journal-dir',
+        default="captured_data/journal",
+        help='Directory for the raw frame journal (default: captured_data/journal)'
+    )
+
     args = parser.parse_args()
 
     # Validate hours
@@ -306,7 +316,7 @@ if __name__ == "__main__":
     logger.info(f"Expected opportunities: ~{int(args.hours * 20):,} (estimate)")
     logger.info("="*70)
 
-    success = run_capture(hours=args.hours)
+    success = run_capture(hours=args.hours, journal_dir=args.journal_dir)
 
     if success:
         logger.success("\n✅ SUCCESS! Models ready to use")